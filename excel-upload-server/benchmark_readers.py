@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Benchmark Excel reader backends on the same workbook
+
+Each backend runs in a fresh process so peak RSS is measured per backend.
+Reports rows per second, peak RSS and whether the resulting dtypes match
+across backends.
+
+Usage:
+    python benchmark_readers.py <workbook.xlsx> [--backends calamine openpyxl] [--stream]
+"""
+import argparse
+import multiprocessing
+import sys
+import time
+from pathlib import Path
+
+# 현재 디렉토리를 Python 경로에 추가
+sys.path.insert(0, str(Path(__file__).parent))
+
+from core.excel_loader import READER_BACKENDS, ExcelLoader
+
+
+def _peak_rss_mb() -> float | None:
+    """Peak resident set size of the current process in MB"""
+    try:
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports KB, macOS reports bytes
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    except ImportError:
+        pass
+
+    try:
+        import psutil
+
+        return psutil.Process().memory_info().peak_wset / (1024 * 1024)
+    except (ImportError, AttributeError):
+        return None
+
+
+def _run_backend(file_path: str, backend_name: str, stream: bool, queue) -> None:
+    """Load the workbook with one backend and report timing (runs in a child process)"""
+    loader = ExcelLoader(max_workers=1, reader_backend=backend_name)
+    path = Path(file_path)
+
+    try:
+        start = time.perf_counter()
+        if stream:
+            reader = loader.iter_excel_chunks(path)
+            dtypes = {}
+            for chunk in reader:
+                dtypes = {str(col): str(dtype) for col, dtype in chunk.dtypes.items()}
+            rows = reader.rows_read
+        else:
+            df = loader.load_excel_file(path)
+            dtypes = {str(col): str(dtype) for col, dtype in df.dtypes.items()}
+            rows = len(df)
+        elapsed = time.perf_counter() - start
+
+        queue.put({
+            "backend": backend_name,
+            "rows": rows,
+            "seconds": elapsed,
+            "peak_rss_mb": _peak_rss_mb(),
+            "dtypes": dtypes,
+        })
+    except Exception as e:
+        queue.put({"backend": backend_name, "error": str(e)})
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Excel reader backends")
+    parser.add_argument("file", help="Workbook to load")
+    parser.add_argument(
+        "--backends",
+        nargs="+",
+        default=[name for name, backend in READER_BACKENDS.items() if backend.is_available()],
+        help="Backends to compare (default: all installed)"
+    )
+    parser.add_argument("--stream", action="store_true", help="Benchmark chunked streaming instead of whole-frame loading")
+    args = parser.parse_args()
+
+    file_path = Path(args.file)
+    backends = [name for name in args.backends if READER_BACKENDS[name].supports(file_path)]
+    if not backends:
+        print(f"No installed backend supports {file_path.suffix}")
+        sys.exit(1)
+
+    mode = "streaming" if args.stream else "whole-frame"
+    print(f"=== {file_path.name} ({file_path.stat().st_size / (1024 * 1024):.1f} MB, {mode}) ===\n")
+
+    results = []
+    for backend_name in backends:
+        queue = multiprocessing.Queue()
+        process = multiprocessing.Process(target=_run_backend, args=(str(file_path), backend_name, args.stream, queue))
+        process.start()
+        results.append(queue.get())
+        process.join()
+
+    print(f"{'backend':<10} {'rows':>12} {'seconds':>9} {'rows/s':>12} {'peak RSS':>10}")
+    for result in results:
+        if "error" in result:
+            print(f"{result['backend']:<10} failed: {result['error']}")
+            continue
+        rows_per_sec = result["rows"] / result["seconds"] if result["seconds"] > 0 else 0
+        rss = f"{result['peak_rss_mb']:.0f} MB" if result["peak_rss_mb"] is not None else "n/a"
+        print(f"{result['backend']:<10} {result['rows']:>12,} {result['seconds']:>9.2f} {rows_per_sec:>12,.0f} {rss:>10}")
+
+    # dtype 일치 여부 확인
+    loaded = [result for result in results if "error" not in result]
+    if len(loaded) > 1:
+        reference = loaded[0]
+        print()
+        for result in loaded[1:]:
+            diff = {
+                col: (reference["dtypes"].get(col), result["dtypes"].get(col))
+                for col in set(reference["dtypes"]) | set(result["dtypes"])
+                if reference["dtypes"].get(col) != result["dtypes"].get(col)
+            }
+            if diff:
+                print(f"dtype mismatch {reference['backend']} vs {result['backend']}:")
+                for col, (left, right) in sorted(diff.items()):
+                    print(f"  {col}: {left} != {right}")
+            else:
+                print(f"dtypes identical: {reference['backend']} == {result['backend']}")
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    main()
@@ -0,0 +1,286 @@
+"""
+근태명 rules of claim_data, stored in sambio_human.db
+
+The attendance_rules table maps a 근태명 to the hours the claim_data
+transformer applies to a row:
+
+- leave_hours: 휴가_연차 of the row, added to 실제근무시간 (NULL = not a leave)
+- trip_hours:  실제근무시간 given to a row that has no hours after the leave
+               is added (출장/교육/파견, NULL = no default); recorded in 출장_보정
+
+The table is seeded with DEFAULT_ATTENDANCE_RULES by the first claim upload
+(DatabaseManager, together with the 출장_보정 column of the target table).
+Each upload reads it once in setup and compiles it into an AttendanceRules
+lookup (one hash lookup per distinct 근태명); without the table the defaults
+are used. It is small and edited in place, so it is not kept in the
+reference cache (whose fingerprint does not see UPDATEs). After editing rules,
+recompute_claim_rules re-applies them to the stored claim_data with set-based
+UPDATEs, one month (a day_key range) per transaction:
+
+    python scripts/recompute_claim_rules.py --months 2025-08 2025-09
+
+Rows of a 근태명 without a rule are never touched by the recompute, so a rule
+is retired by setting its hours to NULL rather than by deleting it.
+"""
+import logging
+import sqlite3
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from core.migrations import ensure_day_key
+from utils.day_keys import DAY_KEY
+
+logger = logging.getLogger(__name__)
+
+RULES_TABLE = "attendance_rules"
+
+# Column of claim_data holding the trip default applied to a row (0 = none)
+TRIP_COLUMN = "출장_보정"
+TRIP_COLUMN_TYPE = "REAL DEFAULT 0"
+
+# (근태명, category, leave_hours, trip_hours)
+DEFAULT_ATTENDANCE_RULES: List[Tuple[str, str, Optional[float], Optional[float]]] = [
+    # 연차/반차
+    ('년차', '연차', 8.0, None),
+    ('추가연차', '연차', 8.0, None),
+    ('오전반차(탄력근무제)', '연차', 4.0, None),
+    ('오후반차(탄력근무제)', '연차', 4.0, None),
+    ('2시간 휴가(탄력근무제)', '연차', 2.0, None),
+    ('4시간 휴가(선택근무제)', '연차', 4.0, None),
+    ('6시간 휴가(선택근무제)', '연차', 6.0, None),
+    ('2시간 휴가(선택근무제)', '연차', 2.0, None),
+
+    # 특별휴가
+    ('장기근속휴가', '특별휴가', 8.0, None),
+    ('공휴일휴무(탄력)', '특별휴가', 8.0, None),
+    ('대휴', '특별휴가', 8.0, None),
+    ('대휴(오전)', '특별휴가', 4.0, None),
+    ('기타휴무', '특별휴가', 8.0, None),
+    ('기타결근(연차초과전일)', '특별휴가', 8.0, None),
+    ('재택근무', '특별휴가', 8.0, None),
+
+    # 경조휴가
+    ('본인결혼', '경조휴가', 8.0, None),
+    ('자녀결혼', '경조휴가', 8.0, None),
+    ('형제자매결혼', '경조휴가', 8.0, None),
+    ('배우자형제자매결혼', '경조휴가', 8.0, None),
+    ('부모사망', '경조휴가', 8.0, None),
+    ('배우자부모사망', '경조휴가', 8.0, None),
+    ('조부모사망', '경조휴가', 8.0, None),
+    ('형제자매사망', '경조휴가', 8.0, None),
+    ('경조휴가', '경조휴가', 8.0, None),
+    ('부모수연', '경조휴가', 8.0, None),
+    ('배우자부모수연', '경조휴가', 8.0, None),
+
+    # 출산/육아 휴가
+    ('출산전후휴가(유급)', '출산육아', 8.0, None),
+    ('출산전후휴가(무급)', '출산육아', 8.0, None),
+    ('배우자출산휴가', '출산육아', 8.0, None),
+    ('임신기 근로시간 단축', '출산육아', 2.0, None),  # 하루 2시간 단축
+    ('임신기 근로시간 단축(12~31주)', '출산육아', 2.0, None),
+    ('육아기 근로시간 단축(6시간)', '출산육아', 2.0, None),
+    ('육아기 근로시간 단축(5시간)', '출산육아', 3.0, None),
+
+    # 병가/공가
+    ('직무외병결', '병가공가', 8.0, None),
+    ('공가', '병가공가', 8.0, None),
+    ('특별휴가', '병가공가', 8.0, None),
+
+    # 교육/훈련 (근무 외)
+    ('예비군훈련(전일)', '교육훈련', 8.0, None),
+    ('종합검진(전일)', '교육훈련', 8.0, None),
+    ('예비군/민방위 훈련 후 휴식', '교육훈련', 8.0, None),
+    ('공용외출', '교육훈련', 8.0, None),
+
+    # 휴가가 아니라 근무로 보는 근태명 (근무시간이 0이면 표준 8시간 부여)
+    ('사외교육', '출장교육', None, 8.0),
+    ('국내출장', '출장교육', None, 8.0),
+    ('해외출장', '출장교육', None, 8.0),
+    ('출장', '출장교육', None, 8.0),
+    ('사외파견', '출장교육', None, 8.0),
+]
+
+
+class AttendanceRules:
+    """
+    Compiled 근태명 → (leave_hours, trip_hours) lookup
+
+    lookup() resolves each distinct 근태명 of a column once and broadcasts
+    the hours to the rows, instead of one comparison pass per rule.
+    """
+
+    def __init__(self, rules: pd.DataFrame):
+        """rules: one row per 근태명 with leave_hours and trip_hours columns"""
+        self.names = pd.Index(rules['근태명'].astype(str))
+        # One trailing NaN: the hours of names without a rule (position -1)
+        self._leave = np.append(pd.to_numeric(rules['leave_hours']).to_numpy(dtype=float), np.nan)
+        self._trip = np.append(pd.to_numeric(rules['trip_hours']).to_numpy(dtype=float), np.nan)
+
+    @classmethod
+    def from_defaults(cls) -> "AttendanceRules":
+        return cls(pd.DataFrame(DEFAULT_ATTENDANCE_RULES, columns=['근태명', 'category', 'leave_hours', 'trip_hours']))
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def lookup(self, values: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Hours of each row's 근태명
+
+        Returns:
+            (leave_hours, trip_hours) float arrays aligned with values;
+            NaN where the 근태명 has no such rule (or is missing)
+        """
+        codes, uniques = pd.factorize(values)
+        # Rule position per distinct value, -1 for unknown values and for missing rows (code -1)
+        positions = np.append(self.names.get_indexer(pd.Index(uniques)), -1)[codes]
+        return self._leave[positions], self._trip[positions]
+
+
+def ensure_rules_schema(conn: sqlite3.Connection) -> None:
+    """Create attendance_rules (seeded with the defaults when empty)"""
+    conn.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS {RULES_TABLE} (
+            근태명 TEXT PRIMARY KEY,
+            category TEXT,
+            leave_hours REAL,
+            trip_hours REAL,
+            updated_at TEXT
+        )
+        """
+    )
+    if conn.execute(f"SELECT COUNT(*) FROM {RULES_TABLE}").fetchone()[0] == 0:
+        now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        conn.executemany(
+            f"INSERT OR IGNORE INTO {RULES_TABLE} (근태명, category, leave_hours, trip_hours, updated_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            [(*rule, now) for rule in DEFAULT_ATTENDANCE_RULES]
+        )
+        logger.info(f"{RULES_TABLE} 기본 규칙 {len(DEFAULT_ATTENDANCE_RULES)}건 생성")
+    conn.commit()
+
+
+def has_rules_table(conn: sqlite3.Connection) -> bool:
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (RULES_TABLE,)
+    ).fetchone() is not None
+
+
+def ensure_trip_column(conn: sqlite3.Connection, table: str = "claim_data") -> bool:
+    """
+    Add 출장_보정 to an existing claim table (idempotent)
+
+    Returns:
+        True if the table exists (and now has the column)
+    """
+    columns = [row[1] for row in conn.execute(f'PRAGMA table_info("{table}")')]
+    if not columns:
+        return False
+    if TRIP_COLUMN not in columns:
+        conn.execute(f'ALTER TABLE "{table}" ADD COLUMN {TRIP_COLUMN} {TRIP_COLUMN_TYPE}')
+        conn.commit()
+        logger.info(f"{table}.{TRIP_COLUMN} 컬럼 추가")
+    return True
+
+
+def read_rules(conn: sqlite3.Connection) -> AttendanceRules:
+    """Compile the stored rules"""
+    return AttendanceRules(pd.read_sql_query(
+        f"SELECT 근태명, leave_hours, trip_hours FROM {RULES_TABLE}", conn
+    ))
+
+
+def _claim_months(conn: sqlite3.Connection) -> List[str]:
+    """'YYYY-MM' of every month stored in claim_data (from day_key, whatever the 근무일 format)"""
+    rows = conn.execute(
+        f"SELECT DISTINCT {DAY_KEY} / 100 FROM claim_data WHERE {DAY_KEY} IS NOT NULL ORDER BY 1"
+    ).fetchall()
+    return [f"{row[0] // 100:04d}-{row[0] % 100:02d}" for row in rows]
+
+
+def _month_bounds(month: str) -> Tuple[int, int]:
+    """'2025-08' -> (20250801, 20250831), the day_key range of the month"""
+    period = pd.Period(month, freq='M')
+    return int(period.start_time.strftime('%Y%m%d')), int(period.end_time.strftime('%Y%m%d'))
+
+
+# Recomputed hours of each claim_data row that has a rule:
+# base = 실제근무시간 without the stored leave and trip default, then the rule
+# hours are applied the way the transformer applies them at upload.
+_RECOMPUTE_SQL = f"""
+UPDATE claim_data
+SET 휴가_연차 = target.leave_hours,
+    {TRIP_COLUMN} = target.trip,
+    실제근무시간 = target.hours
+FROM (
+    SELECT
+        row_id,
+        leave_hours,
+        CASE WHEN trip_hours IS NOT NULL AND hours = 0 THEN trip_hours ELSE 0 END AS trip,
+        CASE WHEN trip_hours IS NOT NULL AND hours = 0 THEN trip_hours ELSE hours END AS hours
+    FROM (
+        SELECT
+            c.rowid AS row_id,
+            COALESCE(r.leave_hours, 0) AS leave_hours,
+            c.실제근무시간 - COALESCE(c.휴가_연차, 0) - COALESCE(c.{TRIP_COLUMN}, 0)
+                + COALESCE(r.leave_hours, 0) AS hours,
+            r.trip_hours
+        FROM claim_data c
+        JOIN {RULES_TABLE} r ON r.근태명 = c.근태명
+        WHERE c.{DAY_KEY} BETWEEN :start AND :end
+    )
+) AS target
+WHERE claim_data.rowid = target.row_id
+  AND (claim_data.휴가_연차 IS NOT target.leave_hours
+       OR claim_data.{TRIP_COLUMN} IS NOT target.trip
+       OR claim_data.실제근무시간 IS NOT target.hours)
+"""
+
+
+def recompute_claim_rules(
+    conn: sqlite3.Connection,
+    months: Optional[Iterable[str]] = None,
+    dry_run: bool = False
+) -> Dict[str, int]:
+    """
+    Re-apply the stored rules to claim_data, one month per transaction
+
+    Rows whose 근태명 has a rule get 휴가_연차, 출장_보정 and 실제근무시간
+    recomputed from their base hours; only rows whose values change are
+    written. Trip defaults applied before 출장_보정 was recorded cannot be
+    told apart from real hours and are kept.
+
+    Args:
+        conn: Connection to sambio_human.db
+        months: 'YYYY-MM' months to recompute (None = every stored month)
+        dry_run: Roll each month back after counting its changes
+
+    Returns:
+        Changed rows per month
+    """
+    ensure_rules_schema(conn)
+    # Months are day_key ranges: 근무일 mixes INTEGER, REAL and text values
+    if not ensure_trip_column(conn) or not ensure_day_key(conn, "claim_data"):
+        return {}
+    months = list(months) if months is not None else _claim_months(conn)
+
+    changed: Dict[str, int] = {}
+    for month in months:
+        start, end = _month_bounds(month)
+        try:
+            cursor = conn.execute(_RECOMPUTE_SQL, {'start': start, 'end': end})
+            changed[month] = cursor.rowcount
+            if dry_run:
+                conn.rollback()
+            else:
+                conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        logger.info(f"{month}: {changed[month]:,}행 {'변경 예정' if dry_run else '재계산'}")
+
+    return changed
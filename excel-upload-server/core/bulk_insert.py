@@ -0,0 +1,152 @@
+"""
+Native bulk INSERT of DataFrames into sambio_human.db
+
+DataFrame.to_sql goes through pandas' SQL layer: it re-inspects the table and
+converts every chunk to object row tuples. bulk_insert instead prepares one
+INSERT INTO t (cols) VALUES (?, ...) statement, converts each column once per
+batch from its NumPy/Arrow array to Python values (NaN/NaT/<NA> -> NULL) and
+feeds the zipped columns to executemany, all inside one transaction.
+
+Values are stored like to_sql stores them: floats as REAL, integers and bools
+as INTEGER, text as TEXT and datetimes as 'YYYY-MM-DD HH:MM:SS[.ffffff]'.
+"""
+import logging
+import sqlite3
+import time
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# NumPy scalars left in object columns (e.g. factorized uniques) bind like their Python values
+for _type in (np.int8, np.int16, np.int32, np.int64, np.uint8, np.uint16, np.uint32):
+    sqlite3.register_adapter(_type, int)
+sqlite3.register_adapter(np.bool_, bool)
+
+# Rows converted to Python values at a time (bounds the memory of one batch)
+BULK_BATCH_ROWS = 100_000
+
+
+def table_columns(conn: sqlite3.Connection, table: str) -> List[str]:
+    """Columns of a table in declaration order (empty if the table does not exist)"""
+    return [row[1] for row in conn.execute(f'PRAGMA table_info("{table}")')]
+
+
+def _isoformat(value) -> Optional[str]:
+    return None if pd.isna(value) else value.isoformat(sep=' ')
+
+
+def _with_nulls(array: np.ndarray, missing: np.ndarray) -> list:
+    """array.tolist() with None at the missing positions"""
+    if not missing.any():
+        return array.tolist()
+    values = array.astype(object)
+    values[missing] = None
+    return values.tolist()
+
+
+def column_values(values: pd.Series) -> list:
+    """Python values of a column for executemany (missing values -> None)"""
+    dtype = values.dtype
+    if isinstance(dtype, np.dtype) and dtype.kind in 'iub':
+        return values.to_numpy().tolist()
+    if isinstance(dtype, np.dtype) and dtype.kind == 'f':
+        array = values.to_numpy()
+        return _with_nulls(array, np.isnan(array))
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return [_isoformat(value) for value in values.dt.to_pydatetime()]
+    if isinstance(dtype, pd.api.extensions.ExtensionDtype) and dtype.kind in 'iufb':
+        # Nullable Int64 / Float64 / boolean: NumPy data plus the missing mask
+        missing = values.isna().to_numpy()
+        return _with_nulls(values.to_numpy(dtype=dtype.numpy_dtype, na_value=0), missing)
+    if isinstance(dtype, (pd.CategoricalDtype, pd.StringDtype)):
+        # Each distinct value is converted once; code -1 (missing) takes the trailing None
+        codes, uniques = pd.factorize(values)
+        return np.append(np.asarray(uniques, dtype=object), None)[codes].tolist()
+
+    # Object columns: values keep their Python type (1, 1.0 and True hash alike)
+    array = values.to_numpy(dtype=object, copy=True)
+    missing = pd.isna(array)
+    if missing.any():
+        array[missing] = None
+    return array.tolist()
+
+
+def create_table(conn: sqlite3.Connection, table: str, df: pd.DataFrame, if_exists: str = "append") -> bool:
+    """
+    Create a table for a frame like to_sql would (pandas type mapping, inferred over all rows)
+
+    Args:
+        if_exists: 'append' (keep an existing table), 'replace' (drop it first)
+                   or 'fail' (raise if it exists)
+
+    Returns:
+        True if the table was created
+    """
+    if table_columns(conn, table):
+        if if_exists == "fail":
+            raise ValueError(f"Table '{table}' already exists.")
+        if if_exists == "append":
+            return False
+        conn.execute(f'DROP TABLE "{table}"')
+
+    conn.execute(pd.io.sql.get_schema(df, table, con=conn))
+    conn.commit()
+    return True
+
+
+def bulk_insert(
+    conn: sqlite3.Connection,
+    table: str,
+    df: pd.DataFrame,
+    batch_rows: int = BULK_BATCH_ROWS
+) -> int:
+    """
+    Append a frame to an existing table with executemany, in one transaction
+
+    Columns are matched by name and ordered like PRAGMA table_info; table
+    columns missing from the frame get their defaults. The transaction is
+    rolled back on error.
+
+    Returns:
+        Number of rows inserted
+
+    Raises:
+        ValueError: If the table does not exist or lacks columns of the frame
+    """
+    columns = table_columns(conn, table)
+    if not columns:
+        raise ValueError(f"Table not found: {table}")
+    # SQLite column names are case-insensitive
+    frame_columns = [str(column).lower() for column in df.columns]
+    unknown = [column for column, lower in zip(df.columns, frame_columns) if lower not in {c.lower() for c in columns}]
+    if unknown:
+        raise ValueError(f"table {table} has no column named {', '.join(map(str, unknown))}")
+
+    # Frame column positions in table order (the first one of a duplicated name)
+    names = [column for column in columns if column.lower() in frame_columns]
+    positions = [frame_columns.index(name.lower()) for name in names]
+    quoted = ", ".join(f'"{name}"' for name in names)
+    sql = f'INSERT INTO "{table}" ({quoted}) VALUES ({", ".join("?" * len(names))})'
+
+    total_rows = len(df)
+    started = time.perf_counter()
+    if not conn.in_transaction:
+        conn.execute("BEGIN")
+    try:
+        for start in range(0, total_rows, batch_rows):
+            batch = df.iloc[start:start + batch_rows]
+            conn.executemany(sql, zip(*(column_values(batch.iloc[:, position]) for position in positions)))
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+    elapsed = time.perf_counter() - started
+    logger.info(
+        f"Bulk insert: {total_rows:,} rows into {table} in {elapsed:.2f}s "
+        f"({total_rows / elapsed if elapsed > 0 else 0:,.0f} rows/s)"
+    )
+    return total_rows
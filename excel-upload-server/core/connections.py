@@ -0,0 +1,251 @@
+"""
+Reader pool and serialized writer of sambio_human.db
+
+The upload server talks to the database through one writer and many readers
+(in WAL mode readers keep reading committed data while the writer commits):
+
+- ReaderPool: up to DB_READ_POOL_SIZE query_only connections lent to request
+  threads for stats and preview queries, so they run in parallel with a load
+- SerialWriter: one thread owning the write connection. Every write runs on it
+  as a job, in submission order, so writers never contend for the handle.
+  Statement jobs (write()) queued behind each other are committed together,
+  each inside its own savepoint; when the database is busy (another process
+  holds the write lock past the busy timeout) the batch is retried with
+  exponential backoff.
+
+Jobs submitted from the writer thread itself (a write calling another write)
+run inline.
+
+Configuration (env):
+    DB_READ_POOL_SIZE        read connections (default 4)
+    DB_BUSY_TIMEOUT_MS       busy timeout of every connection (default 5000, like lib/db.ts)
+"""
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_READ_POOL_SIZE = 4
+DEFAULT_BUSY_TIMEOUT_MS = 5000
+
+# Statement jobs committed in one transaction at most
+WRITE_BATCH_MAX = 256
+
+# Retries of a busy statement batch (backoff doubles from WRITE_BACKOFF_S up to WRITE_BACKOFF_MAX_S)
+WRITE_RETRIES = 5
+WRITE_BACKOFF_S = 0.1
+WRITE_BACKOFF_MAX_S = 2.0
+
+
+def read_pool_size() -> int:
+    """Configured number of read connections (DB_READ_POOL_SIZE env)"""
+    return max(1, int(os.getenv("DB_READ_POOL_SIZE", str(DEFAULT_READ_POOL_SIZE))))
+
+
+def busy_timeout_seconds() -> float:
+    """Configured busy timeout in seconds (DB_BUSY_TIMEOUT_MS env)"""
+    return int(os.getenv("DB_BUSY_TIMEOUT_MS", str(DEFAULT_BUSY_TIMEOUT_MS))) / 1000
+
+
+def is_busy(error: BaseException) -> bool:
+    """Whether an error means another connection holds the lock"""
+    message = str(error).lower()
+    return isinstance(error, sqlite3.OperationalError) and ("locked" in message or "busy" in message)
+
+
+class ReaderPool:
+    """Read-only (query_only) connections shared by request threads"""
+
+    def __init__(self, db_path: Path, size: Optional[int] = None):
+        self.db_path = Path(db_path)
+        self.size = size or read_pool_size()
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(self.size)
+
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=busy_timeout_seconds(), check_same_thread=False)
+        conn.execute("PRAGMA query_only = ON")
+        conn.execute("PRAGMA cache_size = -16000")
+        return conn
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a read connection (waits while all of them are in use)"""
+        with self._slots:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                conn = self._open()
+            try:
+                yield conn
+            finally:
+                if conn.in_transaction:
+                    conn.rollback()
+                self._idle.put(conn)
+
+    def close(self) -> None:
+        """Close the idle connections (borrowed ones are closed when returned to a new pool)"""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+class _Job:
+    __slots__ = ("fn", "future", "statement")
+
+    def __init__(self, fn: Callable[[sqlite3.Connection], Any], statement: bool):
+        self.fn = fn
+        self.future: Future = Future()
+        self.statement = statement
+
+
+class SerialWriter:
+    """
+    Single writer thread fed by a queue
+
+    Args:
+        connection: Returns the write connection (opened on first use)
+        batch_size: Statement jobs committed together at most
+    """
+
+    def __init__(self, connection: Callable[[], sqlite3.Connection], batch_size: int = WRITE_BATCH_MAX):
+        self._connection = connection
+        self.batch_size = batch_size
+        self._queue: "queue.Queue[Optional[_Job]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def on_writer_thread(self) -> bool:
+        return self._thread is not None and threading.get_ident() == self._thread.ident
+
+    def submit(self, fn: Callable[[sqlite3.Connection], Any], statement: bool = False) -> Future:
+        """
+        Queue a job fn(conn) for the writer thread
+
+        Args:
+            statement: fn only executes statements and leaves the transaction
+                       to the writer (batch-committed, retried when busy);
+                       other jobs commit themselves
+        """
+        job = _Job(fn, statement)
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="db-writer", daemon=True)
+                self._thread.start()
+            self._queue.put(job)
+        return job.future
+
+    def call(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run fn(*args, **kwargs) on the writer thread and return its result"""
+        if self.on_writer_thread():
+            return fn(*args, **kwargs)
+        return self.submit(lambda conn: fn(*args, **kwargs)).result()
+
+    def write(self, sql: str, params: tuple = ()) -> int:
+        """Execute one write statement (batch-committed); returns its rowcount"""
+        if self.on_writer_thread():
+            conn = self._connection()
+            cursor = conn.execute(sql, params)
+            conn.commit()
+            return cursor.rowcount
+        return self.submit(lambda conn: conn.execute(sql, params).rowcount, statement=True).result()
+
+    def close(self) -> None:
+        """Finish the queued jobs and stop the writer thread"""
+        with self._lock:
+            thread, self._thread = self._thread, None
+            if thread is not None:
+                self._queue.put(None)
+        if thread is not None and thread.ident != threading.get_ident():
+            thread.join()
+
+    def _run(self) -> None:
+        deferred: Optional[_Job] = None
+        while True:
+            job = deferred if deferred is not None else self._queue.get()
+            deferred = None
+            if job is None:
+                return
+            if not job.statement:
+                self._run_job(job)
+                continue
+
+            # Statement jobs already waiting join the batch
+            batch = [job]
+            stop = False
+            while len(batch) < self.batch_size:
+                try:
+                    waiting = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if waiting is None:
+                    stop = True
+                    break
+                if not waiting.statement:
+                    deferred = waiting
+                    break
+                batch.append(waiting)
+            self._commit_batch(batch)
+            if stop:
+                return
+
+    def _run_job(self, job: _Job) -> None:
+        if not job.future.set_running_or_notify_cancel():
+            return
+        try:
+            job.future.set_result(job.fn(self._connection()))
+        except BaseException as e:
+            job.future.set_exception(e)
+
+    def _commit_batch(self, batch: List[_Job]) -> None:
+        """Run statement jobs in one transaction, one savepoint each; retry the batch when busy"""
+        batch = [job for job in batch if job.future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+        conn = self._connection()
+
+        for attempt in range(WRITE_RETRIES + 1):
+            outcomes = []
+            try:
+                if conn.in_transaction:
+                    conn.commit()
+                conn.execute("BEGIN IMMEDIATE")
+                for job in batch:
+                    conn.execute("SAVEPOINT job")
+                    try:
+                        outcomes.append((job.future, job.fn(conn), None))
+                    except Exception as e:
+                        if is_busy(e):
+                            raise
+                        conn.execute("ROLLBACK TO job")
+                        outcomes.append((job.future, None, e))
+                    conn.execute("RELEASE job")
+                conn.commit()
+            except Exception as e:
+                if conn.in_transaction:
+                    conn.rollback()
+                if is_busy(e) and attempt < WRITE_RETRIES:
+                    delay = min(WRITE_BACKOFF_MAX_S, WRITE_BACKOFF_S * 2 ** attempt)
+                    logger.warning(f"DB writer: database busy ({e}), retrying {len(batch)} writes in {delay:.1f}s")
+                    time.sleep(delay)
+                    continue
+                for job in batch:
+                    job.future.set_exception(e)
+                return
+
+            for future, result, error in outcomes:
+                if error is None:
+                    future.set_result(result)
+                else:
+                    future.set_exception(error)
+            return
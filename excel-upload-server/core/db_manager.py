@@ -1,18 +1,71 @@
 """
 Database manager for sambio_human.db operations
 """
+import functools
+import os
 import sqlite3
+import threading
+import time
 import pandas as pd
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Set
 from datetime import datetime
 import logging
 
+from core.attendance_rules import TRIP_COLUMN, ensure_rules_schema, ensure_trip_column
+from core.bulk_insert import BULK_BATCH_ROWS, bulk_insert, create_table
+from core.connections import ReaderPool, SerialWriter, busy_timeout_seconds
+from core.migrations import DAY_KEY_TABLES, EMPLOYEE_KEY_TABLES, ensure_day_key, ensure_employee_key
+from core.wal import apply_journal_mode, checkpoint, wal_size, wal_size_limit_bytes
+from utils.day_keys import DAY_KEY
+from utils.employee_keys import EMP_KEY
+
 logger = logging.getLogger(__name__)
 
+# page cache of a bulk_load session (KiB; the normal connection uses 64MB)
+BULK_LOAD_CACHE_KIB = 512_000
+
+# Loads that drop and recreate the target table's indexes (see DatabaseManager.should_rebuild_indexes)
+BULK_REBUILD_MIN_ROWS = 1_000_000
+BULK_REBUILD_MIN_FRACTION = 0.25
+
+# DDL of indexes dropped by a bulk load, kept until they are recreated
+# (replayed by restore_dropped_indexes when a load was interrupted)
+DROPPED_INDEXES_TABLE = "bulk_load_dropped_indexes"
+DROPPED_INDEXES_DDL = f"""
+CREATE TABLE IF NOT EXISTS {DROPPED_INDEXES_TABLE} (
+    index_name TEXT PRIMARY KEY,
+    table_name TEXT NOT NULL,
+    sql TEXT NOT NULL,
+    dropped_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+)
+"""
+
+
+def rebuild_indexes_enabled() -> bool:
+    """Whether uploads may drop and recreate indexes for large loads (BULK_LOAD_REBUILD_INDEXES=1)"""
+    return os.getenv("BULK_LOAD_REBUILD_INDEXES", "0") == "1"
+
+
+def _writes(method):
+    """Run a DatabaseManager method on its writer thread (see core/connections.py)"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        return self.writer.call(method, self, *args, **kwargs)
+    return wrapper
+
 
 class DatabaseManager:
-    """SQLite database manager"""
+    """
+    SQLite database manager
+
+    Writes (inserts, deletes, key migrations, bulk load sessions, checkpoints)
+    run on one writer thread that owns the write connection; reads (stats,
+    previews) borrow a connection from a read-only pool, so they run in
+    parallel with a load. get_connection() returns the write connection for
+    single-threaded scripts.
+    """
 
     def __init__(self, db_path: str):
         self.db_path = Path(db_path)
@@ -20,134 +73,469 @@ class DatabaseManager:
             raise FileNotFoundError(f"Database not found: {db_path}")
 
         self.conn = None
+        self._connect_lock = threading.Lock()
+        self.writer = SerialWriter(self.get_connection)
+        self.readers = ReaderPool(self.db_path)
+        # Read connection borrowed by the current thread (nested reads reuse it)
+        self._borrowed = threading.local()
+        # (key, table) pairs whose key column, index and triggers (or 출장_보정 column) are known to exist
+        self.key_tables = set()
+        # Journal mode in effect and the last WAL checkpoint (see core/wal.py)
+        self.journal_mode = None
+        self.last_checkpoint = None
         logger.info(f"Database manager initialized: {db_path}")
 
     def get_connection(self) -> sqlite3.Connection:
-        """Get or create database connection"""
-        if self.conn is None:
-            self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
-            self.conn.execute("PRAGMA journal_mode = DELETE")
-            self.conn.execute("PRAGMA synchronous = NORMAL")
-            self.conn.execute("PRAGMA cache_size = -64000")
+        """Get or create the write connection"""
+        with self._connect_lock:
+            if self.conn is None:
+                self.conn = sqlite3.connect(self.db_path, timeout=busy_timeout_seconds(), check_same_thread=False)
+                self.journal_mode = apply_journal_mode(self.conn)
+                self.conn.execute("PRAGMA synchronous = NORMAL")
+                self.conn.execute("PRAGMA cache_size = -64000")
         return self.conn
 
+    @contextmanager
+    def reading(self) -> Iterator[sqlite3.Connection]:
+        """
+        Connection for reads: the write connection on the writer thread (sees
+        the job's own changes), else one borrowed from the read pool
+        """
+        if self.writer.on_writer_thread():
+            yield self.get_connection()
+        elif getattr(self._borrowed, "conn", None) is not None:
+            yield self._borrowed.conn
+        else:
+            with self.readers.connection() as conn:
+                self._borrowed.conn = conn
+                try:
+                    yield conn
+                finally:
+                    self._borrowed.conn = None
+
+    @_writes
+    def checkpoint(self, mode: str = "PASSIVE") -> Optional[Dict[str, Any]]:
+        """
+        WAL checkpoint (PASSIVE, FULL, RESTART or TRUNCATE; see core/wal.py)
+
+        Returns:
+            The checkpoint result, or None when the database is not in WAL mode
+        """
+        conn = self.get_connection()
+        if self.journal_mode != "wal":
+            return None
+
+        if conn.in_transaction:
+            conn.commit()
+        result = checkpoint(conn, mode)
+        result["wal_size_bytes"] = wal_size(self.db_path)
+        self.last_checkpoint = result
+
+        if result["mode"] != "PASSIVE" or result["busy"]:
+            logger.info(
+                f"WAL checkpoint {result['mode']}: {result['checkpointed_frames']:,}/{result['log_frames']:,} frames "
+                f"({result['seconds']:.2f}s, busy={result['busy']}, WAL {result['wal_size_bytes'] / 1024 / 1024:.1f}MB)"
+            )
+        return result
+
+    def wal_health(self) -> Dict[str, Any]:
+        """Journal mode, WAL size against its cap and the last checkpoint"""
+        if self.journal_mode is None:
+            self.writer.call(self.get_connection)
+        size = wal_size(self.db_path)
+        limit = wal_size_limit_bytes()
+        return {
+            "journal_mode": self.journal_mode,
+            "wal_size_bytes": size,
+            "wal_size_limit_bytes": limit,
+            "wal_over_limit": size > limit,
+            "db_size_bytes": self.db_path.stat().st_size,
+            "last_checkpoint": self.last_checkpoint,
+        }
+
     def close(self):
-        """Close database connection"""
+        """Stop the writer thread and close the database connections"""
+        self.writer.close()
+        self.readers.close()
         if self.conn:
             self.conn.close()
             self.conn = None
 
-    def get_table_stats(self, table_name: str, date_column: Optional[str] = None) -> Dict[str, Any]:
-        """Get statistics for a table"""
+    @contextmanager
+    def bulk_load(
+        self,
+        table_name: Optional[str] = None,
+        expected_rows: Optional[int] = None,
+        rebuild_indexes: Optional[bool] = None,
+        keep_indexes: Optional[Iterable[str]] = None
+    ) -> Iterator["DatabaseManager"]:
+        """
+        Session tuned for multi-million-row loads into one table
+
+        Raises cache_size and keeps temp files in memory for the session. With
+        rebuild_indexes, the table's secondary indexes (except keep_indexes,
+        default: the day_key index used by re-upload deletes) are dropped for
+        the session and recreated from their captured DDL afterwards, so rows
+        are appended without per-row B-tree maintenance. At the end the table
+        is analyzed (when its indexes were rebuilt) and PRAGMA optimize runs.
+        Indexes and settings are restored even if the load fails; the dropped
+        DDL is recorded in bulk_load_dropped_indexes until it is replayed, so
+        restore_dropped_indexes() recovers it after a killed process.
+
+        Args:
+            table_name: Table being loaded
+            expected_rows: Rows about to be loaded (used when rebuild_indexes is None)
+            rebuild_indexes: Drop and recreate the secondary indexes
+                             (None = when should_rebuild_indexes says so)
+            keep_indexes: Index names kept during the load
+
+        Usage:
+            with db_manager.bulk_load("tag_data", expected_rows=12_000_000):
+                db_manager.dataframe_to_table(df, "tag_data")
+        """
+        saved, dropped = self._start_bulk_load(table_name, expected_rows, rebuild_indexes, keep_indexes)
+        failed = False
+        try:
+            yield self
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            self._finish_bulk_load(table_name, saved, dropped, failed)
+
+    @_writes
+    def _start_bulk_load(
+        self,
+        table_name: Optional[str],
+        expected_rows: Optional[int],
+        rebuild_indexes: Optional[bool],
+        keep_indexes: Optional[Iterable[str]]
+    ) -> tuple:
+        """Session settings and dropped indexes of bulk_load; returns (saved pragmas, dropped indexes)"""
         conn = self.get_connection()
-        cursor = conn.cursor()
+        saved = {pragma: conn.execute(f"PRAGMA {pragma}").fetchone()[0] for pragma in ("cache_size", "temp_store")}
+        conn.execute(f"PRAGMA cache_size = -{BULK_LOAD_CACHE_KIB}")
+        conn.execute("PRAGMA temp_store = MEMORY")
+
+        if rebuild_indexes is None:
+            rebuild_indexes = table_name is not None and self.should_rebuild_indexes(table_name, expected_rows)
+        if keep_indexes is None:
+            keep_indexes = [f"idx_{table_name}_{DAY_KEY}"]
 
+        dropped: List[tuple] = []
         try:
-            # Check if table exists
-            cursor.execute(
-                "SELECT name FROM sqlite_master WHERE type='table' AND name=?",
+            if rebuild_indexes and table_name and self.table_exists(table_name):
+                # Key indexes and triggers exist before the drop, so inserts do not recreate them mid-load
+                for key in (EMP_KEY, DAY_KEY):
+                    self.ensure_key(key, table_name)
+                dropped = self._drop_secondary_indexes(table_name, set(keep_indexes))
+        except BaseException:
+            self._finish_bulk_load(table_name, saved, dropped, failed=True)
+            raise
+        return saved, dropped
+
+    @_writes
+    def _finish_bulk_load(self, table_name: Optional[str], saved: Dict[str, Any], dropped: List[tuple], failed: bool) -> None:
+        """Recreate the dropped indexes, analyze, checkpoint and restore the session settings"""
+        conn = self.get_connection()
+        if failed and conn.in_transaction:
+            conn.rollback()
+        try:
+            self._recreate_indexes(table_name, dropped)
+            if dropped:
+                conn.execute(f'ANALYZE "{table_name}"')
+            conn.execute("PRAGMA optimize")
+            conn.commit()
+            # Reset the WAL the load filled (waits for readers up to the busy timeout)
+            self.checkpoint("TRUNCATE")
+        except Exception as e:
+            if not failed:
+                raise
+            # Keep the load's error; unrestored indexes stay recorded for restore_dropped_indexes
+            logger.error(f"Bulk load: cleanup after the failed load of {table_name} failed: {e}")
+        finally:
+            for pragma, value in saved.items():
+                conn.execute(f"PRAGMA {pragma} = {value}")
+
+    def should_rebuild_indexes(self, table_name: str, expected_rows: Optional[int]) -> bool:
+        """
+        Whether a load is large enough to drop and recreate the table's indexes:
+        at least BULK_REBUILD_MIN_ROWS rows and BULK_REBUILD_MIN_FRACTION of the
+        rows already stored (rebuilding reindexes the whole table)
+        """
+        if not expected_rows or expected_rows < BULK_REBUILD_MIN_ROWS:
+            return False
+        if not self.table_exists(table_name):
+            return False
+        # MAX(rowid) estimates the row count without scanning the table
+        return expected_rows >= self.max_rowid(table_name) * BULK_REBUILD_MIN_FRACTION
+
+    def _drop_secondary_indexes(self, table_name: str, keep: Set[str]) -> List[tuple]:
+        """Drop the explicitly created indexes of a table; returns their (name, DDL)"""
+        conn = self.get_connection()
+        indexes = [
+            (name, sql) for name, sql in conn.execute(
+                "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL",
                 (table_name,)
             )
-            if not cursor.fetchone():
+            if name not in keep
+        ]
+        if not indexes:
+            return indexes
+
+        # The DDL is recorded in the drop's transaction, so a killed load can be repaired
+        conn.execute(DROPPED_INDEXES_DDL)
+        for name, sql in indexes:
+            logger.info(f"Bulk load: dropping index {name} ({sql})")
+            conn.execute(
+                f"INSERT OR REPLACE INTO {DROPPED_INDEXES_TABLE} (index_name, table_name, sql) VALUES (?, ?, ?)",
+                (name, table_name, sql)
+            )
+            conn.execute(f'DROP INDEX "{name}"')
+        conn.commit()
+        return indexes
+
+    def _recreate_indexes(self, table_name: Optional[str], indexes: List[tuple]) -> None:
+        """Recreate dropped indexes from their DDL (logged again if one fails)"""
+        conn = self.get_connection()
+        for position, (name, sql) in enumerate(indexes):
+            started = time.perf_counter()
+            try:
+                conn.execute(sql)
+                conn.execute(f"DELETE FROM {DROPPED_INDEXES_TABLE} WHERE index_name = ?", (name,))
+                conn.commit()
+            except Exception:
+                logger.error(
+                    f"Bulk load: failed to recreate index {name} on {table_name}; recreate manually:\n"
+                    + ";\n".join(ddl for _, ddl in indexes[position:])
+                )
+                raise
+            logger.info(f"Bulk load: recreated index {name} ({time.perf_counter() - started:.2f}s)")
+
+    @_writes
+    def restore_dropped_indexes(self) -> int:
+        """
+        Recreate the indexes a bulk load dropped and never restored (process
+        killed mid-load, failed rebuild) from bulk_load_dropped_indexes
+
+        Returns:
+            Indexes recreated
+        """
+        if not self.table_exists(DROPPED_INDEXES_TABLE):
+            return 0
+        conn = self.get_connection()
+        rows = conn.execute(
+            f"SELECT table_name, index_name, sql FROM {DROPPED_INDEXES_TABLE} ORDER BY table_name, dropped_at"
+        ).fetchall()
+        existing = {name for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type IN ('index', 'table')")}
+        stale = [name for table, name, _ in rows if name in existing or table not in existing]
+        if stale:
+            conn.executemany(f"DELETE FROM {DROPPED_INDEXES_TABLE} WHERE index_name = ?", [(name,) for name in stale])
+            conn.commit()
+        rows = [row for row in rows if row[1] not in stale]
+
+        restored = 0
+        for table_name in dict.fromkeys(table for table, _, _ in rows):
+            indexes = [(name, sql) for table, name, sql in rows if table == table_name]
+            logger.warning(f"Restoring {len(indexes)} index(es) dropped by an interrupted bulk load of {table_name}")
+            self._recreate_indexes(table_name, indexes)
+            conn.execute(f'ANALYZE "{table_name}"')
+            conn.commit()
+            restored += len(indexes)
+        return restored
+
+    @_writes
+    def ensure_key(self, key: str, table_name: str) -> bool:
+        """
+        emp_key / day_key column of a table, added and backfilled on first use
+        (see core/migrations.py; checked once per table)
+
+        Returns:
+            True if the table has the key column
+        """
+        if (key, table_name) in self.key_tables:
+            return True
+
+        registry, ensure = {
+            EMP_KEY: (EMPLOYEE_KEY_TABLES, ensure_employee_key),
+            DAY_KEY: (DAY_KEY_TABLES, ensure_day_key),
+        }[key]
+        if table_name not in registry or not self.table_exists(table_name):
+            return False
+        if not ensure(self.get_connection(), table_name):
+            return False
+
+        self.key_tables.add((key, table_name))
+        return True
+
+    @_writes
+    def ensure_attendance_schema(self, table_name: str) -> bool:
+        """
+        attendance_rules (seeded with the defaults) and the 출장_보정 column of
+        a claim table, for frames of the claim_data transformer (checked once per table)
+
+        Returns:
+            True if the table has the column
+        """
+        if (TRIP_COLUMN, table_name) in self.key_tables:
+            return True
+
+        conn = self.get_connection()
+        ensure_rules_schema(conn)
+        if not ensure_trip_column(conn, table_name):
+            return False
+
+        self.key_tables.add((TRIP_COLUMN, table_name))
+        return True
+
+    def get_day_range(self, table_name: str) -> Optional[Dict[str, str]]:
+        """
+        First and last day of a time-series table from its day_key index
+
+        Returns:
+            {"min": "YYYY-MM-DD", "max": "YYYY-MM-DD"}, or None without day_key or rows
+        """
+        with self.reading() as conn:
+            # Stats never start a migration (nor wait for the writer): tables without day_key yet are read the old way
+            if (DAY_KEY, table_name) not in self.key_tables:
+                columns = [row[1] for row in conn.execute(f'PRAGMA table_info("{table_name}")')]
+                if DAY_KEY not in columns:
+                    return None
+
+            min_day, max_day = conn.execute(
+                f"SELECT MIN({DAY_KEY}), MAX({DAY_KEY}) FROM {table_name}"
+            ).fetchone()
+        if min_day is None:
+            return None
+
+        def format_day(day: int) -> str:
+            day = str(day)
+            return f"{day[:4]}-{day[4:6]}-{day[6:8]}"
+
+        return {"min": format_day(min_day), "max": format_day(max_day)}
+
+    def get_table_stats(self, table_name: str, date_column: Optional[str] = None) -> Dict[str, Any]:
+        """Get statistics for a table (on a read connection)"""
+        with self.reading() as conn:
+            cursor = conn.cursor()
+
+            try:
+                # Check if table exists
+                cursor.execute(
+                    "SELECT name FROM sqlite_master WHERE type='table' AND name=?",
+                    (table_name,)
+                )
+                if not cursor.fetchone():
+                    return {
+                        "exists": False,
+                        "row_count": 0,
+                        "date_range": None
+                    }
+
+                # Get row count
+                cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
+                row_count = cursor.fetchone()[0]
+
+                # Get date range: day_key index of time-series tables, else the date column
+                date_range = self.get_day_range(table_name)
+                if date_range is None and date_column:
+                    try:
+                        cursor.execute(
+                            f"SELECT MIN({date_column}), MAX({date_column}) FROM {table_name}"
+                        )
+                        min_date, max_date = cursor.fetchone()
+                        if min_date and max_date:
+                            # Format date string: 20250101 -> 2025-01-01 or 2025-01-01 00:00:00 -> 2025-01-01
+                            def format_date(date_str):
+                                date_str = str(date_str)
+
+                                # If already in YYYY-MM-DD format (with optional time), extract date part
+                                if '-' in date_str:
+                                    return date_str[:10]  # 2025-01-01 00:00:00 -> 2025-01-01
+
+                                # If in YYYYMMDD format, convert to YYYY-MM-DD
+                                date_str = date_str[:8]  # Take first 8 characters
+                                if len(date_str) == 8 and date_str.isdigit():
+                                    return f"{date_str[:4]}-{date_str[4:6]}-{date_str[6:8]}"
+
+                                return date_str
+
+                            date_range = {
+                                "min": format_date(min_date),
+                                "max": format_date(max_date)
+                            }
+                    except Exception as e:
+                        logger.warning(f"Could not get date range for {table_name}: {e}")
+
+                return {
+                    "exists": True,
+                    "row_count": row_count,
+                    "date_range": date_range
+                }
+
+            except Exception as e:
+                logger.error(f"Error getting stats for {table_name}: {e}")
                 return {
                     "exists": False,
                     "row_count": 0,
-                    "date_range": None
+                    "date_range": None,
+                    "error": str(e)
                 }
 
-            # Get row count
-            cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
-            row_count = cursor.fetchone()[0]
-
-            # Get date range if date column exists
-            date_range = None
-            if date_column:
-                try:
-                    cursor.execute(
-                        f"SELECT MIN({date_column}), MAX({date_column}) FROM {table_name}"
-                    )
-                    min_date, max_date = cursor.fetchone()
-                    if min_date and max_date:
-                        # Format date string: 20250101 -> 2025-01-01 or 2025-01-01 00:00:00 -> 2025-01-01
-                        def format_date(date_str):
-                            date_str = str(date_str)
-
-                            # If already in YYYY-MM-DD format (with optional time), extract date part
-                            if '-' in date_str:
-                                return date_str[:10]  # 2025-01-01 00:00:00 -> 2025-01-01
-
-                            # If in YYYYMMDD format, convert to YYYY-MM-DD
-                            date_str = date_str[:8]  # Take first 8 characters
-                            if len(date_str) == 8 and date_str.isdigit():
-                                return f"{date_str[:4]}-{date_str[4:6]}-{date_str[6:8]}"
-
-                            return date_str
-
-                        date_range = {
-                            "min": format_date(min_date),
-                            "max": format_date(max_date)
-                        }
-                except Exception as e:
-                    logger.warning(f"Could not get date range for {table_name}: {e}")
-
-            return {
-                "exists": True,
-                "row_count": row_count,
-                "date_range": date_range
-            }
-
-        except Exception as e:
-            logger.error(f"Error getting stats for {table_name}: {e}")
-            return {
-                "exists": False,
-                "row_count": 0,
-                "date_range": None,
-                "error": str(e)
-            }
-
+    @_writes
     def dataframe_to_table(
         self,
         df: pd.DataFrame,
         table_name: str,
         if_exists: str = "append",
-        chunk_size: int = 5000
+        chunk_size: int = BULK_BATCH_ROWS
     ) -> int:
         """
-        Insert DataFrame into SQLite table with chunking
+        Insert DataFrame into SQLite table with a native bulk INSERT
+
+        A missing table ('append') or the replaced table ('replace') is created
+        from the frame's columns by pandas; rows are then written with
+        executemany in one transaction (see core/bulk_insert.py).
 
         Args:
             df: DataFrame to insert
             table_name: Target table name
             if_exists: 'append', 'replace', or 'fail'
-            chunk_size: Number of rows per batch
+            chunk_size: Number of rows converted per batch
 
         Returns:
             Number of rows inserted
         """
         conn = self.get_connection()
 
-        try:
-            # Get total rows
-            total_rows = len(df)
-            logger.info(f"Inserting {total_rows:,} rows into {table_name} (mode: {if_exists})")
-
-            # Insert in chunks
-            rows_inserted = 0
-            for i in range(0, total_rows, chunk_size):
-                chunk = df.iloc[i:i + chunk_size]
-                chunk.to_sql(
-                    table_name,
-                    conn,
-                    if_exists=if_exists if i == 0 else 'append',
-                    index=False
-                )
-                rows_inserted += len(chunk)
+        if if_exists == "replace":
+            # The new table gets its key index and triggers again below
+            self.key_tables = {(key, table) for key, table in self.key_tables if table != table_name}
 
-                if (i + chunk_size) % (chunk_size * 4) == 0:  # Log every 4 chunks
-                    logger.info(f"Progress: {rows_inserted:,}/{total_rows:,} rows ({rows_inserted/total_rows*100:.1f}%)")
+        # Frames carrying emp_key / day_key need the columns (added and backfilled once) in an existing table
+        keys = [key for key in (EMP_KEY, DAY_KEY) if key in df.columns]
+        if if_exists == "append":
+            for key in keys:
+                self.ensure_key(key, table_name)
+            # claim frames carry 출장_보정, which claim tables created before it lack
+            if TRIP_COLUMN in df.columns:
+                self.ensure_attendance_schema(table_name)
 
-            conn.commit()
+        try:
+            logger.info(f"Inserting {len(df):,} rows into {table_name} (mode: {if_exists})")
+
+            create_table(conn, table_name, df, if_exists)
+            rows_inserted = bulk_insert(conn, table_name, df, batch_rows=chunk_size)
             logger.info(f"Insert complete: {rows_inserted:,} rows into {table_name}")
+
+            # Between frames: copy the committed frame back without waiting for readers
+            self.checkpoint("PASSIVE")
+
+            # Index and triggers of a table created by this insert
+            for key in keys:
+                self.ensure_key(key, table_name)
+            if TRIP_COLUMN in df.columns:
+                self.ensure_attendance_schema(table_name)
             return rows_inserted
 
         except Exception as e:
@@ -156,47 +544,59 @@ class DatabaseManager:
             raise
 
     def execute_query(self, query: str, params: tuple = ()) -> list:
-        """Execute a SELECT query"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute(query, params)
-        return cursor.fetchall()
+        """Execute a SELECT query (on a read connection)"""
+        with self.reading() as conn:
+            return conn.execute(query, params).fetchall()
 
     def execute_update(self, query: str, params: tuple = ()) -> int:
-        """Execute an UPDATE/DELETE query"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute(query, params)
-        conn.commit()
-        return cursor.rowcount
+        """Execute an UPDATE/DELETE query (queued to the writer, batch-committed)"""
+        return self.writer.write(query, params)
 
     def table_exists(self, table_name: str) -> bool:
         """Check if table exists in database"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute(
-            "SELECT name FROM sqlite_master WHERE type='table' AND name=?",
-            (table_name,)
-        )
-        return cursor.fetchone() is not None
+        with self.reading() as conn:
+            cursor = conn.execute(
+                "SELECT name FROM sqlite_master WHERE type='table' AND name=?",
+                (table_name,)
+            )
+            return cursor.fetchone() is not None
 
     def get_row_count(self, table_name: str) -> int:
         """Get row count for a table"""
+        with self.reading() as conn:
+            if not self.table_exists(table_name):
+                return 0
+            return conn.execute(f"SELECT COUNT(*) FROM {table_name}").fetchone()[0]
+
+    def max_rowid(self, table_name: str) -> int:
+        """Largest rowid of a table (0 when it is empty or missing); rows appended later get larger ones"""
+        with self.reading() as conn:
+            if not self.table_exists(table_name):
+                return 0
+            return conn.execute(f'SELECT MAX(rowid) FROM "{table_name}"').fetchone()[0] or 0
+
+    @_writes
+    def delete_rows_after(self, table_name: str, rowid: int) -> int:
+        """
+        Delete the rows appended after max_rowid() returned rowid (undo of a
+        failed append; rows other writers appended meanwhile go too)
+
+        Returns:
+            Rows deleted
+        """
         if not self.table_exists(table_name):
             return 0
-
         conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
-        return cursor.fetchone()[0]
+        deleted = conn.execute(f'DELETE FROM "{table_name}" WHERE rowid > ?', (rowid,)).rowcount
+        conn.commit()
+        logger.info(f"Deleted {deleted:,} rows appended to {table_name} after rowid {rowid:,}")
+        return deleted
 
     def insert_dataframe(self, table_name: str, df: pd.DataFrame, if_exists: str = "append") -> int:
         """Insert DataFrame into table (alias for dataframe_to_table)"""
         # Add uploaded_at timestamp only if table has that column
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute(f"PRAGMA table_info({table_name})")
-        columns = [row[1] for row in cursor.fetchall()]
+        with self.reading() as conn:
+            columns = [row[1] for row in conn.execute(f"PRAGMA table_info({table_name})")]
 
         if 'uploaded_at' in columns and 'uploaded_at' not in df.columns:
             df = df.copy()
@@ -204,6 +604,7 @@ class DatabaseManager:
 
         return self.dataframe_to_table(df, table_name, if_exists)
 
+    @_writes
     def delete_by_date_range(
         self,
         table_name: str,
@@ -215,6 +616,9 @@ class DatabaseManager:
         """
         Delete rows within a date range
 
+        Time-series tables with day_key (see core/migrations.py) delete by a
+        day_key index range; other tables compare the date column row by row.
+
         Args:
             table_name: Target table name
             date_column: Date column name
@@ -226,6 +630,27 @@ class DatabaseManager:
             Number of rows deleted
         """
         conn = self.get_connection()
+
+        if self.ensure_key(DAY_KEY, table_name):
+            min_day = int(min_date.replace('-', '')[:8])
+            max_day = int(max_date.replace('-', '')[:8])
+            try:
+                cursor = conn.execute(
+                    f"DELETE FROM {table_name} WHERE {DAY_KEY} BETWEEN ? AND ?",
+                    (min_day, max_day)
+                )
+                conn.commit()
+            except Exception as e:
+                conn.rollback()
+                logger.error(f"Error deleting data from {table_name}: {e}")
+                raise
+
+            if cursor.rowcount == 0:
+                logger.info(f"No rows to delete from {table_name} for date range {min_date} ~ {max_date}")
+            else:
+                logger.info(f"Deleted {cursor.rowcount:,} rows from {table_name} for date range {min_date} ~ {max_date}")
+            return cursor.rowcount
+
         cursor = conn.cursor()
 
         try:
@@ -3,26 +3,685 @@ Excel file loader with multi-sheet support
 Based on SambioHR5/Data_Uploader/core/data_loader.py
 """
 import pandas as pd
+import codecs
+import csv
+import hashlib
 import logging
+import os
+import shutil
+import tempfile
+from datetime import date, datetime
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
 from pathlib import Path
-from typing import List
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+from core.load_planner import plan_load
+from core.staging_cache import StagingCache, hash_file, read_frame, write_frame
+from core.xlsx_inspector import inspect_xlsx
+from handlers.data_transformers import TRANSFORM_SPECS
+from models.data_types import DATA_TYPES, LoadPlan, ReadSchema
+from utils.memory import DEFAULT_CATEGORY_THRESHOLD, align_categories, encode_low_cardinality, log_memory_report
 
 logger = logging.getLogger(__name__)
 
+# Default number of rows per DataFrame chunk in streaming mode
+DEFAULT_CHUNK_SIZE = 50_000
+
+# calamine decodes a whole sheet into memory at once; above this size the
+# openpyxl read-only backend is preferred to keep peak memory bounded
+CALAMINE_MAX_FILE_MB = 512
+
+# Block size for the UTF-8 validity scan of delimited text files
+ENCODING_SCAN_BLOCK_SIZE = 1024 * 1024
+
+# Korean Windows exports (Excel "CSV", legacy systems) are CP949 when not UTF-8
+FALLBACK_TEXT_ENCODING = "cp949"
+
+
+class ReaderBackend:
+    """
+    Base class for workbook reader backends
+
+    read_sheet() returns a whole sheet through pd.read_excel with the
+    backend's engine; iter_sheets() streams raw row tuples sheet by sheet.
+    Both paths go through _harmonize_dtypes so every backend produces the
+    same dtypes for the same workbook.
+    """
+
+    name = "base"
+    engine: Optional[str] = None
+    extensions: Tuple[str, ...] = ()
+
+    # Formats that are cheap to re-read (Parquet) skip the staging cache
+    cacheable = True
+
+    # Backends that read DataFrame chunks natively override iter_chunks()
+    chunked = False
+
+    def is_available(self) -> bool:
+        return True
+
+    def supports(self, file_path: Path) -> bool:
+        return file_path.suffix.lower() in self.extensions and self.is_available()
+
+    def sheet_names(self, file_path: Path) -> List[str]:
+        return pd.ExcelFile(file_path, engine=self.engine).sheet_names
+
+    def read_sheet(self, file_path: Path, sheet_name=0, **kwargs) -> pd.DataFrame:
+        df = pd.read_excel(file_path, sheet_name=sheet_name, engine=self.engine, **kwargs)
+        return _harmonize_dtypes(df)
+
+    def iter_sheets(self, file_path: Path, first_sheet_only: bool = False) -> Iterator[Tuple[str, Iterator[tuple]]]:
+        """Yield (sheet_name, row iterator) pairs; the header is the first non-blank row"""
+        sheet_names = self.sheet_names(file_path)
+        if first_sheet_only:
+            sheet_names = sheet_names[:1]
+
+        for sheet_name in sheet_names:
+            df = pd.read_excel(file_path, sheet_name=sheet_name, engine=self.engine, header=None)
+            rows = (tuple(None if pd.isna(v) else v for v in row) for row in df.itertuples(index=False))
+            yield sheet_name, rows
+
+    def iter_chunks(
+        self,
+        file_path: Path,
+        chunk_size: int,
+        usecols: Optional[Callable[[str], bool]] = None,
+        dtype: Optional[dict] = None
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Yield the first sheet in chunk_size row slices
+
+        Fallback for backends without native chunks: the sheet is parsed whole
+        with read_sheet(), so it only bounds the size of downstream frames.
+        """
+        kwargs = {}
+        if usecols is not None:
+            kwargs["usecols"] = usecols
+        if dtype:
+            kwargs["dtype"] = dtype
+        df = self.read_sheet(file_path, sheet_name=0, **kwargs)
+        for start in range(0, len(df), chunk_size):
+            yield df.iloc[start:start + chunk_size].reset_index(drop=True)
+
+    def row_count(self, file_path: Path) -> Optional[int]:
+        """Data row count if known without parsing (None otherwise)"""
+        return None
+
+
+class OpenpyxlBackend(ReaderBackend):
+    """openpyxl in read-only mode (pandas' default engine for .xlsx)"""
+
+    name = "openpyxl"
+    engine = "openpyxl"
+    extensions = (".xlsx", ".xlsm")
+
+    def sheet_names(self, file_path: Path) -> List[str]:
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(file_path, read_only=True)
+        try:
+            return workbook.sheetnames
+        finally:
+            workbook.close()
+
+    def iter_sheets(self, file_path: Path, first_sheet_only: bool = False) -> Iterator[Tuple[str, Iterator[tuple]]]:
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            sheet_names = workbook.sheetnames[:1] if first_sheet_only else workbook.sheetnames
+            for sheet_name in sheet_names:
+                yield sheet_name, workbook[sheet_name].iter_rows(values_only=True)
+        finally:
+            workbook.close()
+
+
+class CalamineBackend(ReaderBackend):
+    """Rust-backed calamine reader (python-calamine), handles .xlsx and .xls"""
+
+    name = "calamine"
+    engine = "calamine"
+    extensions = (".xlsx", ".xlsm", ".xls", ".xlsb")
+
+    def is_available(self) -> bool:
+        try:
+            import python_calamine  # noqa: F401
+            return True
+        except ImportError:
+            return False
+
+    def sheet_names(self, file_path: Path) -> List[str]:
+        from python_calamine import CalamineWorkbook
+
+        return CalamineWorkbook.from_path(str(file_path)).sheet_names
+
+    def iter_sheets(self, file_path: Path, first_sheet_only: bool = False) -> Iterator[Tuple[str, Iterator[tuple]]]:
+        from python_calamine import CalamineWorkbook
+
+        workbook = CalamineWorkbook.from_path(str(file_path))
+        sheet_names = workbook.sheet_names[:1] if first_sheet_only else workbook.sheet_names
+        for sheet_name in sheet_names:
+            sheet = workbook.get_sheet_by_name(sheet_name)
+            rows = (tuple(_convert_calamine_cell(v) for v in row) for row in sheet.iter_rows())
+            yield sheet_name, rows
+
+
+class XlrdBackend(ReaderBackend):
+    """Legacy .xls reader used when calamine is not installed"""
+
+    name = "xlrd"
+    engine = "xlrd"
+    extensions = (".xls",)
+
+    def is_available(self) -> bool:
+        try:
+            import xlrd  # noqa: F401
+            return True
+        except ImportError:
+            return False
+
+
+def detect_text_encoding(file_path: Path) -> str:
+    """
+    Detect the encoding of a delimited text file
+
+    The whole file is validated as UTF-8 block by block (a fast C-level
+    decode, no parsing); anything that is not valid UTF-8 is read as CP949.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    try:
+        with open(file_path, "rb") as f:
+            for block in iter(lambda: f.read(ENCODING_SCAN_BLOCK_SIZE), b""):
+                decoder.decode(block)
+            decoder.decode(b"", final=True)
+    except UnicodeDecodeError:
+        return FALLBACK_TEXT_ENCODING
+    return "utf-8-sig"
+
+
+class CsvBackend(ReaderBackend):
+    """Delimited text (CSV/TSV) through pd.read_csv, UTF-8 or CP949"""
+
+    name = "csv"
+    extensions = (".csv", ".tsv", ".txt")
+    chunked = True
+
+    def sheet_names(self, file_path: Path) -> List[str]:
+        return [file_path.stem]
+
+    def _read_options(self, file_path: Path) -> dict:
+        encoding = detect_text_encoding(file_path)
+        if file_path.suffix.lower() == ".tsv":
+            return {"encoding": encoding, "sep": "\t"}
+
+        with open(file_path, "r", encoding=encoding, newline="") as f:
+            sample = f.read(64 * 1024)
+        try:
+            sep = csv.Sniffer().sniff(sample, delimiters=",\t;|").delimiter
+        except csv.Error:
+            sep = ","
+        return {"encoding": encoding, "sep": sep}
+
+    def read_sheet(self, file_path: Path, sheet_name=0, **kwargs) -> pd.DataFrame:
+        df = pd.read_csv(file_path, **self._read_options(file_path), **kwargs)
+        return _harmonize_dtypes(df)
+
+    def iter_chunks(
+        self,
+        file_path: Path,
+        chunk_size: int,
+        usecols: Optional[Callable[[str], bool]] = None,
+        dtype: Optional[dict] = None
+    ) -> Iterator[pd.DataFrame]:
+        with pd.read_csv(
+            file_path,
+            chunksize=chunk_size,
+            usecols=usecols,
+            dtype=dtype,
+            **self._read_options(file_path)
+        ) as reader:
+            for chunk in reader:
+                yield _harmonize_dtypes(chunk)
+
+
+class ParquetBackend(ReaderBackend):
+    """Parquet through pyarrow, read by row group batches"""
+
+    name = "parquet"
+    extensions = (".parquet",)
+    cacheable = False
+    chunked = True
+
+    def is_available(self) -> bool:
+        try:
+            import pyarrow.parquet  # noqa: F401
+            return True
+        except ImportError:
+            return False
+
+    def sheet_names(self, file_path: Path) -> List[str]:
+        return [file_path.stem]
+
+    @staticmethod
+    def _columns(parquet_file, usecols: Optional[Callable[[str], bool]]) -> Optional[List[str]]:
+        if usecols is None:
+            return None
+        return [name for name in parquet_file.schema_arrow.names if usecols(name)]
+
+    def read_sheet(self, file_path: Path, sheet_name=0, **kwargs) -> pd.DataFrame:
+        import pyarrow.parquet as pq
+
+        parquet_file = pq.ParquetFile(file_path)
+        columns = self._columns(parquet_file, kwargs.get("usecols"))
+        nrows = kwargs.get("nrows")
+
+        if nrows is not None:
+            batch = next(parquet_file.iter_batches(batch_size=max(nrows, 1), columns=columns), None)
+            df = batch.to_pandas() if batch is not None else pd.DataFrame(columns=columns)
+            df = df.head(nrows)
+        else:
+            df = parquet_file.read(columns=columns).to_pandas()
+
+        if kwargs.get("dtype"):
+            df = df.astype({col: dtype for col, dtype in kwargs["dtype"].items() if col in df.columns})
+        return _harmonize_dtypes(df)
+
+    def iter_chunks(
+        self,
+        file_path: Path,
+        chunk_size: int,
+        usecols: Optional[Callable[[str], bool]] = None,
+        dtype: Optional[dict] = None
+    ) -> Iterator[pd.DataFrame]:
+        import pyarrow.parquet as pq
+
+        parquet_file = pq.ParquetFile(file_path)
+        columns = self._columns(parquet_file, usecols)
+        for batch in parquet_file.iter_batches(batch_size=chunk_size, columns=columns):
+            yield _harmonize_dtypes(batch.to_pandas())
+
+    def row_count(self, file_path: Path) -> Optional[int]:
+        import pyarrow.parquet as pq
+
+        return pq.ParquetFile(file_path).metadata.num_rows
+
+
+READER_BACKENDS: Dict[str, ReaderBackend] = {
+    backend.name: backend
+    for backend in (CalamineBackend(), OpenpyxlBackend(), XlrdBackend(), CsvBackend(), ParquetBackend())
+}
+
+# File extensions accepted by the upload endpoints
+SUPPORTED_EXTENSIONS: Tuple[str, ...] = tuple(
+    dict.fromkeys(ext for backend in READER_BACKENDS.values() for ext in backend.extensions)
+)
+
+
+def get_reader_backend(name: str) -> ReaderBackend:
+    """Get a reader backend by name"""
+    if name not in READER_BACKENDS:
+        raise ValueError(f"Unknown reader backend: {name}")
+    backend = READER_BACKENDS[name]
+    if not backend.is_available():
+        raise ValueError(f"Reader backend not installed: {name}")
+    return backend
+
+
+def select_reader_backend(file_path: Path, streaming: bool = False) -> ReaderBackend:
+    """
+    Pick a reader backend from file format and size
+
+    - .csv/.tsv/.txt: pd.read_csv; .parquet: pyarrow
+    - .xls: calamine, falling back to xlrd
+    - .xlsx streaming, or files above CALAMINE_MAX_FILE_MB: openpyxl read-only
+    - other .xlsx: calamine when installed, otherwise openpyxl read-only
+    """
+    suffix = file_path.suffix.lower()
+    calamine = READER_BACKENDS["calamine"]
+
+    if suffix in CsvBackend.extensions:
+        return READER_BACKENDS["csv"]
+
+    if suffix in ParquetBackend.extensions:
+        return get_reader_backend("parquet")
+
+    if suffix == ".xls":
+        for name in ("calamine", "xlrd"):
+            if READER_BACKENDS[name].is_available():
+                return READER_BACKENDS[name]
+        raise ValueError("No reader backend installed for .xls files (install python-calamine or xlrd)")
+
+    if suffix == ".xlsb":
+        return get_reader_backend("calamine")
+
+    file_size_mb = file_path.stat().st_size / (1024 * 1024)
+    if streaming or file_size_mb > CALAMINE_MAX_FILE_MB or not calamine.is_available():
+        return READER_BACKENDS["openpyxl"]
+    return calamine
+
+
+def _convert_calamine_cell(value):
+    """Convert a raw calamine cell to the value openpyxl would return"""
+    if value == "":
+        return None
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, date) and not isinstance(value, datetime):
+        return datetime(value.year, value.month, value.day)
+    return value
+
+
+def _harmonize_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """Normalize backend-dependent dtypes (datetime resolution) to one canonical form"""
+    for col in df.columns:
+        if pd.api.types.is_datetime64_dtype(df[col].dtype) and df[col].dtype != "datetime64[ns]":
+            df[col] = df[col].astype("datetime64[ns]")
+    return df
+
+
+def _schema_read_kwargs(schema: Optional[ReadSchema]) -> dict:
+    """pd.read_excel keyword arguments (usecols/dtype) for a read schema"""
+    if schema is None:
+        return {}
+
+    kwargs = {}
+    if schema.columns:
+        kwargs["usecols"] = schema.columns.__contains__
+    if schema.dtypes:
+        kwargs["dtype"] = dict(schema.dtypes)
+    return kwargs
+
+
+def _apply_schema(df: pd.DataFrame, schema: ReadSchema, dtypes: bool = False) -> pd.DataFrame:
+    """
+    Apply a read schema's converters to a parsed DataFrame
+
+    Args:
+        df: Parsed DataFrame
+        schema: Read schema of the data type
+        dtypes: Also cast schema dtypes (for readers that could not apply them at parse time)
+    """
+    if dtypes:
+        for col, dtype in schema.dtypes.items():
+            if col in df.columns:
+                # Cast only present values so missing cells stay missing
+                values = df[col]
+                df[col] = values.where(values.isna(), values.astype(dtype))
+
+    for col, converter in schema.converters.items():
+        if col not in df.columns:
+            continue
+        if converter == "numeric":
+            df[col] = pd.to_numeric(df[col], errors="coerce")
+        elif converter == "datetime":
+            df[col] = pd.to_datetime(df[col], errors="coerce")
+
+    return df
+
+
+def _settings_key(schema: Optional[ReadSchema], category_threshold: float) -> str:
+    """Short fingerprint of the settings that shape loaded frames (staging cache variant)"""
+    settings = f"{schema.model_dump_json() if schema else ''}|{category_threshold}"
+    return hashlib.sha1(settings.encode("utf-8")).hexdigest()[:12]
+
+
+class ExcelChunkReader:
+    """
+    Streaming reader that yields fixed-size DataFrame chunks
+
+    Rows are pulled one at a time from the reader backend (openpyxl
+    read-only by default), so peak memory is bounded by chunk_size
+    regardless of file size. rows_read reports data rows read so far
+    (header excluded).
+    """
+
+    def __init__(
+        self,
+        file_path: Path,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        first_sheet_only: bool = False,
+        optimize: Optional[Callable[[pd.DataFrame], pd.DataFrame]] = None,
+        backend: Optional[ReaderBackend] = None,
+        usecols: Optional[Callable[[str], bool]] = None
+    ):
+        if chunk_size <= 0:
+            raise ValueError(f"chunk_size must be positive: {chunk_size}")
+
+        self.file_path = file_path
+        self.chunk_size = chunk_size
+        self.first_sheet_only = first_sheet_only
+        self.optimize = optimize
+        self.backend = backend or select_reader_backend(file_path, streaming=True)
+        self.usecols = usecols
+        self.rows_read = 0
+        self.current_sheet: Optional[str] = None
+
+    def __iter__(self) -> Iterator[pd.DataFrame]:
+        for sheet_name, rows in self.backend.iter_sheets(self.file_path, self.first_sheet_only):
+            self.current_sheet = sheet_name
+            yield from self._iter_sheet(iter(rows))
+
+    def _iter_sheet(self, rows: Iterator[tuple]) -> Iterator[pd.DataFrame]:
+        header = None
+        for row in rows:
+            if not _is_blank_row(row):
+                header = _normalize_header(row)
+                break
+
+        if header is None:
+            logger.info(f"  {self.current_sheet}: empty sheet, skipped")
+            return
+
+        width = len(header)
+        keep = None
+        if self.usecols is not None:
+            keep = [i for i, name in enumerate(header) if self.usecols(name)]
+            header = [header[i] for i in keep]
+        buffer = []
+        pending_blank = 0  # Blank rows are only kept if data follows them
+
+        for row in rows:
+            if _is_blank_row(row):
+                pending_blank += 1
+                continue
+
+            for _ in range(pending_blank):
+                buffer.append((None,) * len(header))
+            pending_blank = 0
+
+            row = _fit_row(row, width)
+            buffer.append(row if keep is None else tuple(row[i] for i in keep))
+            if len(buffer) >= self.chunk_size:
+                yield self._make_chunk(buffer, header)
+                buffer = []
+
+        if buffer:
+            yield self._make_chunk(buffer, header)
+
+    def _make_chunk(self, rows: list, header: List[str]) -> pd.DataFrame:
+        chunk = _harmonize_dtypes(pd.DataFrame.from_records(rows, columns=header))
+        self.rows_read += len(chunk)
+        if self.optimize is not None:
+            chunk = self.optimize(chunk)
+        return chunk
+
+
+class FrameChunkReader:
+    """
+    Streaming reader for formats that parse into DataFrame chunks natively
+    (CSV/TSV through pd.read_csv, Parquet by record batches)
+
+    Same interface as ExcelChunkReader: iterate for chunks, rows_read and
+    current_sheet report progress.
+    """
+
+    def __init__(
+        self,
+        file_path: Path,
+        backend: ReaderBackend,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        optimize: Optional[Callable[[pd.DataFrame], pd.DataFrame]] = None,
+        usecols: Optional[Callable[[str], bool]] = None,
+        dtype: Optional[dict] = None
+    ):
+        if chunk_size <= 0:
+            raise ValueError(f"chunk_size must be positive: {chunk_size}")
+
+        self.file_path = file_path
+        self.backend = backend
+        self.chunk_size = chunk_size
+        self.optimize = optimize
+        self.usecols = usecols
+        self.dtype = dtype
+        self.rows_read = 0
+        self.current_sheet: Optional[str] = None
+
+    def __iter__(self) -> Iterator[pd.DataFrame]:
+        self.current_sheet = self.backend.sheet_names(self.file_path)[0]
+        for chunk in self.backend.iter_chunks(self.file_path, self.chunk_size, self.usecols, self.dtype):
+            self.rows_read += len(chunk)
+            if self.optimize is not None:
+                chunk = self.optimize(chunk)
+            yield chunk
+
+
+def _is_blank_row(row: tuple) -> bool:
+    return all(value is None or (isinstance(value, str) and value.strip() == "") for value in row)
+
+
+def _fit_row(row: tuple, width: int) -> tuple:
+    """Pad or truncate a row to the header width"""
+    if len(row) == width:
+        return row
+    if len(row) > width:
+        return row[:width]
+    return row + (None,) * (width - len(row))
+
+
+def _normalize_header(row: tuple) -> List[str]:
+    """
+    Build column names the same way pd.read_excel does:
+    empty cells become 'Unnamed: i', duplicates get '.1', '.2' suffixes
+    """
+    # Trailing empty header cells carry no column
+    values = list(row)
+    while values and values[-1] is None:
+        values.pop()
+
+    names = []
+    seen = {}
+    for i, value in enumerate(values):
+        name = f"Unnamed: {i}" if value is None else value
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        seen.setdefault(name, 0)
+        names.append(name)
+    return names
+
+
+def _load_sheet(
+    file_path: Path,
+    sheet_name,
+    backend_name: str,
+    schema: Optional[ReadSchema] = None,
+    category_threshold: float = DEFAULT_CATEGORY_THRESHOLD
+) -> pd.DataFrame:
+    """Load and optimize one sheet (runs in a worker process)"""
+    backend = get_reader_backend(backend_name)
+    try:
+        df = backend.read_sheet(file_path, sheet_name=sheet_name, **_schema_read_kwargs(schema))
+    except (ValueError, TypeError) as e:
+        if schema is None or not schema.dtypes:
+            raise
+        # A declared dtype did not fit the data; keep the column projection only
+        logger.warning(f"Schema dtypes rejected for sheet {sheet_name} ({e}), reading without them")
+        untyped = schema.model_copy(update={"dtypes": {}})
+        df = backend.read_sheet(file_path, sheet_name=sheet_name, **_schema_read_kwargs(untyped))
+    return ExcelLoader(category_threshold=category_threshold)._optimize_datatypes(df, schema)
+
+
+def _spill_sheet(
+    file_path: Path,
+    sheet_name,
+    backend_name: str,
+    schema: Optional[ReadSchema],
+    category_threshold: float,
+    spill_path: Path
+) -> Tuple[int, list]:
+    """Load one sheet and write it to Parquet (runs in a worker process)
+
+    Returns:
+        (row count, column metadata for read_frame)
+    """
+    df = _load_sheet(file_path, sheet_name, backend_name, schema, category_threshold)
+    return len(df), write_frame(df, spill_path)
+
 
 class ExcelLoader:
     """Excel file loader with automatic sheet merging"""
 
-    def __init__(self):
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        reader_backend: Optional[str] = None,
+        staging_cache: Optional[StagingCache] = None,
+        category_threshold: Optional[float] = None,
+        memory_report: Optional[bool] = None
+    ):
+        """
+        Args:
+            max_workers: Worker processes for multi-sheet files
+                         (None = one per CPU core, 1 = sequential)
+            reader_backend: Force a reader backend ('calamine', 'openpyxl', 'xlrd');
+                            None selects one per file (EXCEL_READER_BACKEND env overrides)
+            staging_cache: Parquet cache of parsed sheets keyed by file hash
+            category_threshold: String columns with at most this fraction of distinct
+                                values are stored as categoricals (0 disables;
+                                EXCEL_CATEGORY_THRESHOLD env overrides the default)
+            memory_report: Log per-column memory usage of loaded files
+                           (EXCEL_MEMORY_REPORT=1 env enables it by default)
+        """
         self.logger = logger
+        self.max_workers = max_workers
+        self.reader_backend = reader_backend or os.getenv("EXCEL_READER_BACKEND") or None
+        self.staging_cache = staging_cache
+
+        if category_threshold is None:
+            category_threshold = float(os.getenv("EXCEL_CATEGORY_THRESHOLD", str(DEFAULT_CATEGORY_THRESHOLD)))
+        self.category_threshold = category_threshold
+
+        if memory_report is None:
+            memory_report = os.getenv("EXCEL_MEMORY_REPORT", "0") == "1"
+        self.memory_report = memory_report
 
-    def load_excel_file(self, file_path: Path, auto_merge_sheets: bool = True) -> pd.DataFrame:
+    def _backend_for(self, file_path: Path, streaming: bool = False) -> ReaderBackend:
+        """Resolve the reader backend for a file (a forced backend only applies to formats it reads)"""
+        if self.reader_backend:
+            backend = get_reader_backend(self.reader_backend)
+            if file_path.suffix.lower() in backend.extensions:
+                return backend
+        return select_reader_backend(file_path, streaming=streaming)
+
+    def load_excel_file(
+        self,
+        file_path: Path,
+        auto_merge_sheets: bool = True,
+        file_hash: Optional[str] = None,
+        data_type: Optional[str] = None
+    ) -> pd.DataFrame:
         """
-        Load Excel file and optionally merge multiple sheets
+        Load an Excel, CSV/TSV or Parquet file and optionally merge multiple sheets
 
         Args:
-            file_path: Path to Excel file
+            file_path: Path to the file (format picked from its extension)
             auto_merge_sheets: If True, merge all sheets into one DataFrame
+            file_hash: SHA-256 of the file if already known (staging cache key)
+            data_type: Data type id; its read schema (if declared) limits the
+                       parsed columns and sets dtypes at parse time
 
         Returns:
             Loaded DataFrame
@@ -31,94 +690,441 @@ class ExcelLoader:
         file_size_mb = file_path.stat().st_size / (1024 * 1024)
         self.logger.info(f"File size: {file_size_mb:.2f} MB")
 
-        try:
-            # Check sheets in file
-            excel_file = pd.ExcelFile(file_path)
-            sheet_names = excel_file.sheet_names
-            self.logger.info(f"Sheets found: {sheet_names}")
-
-            if len(sheet_names) == 1:
-                # Single sheet mode
-                self.logger.info("Single sheet mode")
-                df = pd.read_excel(file_path, sheet_name=0)
-                return self._optimize_datatypes(df)
-
-            elif auto_merge_sheets and len(sheet_names) > 1:
-                # Multi-sheet merge mode
-                self.logger.info(f"Multi-sheet mode: merging {len(sheet_names)} sheets")
-                return self._merge_multiple_sheets(file_path, sheet_names)
+        schema = self._read_schema(data_type)
+        use_cache = (
+            self.staging_cache is not None
+            and self.staging_cache.enabled
+            and self._backend_for(file_path).cacheable
+        )
+        cache_variant = _settings_key(schema, self.category_threshold)
+        if not auto_merge_sheets:
+            cache_variant = f"first-sheet-{cache_variant}"
 
+        try:
+            if use_cache:
+                file_hash = file_hash or hash_file(file_path)
+                sheets = self.staging_cache.get(file_hash, cache_variant)
             else:
-                # Load only first sheet
-                df = pd.read_excel(file_path, sheet_name=0)
-                return self._optimize_datatypes(df)
+                sheets = None
+
+            if sheets is None:
+                sheets = self._load_excel_sheets(file_path, auto_merge_sheets, schema)
+                if use_cache:
+                    self.staging_cache.put(file_hash, sheets, cache_variant)
+
+            df = self._concat_sheets(sheets)
+            if self.memory_report:
+                log_memory_report(df, file_path.name)
+            return df
 
         except Exception as e:
             self.logger.error(f"Failed to load Excel file: {e}")
             raise
 
-    def _merge_multiple_sheets(self, file_path: Path, sheet_names: List[str]) -> pd.DataFrame:
+    def plan_load(self, file_path: Path, data_type: Optional[str] = None) -> LoadPlan:
+        """
+        Choose how to load a file from its estimated in-memory size
+
+        Args:
+            file_path: Path to the file
+            data_type: Data type id whose read schema narrows the estimate
+
+        Returns:
+            LoadPlan ('frame', 'spill' or 'chunked') with the reason it was chosen
+        """
+        backend = self._backend_for(file_path)
+        plan = plan_load(
+            file_path,
+            schema=self._read_schema(data_type),
+            chunked_native=backend.chunked,
+            max_workers=self._sheet_workers(os.cpu_count() or 1)
+        )
+        self.logger.info(f"Load strategy: {plan.strategy} for {file_path.name} - {plan.reason}")
+        return plan
+
+    def iter_frames(
+        self,
+        file_path: Path,
+        data_type: Optional[str] = None,
+        file_hash: Optional[str] = None,
+        plan: Optional[LoadPlan] = None
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Load a file as one or more DataFrames, following a memory-budgeted plan
+
+        - frame: the whole file as one DataFrame (staging cache applies)
+        - spill: one DataFrame per sheet, sheets parsed ahead and kept on disk
+        - chunked: fixed-size row chunks
+
+        Args:
+            file_path: Path to the file
+            data_type: Data type id (read schema)
+            file_hash: SHA-256 of the file if already known (staging cache key)
+            plan: Load plan (None = plan_load())
+
+        Yields:
+            DataFrames; process and release each before taking the next
+        """
+        plan = plan or self.plan_load(file_path, data_type)
+
+        if plan.strategy == "frame":
+            yield self.load_excel_file(file_path, auto_merge_sheets=True, file_hash=file_hash, data_type=data_type)
+        elif plan.strategy == "spill":
+            yield from self._iter_spilled_sheets(file_path, self._read_schema(data_type), plan.workers or 1)
+        else:
+            yield from self.iter_excel_chunks(
+                file_path,
+                chunk_size=plan.chunk_size or DEFAULT_CHUNK_SIZE,
+                auto_merge_sheets=True,
+                data_type=data_type
+            )
+
+    def _iter_spilled_sheets(
+        self,
+        file_path: Path,
+        schema: Optional[ReadSchema],
+        workers: int
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Parse sheets into Parquet spill files, then yield them one at a time
+
+        Workers parse sheets concurrently but hand back only the spill file,
+        so the caller holds a single sheet in memory at any time.
+        """
+        backend = self._backend_for(file_path)
+        sheet_names = backend.sheet_names(file_path)
+        spill_dir = Path(tempfile.mkdtemp(prefix="excel-spill-"))
+        self.logger.info(
+            f"Spilling {len(sheet_names)} sheets to {spill_dir} ({workers} worker processes)"
+        )
+
+        def spill_args(i, sheet_name):
+            return (file_path, sheet_name, backend.name, schema, self.category_threshold,
+                    spill_dir / f"sheet_{i:03d}.parquet")
+
+        try:
+            spilled = []
+            if workers > 1:
+                try:
+                    with ProcessPoolExecutor(max_workers=workers) as executor:
+                        futures = [
+                            executor.submit(_spill_sheet, *spill_args(i, name))
+                            for i, name in enumerate(sheet_names)
+                        ]
+                        spilled = [self._spill_result(name, future.result) for name, future in zip(sheet_names, futures)]
+                except (BrokenProcessPool, OSError) as e:
+                    self.logger.warning(f"Parallel sheet loading unavailable ({e}), loading sequentially")
+                    spilled = []
+
+            if not spilled:
+                spilled = [
+                    self._spill_result(name, partial(_spill_sheet, *spill_args(i, name)))
+                    for i, name in enumerate(sheet_names)
+                ]
+
+            if all(columns is None for _, columns in spilled):
+                raise ValueError("No sheets could be loaded")
+
+            for i, (sheet_name, columns) in enumerate(spilled):
+                if columns is None:
+                    continue
+                spill_path = spill_dir / f"sheet_{i:03d}.parquet"
+                df = read_frame(spill_path, columns)
+                spill_path.unlink()
+                yield df
+
+        finally:
+            shutil.rmtree(spill_dir, ignore_errors=True)
+
+    def _spill_result(self, sheet_name, load: Callable[[], Tuple[int, list]]) -> tuple:
+        """Run one sheet spill; failed sheets are logged and returned with no columns"""
+        try:
+            rows, columns = load()
+            self.logger.info(f"  {sheet_name}: {rows:,} rows spilled")
+            return sheet_name, columns
+
+        except BrokenProcessPool:
+            raise
+        except Exception as e:
+            self.logger.error(f"Failed to load sheet {sheet_name}: {e}")
+            return sheet_name, None
+
+    def _read_schema(self, data_type: Optional[str]) -> Optional[ReadSchema]:
+        """Declared read schema of a data type (None = read all columns, infer types)"""
+        if data_type is None:
+            return None
+
+        schema = DATA_TYPES[data_type].read_schema if data_type in DATA_TYPES else None
+        if schema is None and data_type in TRANSFORM_SPECS:
+            # No declared schema: push the transformer's numeric/datetime casts down to parse time
+            schema = TRANSFORM_SPECS[data_type].read_schema()
+        if schema is not None:
+            self.logger.info(
+                f"Read schema: {data_type} ({len(schema.columns) or 'all'} columns, "
+                f"{len(schema.converters)} converters)"
+            )
+        return schema
+
+    def _load_excel_sheets(
+        self,
+        file_path: Path,
+        auto_merge_sheets: bool,
+        schema: Optional[ReadSchema] = None
+    ) -> List[tuple]:
+        """Parse the workbook into (sheet_name, DataFrame) pairs"""
+        backend = self._backend_for(file_path)
+        self.logger.info(f"Reader backend: {backend.name}")
+
+        # Check sheets in file
+        sheet_names = backend.sheet_names(file_path)
+        self.logger.info(f"Sheets found: {sheet_names}")
+
+        if backend.chunked:
+            # Text/Parquet: build the frame from native chunks so converters and
+            # categorical encoding run chunk by chunk, not on one huge object frame
+            chunks = list(self._chunk_reader(file_path, backend, DEFAULT_CHUNK_SIZE, True, schema))
+            if not chunks:
+                return [(sheet_names[0], _load_sheet(file_path, 0, backend.name, schema, self.category_threshold))]
+            return [(sheet_names[0], pd.concat(align_categories(chunks), ignore_index=True))]
+
+        if auto_merge_sheets and len(sheet_names) > 1:
+            # Multi-sheet merge mode
+            self.logger.info(f"Multi-sheet mode: merging {len(sheet_names)} sheets")
+            return self._load_sheets(file_path, sheet_names, backend, schema)
+
+        # Single sheet mode (or only first sheet)
+        self.logger.info("Single sheet mode")
+        df = _load_sheet(file_path, 0, backend.name, schema, self.category_threshold)
+        return [(sheet_names[0], df)]
+
+    def iter_excel_chunks(
+        self,
+        file_path: Path,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        auto_merge_sheets: bool = True,
+        data_type: Optional[str] = None
+    ) -> Union[ExcelChunkReader, FrameChunkReader]:
+        """
+        Stream an Excel, CSV/TSV or Parquet file as fixed-size DataFrame chunks
+
+        Args:
+            file_path: Path to the file (format picked from its extension)
+            chunk_size: Number of rows per chunk
+            auto_merge_sheets: If True, stream all sheets in order; otherwise first sheet only
+            data_type: Data type id whose read schema limits columns and sets dtypes
+
+        Returns:
+            Iterable of DataFrame chunks; its rows_read attribute reports progress
+        """
+        backend = self._backend_for(file_path, streaming=True)
+        self.logger.info(
+            f"Streaming Excel file: {file_path.name} (chunk size: {chunk_size:,}, backend: {backend.name})"
+        )
+
+        return self._chunk_reader(file_path, backend, chunk_size, auto_merge_sheets, self._read_schema(data_type))
+
+    def _chunk_reader(
+        self,
+        file_path: Path,
+        backend: ReaderBackend,
+        chunk_size: int,
+        auto_merge_sheets: bool,
+        schema: Optional[ReadSchema]
+    ) -> Union[ExcelChunkReader, FrameChunkReader]:
+        """Build the chunk reader matching the backend"""
+        optimize = partial(self._optimize_datatypes, schema=schema, cast_dtypes=True)
+
+        if backend.chunked:
+            read_kwargs = _schema_read_kwargs(schema)
+            return FrameChunkReader(
+                file_path,
+                backend,
+                chunk_size=chunk_size,
+                optimize=optimize,
+                usecols=read_kwargs.get("usecols"),
+                dtype=read_kwargs.get("dtype")
+            )
+
+        return ExcelChunkReader(
+            file_path,
+            chunk_size=chunk_size,
+            first_sheet_only=not auto_merge_sheets,
+            optimize=optimize,
+            backend=backend,
+            usecols=_schema_read_kwargs(schema).get("usecols")
+        )
+
+    def _merge_multiple_sheets(
+        self,
+        file_path: Path,
+        sheet_names: List[str],
+        backend: Optional[ReaderBackend] = None
+    ) -> pd.DataFrame:
         """
         Merge multiple sheets into one DataFrame
 
         Args:
             file_path: Path to Excel file
             sheet_names: List of sheet names to merge
+            backend: Reader backend (selected automatically if None)
 
         Returns:
             Merged DataFrame
         """
+        return self._concat_sheets(self._load_sheets(file_path, sheet_names, backend))
+
+    def _load_sheets(
+        self,
+        file_path: Path,
+        sheet_names: List[str],
+        backend: Optional[ReaderBackend] = None,
+        schema: Optional[ReadSchema] = None
+    ) -> List[tuple]:
+        """
+        Load multiple sheets, in parallel when more than one worker is available
+
+        Returns:
+            List of (sheet_name, DataFrame) in original sheet order; failed sheets are skipped
+        """
         self.logger.info(f"Merging {len(sheet_names)} sheets: {sheet_names}")
+        backend_name = (backend or self._backend_for(file_path)).name
 
-        dfs = []
-        original_total = 0
+        workers = self._sheet_workers(len(sheet_names))
+        if workers > 1:
+            try:
+                loaded = self._load_sheets_parallel(file_path, sheet_names, workers, backend_name, schema)
+            except (BrokenProcessPool, OSError) as e:
+                self.logger.warning(f"Parallel sheet loading unavailable ({e}), loading sequentially")
+                loaded = self._load_sheets_sequential(file_path, sheet_names, backend_name, schema)
+        else:
+            loaded = self._load_sheets_sequential(file_path, sheet_names, backend_name, schema)
 
+        sheets = [(name, df) for name, df in loaded if df is not None]
+        if not sheets:
+            raise ValueError("No sheets could be loaded")
+
+        return sheets
+
+    def _concat_sheets(self, sheets: List[tuple]) -> pd.DataFrame:
+        """Concatenate loaded sheets into one DataFrame"""
+        if len(sheets) == 1:
+            return sheets[0][1]
+
+        dfs = align_categories([df for _, df in sheets])
+        original_total = sum(len(df) for df in dfs)
+
+        # Concatenate all sheets
+        self.logger.info("Concatenating sheets...")
+        combined_df = pd.concat(dfs, ignore_index=True)
+
+        self.logger.info(f"Merge complete: {len(combined_df):,} rows (original: {original_total:,})")
+        return combined_df
+
+    def _sheet_workers(self, sheet_count: int) -> int:
+        """Number of worker processes to use for a multi-sheet file"""
+        max_workers = self.max_workers or os.cpu_count() or 1
+        return max(1, min(max_workers, sheet_count))
+
+    def _load_sheets_sequential(
+        self,
+        file_path: Path,
+        sheet_names: List[str],
+        backend_name: str,
+        schema: Optional[ReadSchema] = None
+    ) -> List[tuple]:
+        """Load sheets one at a time; failed sheets are returned as None"""
+        loaded = []
         for i, sheet_name in enumerate(sheet_names):
             self.logger.info(f"[{i+1}/{len(sheet_names)}] Loading sheet: {sheet_name}")
 
             try:
-                df = pd.read_excel(file_path, sheet_name=sheet_name)
-                df = self._optimize_datatypes(df)
-                dfs.append(df)
-                original_total += len(df)
+                df = _load_sheet(file_path, sheet_name, backend_name, schema, self.category_threshold)
                 self.logger.info(f"  {sheet_name}: {len(df):,} rows loaded")
+                loaded.append((sheet_name, df))
 
             except Exception as e:
                 self.logger.error(f"Failed to load sheet {sheet_name}: {e}")
-                continue
+                loaded.append((sheet_name, None))
 
-        if not dfs:
-            raise ValueError("No sheets could be loaded")
+        return loaded
 
-        # Concatenate all sheets
-        self.logger.info("Concatenating sheets...")
-        combined_df = pd.concat(dfs, ignore_index=True)
+    def _load_sheets_parallel(
+        self,
+        file_path: Path,
+        sheet_names: List[str],
+        workers: int,
+        backend_name: str,
+        schema: Optional[ReadSchema] = None
+    ) -> List[tuple]:
+        """
+        Load sheets concurrently in a process pool
 
-        self.logger.info(f"Merge complete: {len(combined_df):,} rows (original: {original_total:,})")
-        return combined_df
+        Results keep the original sheet order; failed sheets are returned as None.
+        """
+        self.logger.info(f"Loading {len(sheet_names)} sheets with {workers} worker processes")
+
+        loaded = []
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(_load_sheet, file_path, name, backend_name, schema, self.category_threshold)
+                for name in sheet_names
+            ]
 
-    def _optimize_datatypes(self, df: pd.DataFrame) -> pd.DataFrame:
+            for i, (sheet_name, future) in enumerate(zip(sheet_names, futures)):
+                try:
+                    df = future.result()
+                    self.logger.info(f"[{i+1}/{len(sheet_names)}] {sheet_name}: {len(df):,} rows loaded")
+                    loaded.append((sheet_name, df))
+
+                except BrokenProcessPool:
+                    raise
+                except Exception as e:
+                    self.logger.error(f"Failed to load sheet {sheet_name}: {e}")
+                    loaded.append((sheet_name, None))
+
+        return loaded
+
+    def _optimize_datatypes(
+        self,
+        df: pd.DataFrame,
+        schema: Optional[ReadSchema] = None,
+        cast_dtypes: bool = False
+    ) -> pd.DataFrame:
         """
         Optimize DataFrame datatypes to reduce memory usage
 
         Args:
             df: Input DataFrame
+            schema: Declared read schema; when given, its converters replace
+                    the per-column numeric conversion trial (unless infer_numeric)
+            cast_dtypes: Also cast the schema dtypes (streaming chunks)
+
+        Low-cardinality string columns are dictionary-encoded as categoricals
+        (see category_threshold).
 
         Returns:
             Optimized DataFrame
         """
+        if schema is not None:
+            df = _apply_schema(df, schema, dtypes=cast_dtypes)
+        infer_numeric = schema is None or schema.infer_numeric
+
         for col in df.columns:
-            if df[col].dtype == 'object':
-                try:
-                    # Try to convert to numeric
-                    df[col] = pd.to_numeric(df[col], errors='ignore')
-                except:
-                    pass
+            if df[col].dtype == 'object' and infer_numeric and (schema is None or col not in schema.converters):
+                # Convert to numeric only when every non-null value parses
+                # (errors='ignore' is gone in pandas 3)
+                converted = pd.to_numeric(df[col], errors='coerce')
+                if converted.notna().sum() == df[col].notna().sum():
+                    df[col] = converted
             elif df[col].dtype == 'int64':
                 # Downcast int64 to int32 if possible
                 if df[col].min() >= -2147483648 and df[col].max() <= 2147483647:
                     df[col] = df[col].astype('int32')
 
+        df, encoded = encode_low_cardinality(df, self.category_threshold)
+        if encoded:
+            self.logger.info(f"Categorical columns: {encoded}")
+
         return df
 
     def get_excel_info(self, file_path: Path) -> dict:
@@ -129,14 +1135,22 @@ class ExcelLoader:
             file_path: Path to Excel file
 
         Returns:
-            Dictionary with file information
+            Dictionary with file information; total_rows is the exact data row
+            count when the workbook could be inspected or the format records it
+            (Parquet), otherwise None
         """
+        if file_path.suffix.lower() in (".xlsx", ".xlsm"):
+            try:
+                return self._inspect_excel_info(file_path)
+            except Exception as e:
+                self.logger.warning(f"Workbook inspection failed, falling back to pandas: {e}")
+
         try:
-            excel_file = pd.ExcelFile(file_path)
-            sheet_names = excel_file.sheet_names
+            backend = self._backend_for(file_path)
+            sheet_names = backend.sheet_names(file_path)
 
             # Get first few rows from first sheet for column detection
-            sample_df = pd.read_excel(file_path, sheet_name=0, nrows=5)
+            sample_df = backend.read_sheet(file_path, sheet_name=0, nrows=5)
 
             return {
                 "file_name": file_path.name,
@@ -144,7 +1158,8 @@ class ExcelLoader:
                 "sheet_count": len(sheet_names),
                 "sheet_names": sheet_names,
                 "sample_columns": list(sample_df.columns),
-                "sample_row_count": len(sample_df)
+                "sample_row_count": len(sample_df),
+                "total_rows": backend.row_count(file_path)
             }
 
         except Exception as e:
@@ -152,3 +1167,25 @@ class ExcelLoader:
             return {
                 "error": str(e)
             }
+
+    def _inspect_excel_info(self, file_path: Path) -> dict:
+        """Build get_excel_info() output from the zip-level workbook inspector"""
+        inspection = inspect_xlsx(file_path)
+        sheets = inspection["sheets"]
+        if not sheets:
+            raise ValueError("Workbook has no worksheets")
+
+        for sheet in sheets:
+            sheet["headers"] = _normalize_header(tuple(sheet["headers"]))
+
+        first_sheet = sheets[0]
+        return {
+            "file_name": file_path.name,
+            "file_size_mb": file_path.stat().st_size / (1024 * 1024),
+            "sheet_count": len(sheets),
+            "sheet_names": [sheet["name"] for sheet in sheets],
+            "sample_columns": first_sheet["headers"],
+            "sample_row_count": min(5, first_sheet["rows"]),
+            "total_rows": inspection["total_rows"],
+            "sheets": sheets
+        }
@@ -0,0 +1,113 @@
+"""
+Upload ingestion helpers shared by the API and the Streamlit uploader
+"""
+import logging
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from core.db_manager import DatabaseManager
+
+logger = logging.getLogger(__name__)
+
+# Date column used to replace previously uploaded rows, and its storage format:
+# "number" (20250101) or "datetime" ('2025-01-01 ...')
+DATE_COLUMNS: Dict[str, Tuple[str, str]] = {
+    "tag_data": ("ENTE_DT", "number"),
+    "claim_data": ("근무일", "datetime"),  # data_transformers.py에서 'YYYY-MM-DD HH:MM:SS' 형식으로 변환함
+    "meal_data": ("취식일시", "datetime"),
+    "knox_approval": ("Timestamp", "datetime"),
+    "knox_mail": ("발신일시_GMT9", "datetime"),
+    "knox_pims": ("start_time", "datetime"),
+    "eam_data": ("ATTEMPTDATE", "datetime"),
+    "equis_data": ("Timestamp", "datetime"),
+    "lams_data": ("DATE", "datetime"),
+    "mes_data": ("login_time", "datetime"),
+    "mdm_data": ("Timestap", "datetime"),
+}
+
+
+class DateRangeClearer:
+    """
+    Delete existing rows in the date range of the data being uploaded
+
+    An upload may arrive as several frames (files, sheets or chunks). Each
+    frame clears only the days that no earlier frame of the same upload has
+    cleared, so rows inserted by earlier frames are never deleted again.
+    """
+
+    def __init__(self, db_manager: DatabaseManager, table_name: str, data_type: str):
+        self.db_manager = db_manager
+        self.table_name = table_name
+        self.date_column, self.date_format = DATE_COLUMNS.get(data_type, (None, None))
+        self.cleared: List[Tuple[pd.Timestamp, pd.Timestamp]] = []
+        self.deleted_rows = 0
+
+    def _date_range(self, df: pd.DataFrame) -> Optional[Tuple[pd.Timestamp, pd.Timestamp]]:
+        """Day range covered by a frame (None if the frame has no dates)"""
+        values = df[self.date_column].dropna()
+        if values.empty:
+            return None
+
+        if self.date_format == "number":
+            # 숫자 형식 (20250101)
+            numbers = pd.to_numeric(values, errors="coerce").dropna().astype("int64")
+            days = pd.to_datetime(numbers.astype(str), format="%Y%m%d", errors="coerce")
+        else:
+            days = pd.to_datetime(values, errors="coerce")
+
+        days = days.dropna()
+        if days.empty:
+            return None
+        return days.min().normalize(), days.max().normalize()
+
+    def _uncleared(self, start: pd.Timestamp, end: pd.Timestamp) -> List[Tuple[pd.Timestamp, pd.Timestamp]]:
+        """Parts of [start, end] (whole days) not cleared yet"""
+        ranges = []
+        one_day = pd.Timedelta(days=1)
+        for cleared_start, cleared_end in sorted(self.cleared):
+            if cleared_end < start or cleared_start > end:
+                continue
+            if cleared_start > start:
+                ranges.append((start, cleared_start - one_day))
+            start = max(start, cleared_end + one_day)
+        if start <= end:
+            ranges.append((start, end))
+        return ranges
+
+    def clear(self, df: pd.DataFrame) -> int:
+        """
+        Delete existing rows for the days of a frame before it is inserted
+
+        Returns:
+            Number of rows deleted
+        """
+        if self.date_column is None or df.empty or self.date_column not in df.columns:
+            return 0
+
+        date_range = self._date_range(df)
+        if date_range is None:
+            return 0
+
+        deleted = 0
+        for start, end in self._uncleared(*date_range):
+            min_date, max_date = start.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d")
+            try:
+                rows = self.db_manager.delete_by_date_range(
+                    table_name=self.table_name,
+                    date_column=self.date_column,
+                    min_date=min_date,
+                    max_date=max_date,
+                    date_format=self.date_format
+                )
+            except Exception as e:
+                logger.warning(f"날짜 범위 삭제 실패 (계속 진행): {e}")
+                continue
+
+            self.cleared.append((start, end))
+            deleted += rows
+            if rows > 0:
+                logger.info(f"중복 방지: {rows:,}행 삭제 완료 ({min_date} ~ {max_date})")
+
+        self.deleted_rows += deleted
+        return deleted
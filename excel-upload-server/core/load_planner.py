@@ -0,0 +1,170 @@
+"""
+Memory-budgeted load strategy selection
+
+Estimates the peak memory of loading a file from its sheet dimensions and
+column types (workbook index, Parquet metadata, or file size as a last
+resort) and picks a strategy that fits the budget:
+
+- frame:   load the whole file as one DataFrame (fastest)
+- spill:   load sheet by sheet, spilling parsed sheets to Parquet on disk and
+           reading them back one at a time
+- chunked: stream fixed-size row chunks
+"""
+import logging
+import os
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from core.staging_cache import parquet_available
+from core.xlsx_inspector import inspect_xlsx
+from models.data_types import LoadPlan, ReadSchema
+
+logger = logging.getLogger(__name__)
+
+# Default memory budget for one upload; override with EXCEL_MEMORY_BUDGET_MB
+DEFAULT_MEMORY_BUDGET_MB = 2048
+
+# Approximate in-memory bytes per cell while parsing: numbers and dates are
+# 8-byte values, text cells are Python str objects (header + UTF-8/UCS data)
+BYTES_PER_NUMBER_CELL = 8
+BYTES_PER_TEXT_CELL = 64
+
+# Parse peak relative to the final frame: reader cell objects, the frame
+# itself and dtype conversion copies coexist for a while
+PARSE_PEAK_FACTOR = 3
+
+# In-memory size per byte on disk when dimensions are unknown
+# (xlsx is zip-compressed XML; .xls/.csv are stored uncompressed)
+FILE_SIZE_FACTORS = {".xlsx": 12, ".xlsm": 12, ".xlsb": 8, ".xls": 4, ".csv": 6, ".tsv": 6, ".txt": 6}
+DEFAULT_FILE_SIZE_FACTOR = 12
+
+# Chunks are sized to use at most this share of the budget
+CHUNK_BUDGET_SHARE = 0.25
+MIN_CHUNK_SIZE = 1_000
+
+
+def memory_budget_mb() -> float:
+    """Configured memory budget in MB (EXCEL_MEMORY_BUDGET_MB env)"""
+    return float(os.getenv("EXCEL_MEMORY_BUDGET_MB", str(DEFAULT_MEMORY_BUDGET_MB)))
+
+
+def _cell_bytes(column, schema: Optional[ReadSchema]) -> int:
+    """Estimated bytes per cell of a column from the declared schema"""
+    if schema is not None and schema.converters.get(column) in ("numeric", "datetime"):
+        return BYTES_PER_NUMBER_CELL
+    return BYTES_PER_TEXT_CELL
+
+
+def _selected(column, schema: Optional[ReadSchema]) -> bool:
+    return schema is None or not schema.columns or column in schema.columns
+
+
+def estimate_sheets(file_path: Path, schema: Optional[ReadSchema] = None) -> Optional[List[Tuple[int, int]]]:
+    """
+    Estimate rows and parse-peak bytes of each sheet from the file's own metadata
+
+    Returns:
+        List of (rows, bytes) per sheet, or None if the format records no dimensions
+    """
+    suffix = file_path.suffix.lower()
+
+    if suffix in (".xlsx", ".xlsm"):
+        return [
+            (
+                sheet["rows"],
+                sheet["rows"] * PARSE_PEAK_FACTOR * sum(
+                    _cell_bytes(col, schema) for col in sheet["headers"] if _selected(col, schema)
+                )
+            )
+            for sheet in inspect_xlsx(file_path)["sheets"]
+        ]
+
+    if suffix == ".parquet" and parquet_available():
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        parquet_file = pq.ParquetFile(file_path)
+        rows = parquet_file.metadata.num_rows
+        row_bytes = sum(
+            BYTES_PER_TEXT_CELL if pa.types.is_string(field.type) or pa.types.is_large_string(field.type)
+            else BYTES_PER_NUMBER_CELL
+            for field in parquet_file.schema_arrow
+            if _selected(field.name, schema)
+        )
+        # Record batches are converted one at a time, no parse peak on top
+        return [(rows, rows * row_bytes)]
+
+    return None
+
+
+def plan_load(
+    file_path: Path,
+    schema: Optional[ReadSchema] = None,
+    budget_mb: Optional[float] = None,
+    chunked_native: bool = False,
+    max_workers: int = 1
+) -> LoadPlan:
+    """
+    Choose a load strategy for a file
+
+    Args:
+        file_path: File to load
+        schema: Declared read schema (projection and column types)
+        budget_mb: Memory budget (None = EXCEL_MEMORY_BUDGET_MB / default)
+        chunked_native: The reader streams DataFrame chunks natively (CSV/Parquet)
+        max_workers: Upper bound on concurrent sheet loads for 'spill'
+
+    Returns:
+        LoadPlan with the strategy and the reason it was chosen
+    """
+    budget_mb = memory_budget_mb() if budget_mb is None else budget_mb
+    budget = budget_mb * 1024 * 1024
+    mb = 1024 * 1024
+
+    try:
+        sheets = estimate_sheets(file_path, schema)
+    except Exception as e:
+        logger.warning(f"Could not read dimensions of {file_path.name}, estimating from file size: {e}")
+        sheets = None
+
+    basis = "sheet dimensions"
+    if not sheets:
+        factor = FILE_SIZE_FACTORS.get(file_path.suffix.lower(), DEFAULT_FILE_SIZE_FACTOR)
+        sheets = [(None, file_path.stat().st_size * factor)]
+        basis = f"file size x{factor}"
+
+    total = sum(size for _, size in sheets)
+    largest = max(size for _, size in sheets)
+    estimate = f"estimated {total / mb:,.1f} MB ({basis})"
+
+    if total <= budget:
+        strategy = "frame"
+        reason = f"{estimate} fits the {budget_mb:,.1f} MB budget"
+    elif len(sheets) > 1 and largest <= budget and not chunked_native and parquet_available():
+        strategy = "spill"
+        reason = (
+            f"{estimate} exceeds the {budget_mb:,.1f} MB budget, "
+            f"but the largest of {len(sheets)} sheets ({largest / mb:,.1f} MB) fits"
+        )
+    else:
+        strategy = "chunked"
+        reason = f"{estimate} exceeds the {budget_mb:,.1f} MB budget"
+        if len(sheets) > 1:
+            reason += f" and so does the largest sheet ({largest / mb:,.1f} MB)"
+
+    plan = LoadPlan(
+        strategy=strategy,
+        estimated_mb=round(total / mb, 1),
+        budget_mb=budget_mb,
+        sheet_count=len(sheets),
+        reason=reason
+    )
+
+    if strategy == "chunked":
+        rows = sum(sheet_rows or 0 for sheet_rows, _ in sheets)
+        if rows:
+            plan.chunk_size = max(MIN_CHUNK_SIZE, int(budget * CHUNK_BUDGET_SHARE / (total / rows)))
+    elif strategy == "spill":
+        plan.workers = max(1, min(max_workers, int(budget // largest)))
+
+    return plan
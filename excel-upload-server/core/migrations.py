@@ -0,0 +1,210 @@
+"""
+Schema migrations of sambio_human.db applied by the upload server
+
+Employee key (emp_key): every table holding an employee number gets an
+INTEGER emp_key column (see utils/employee_keys.py), backfilled from the
+employee column, an index leading with emp_key (plus the table's date column)
+and two triggers that fill emp_key for rows written without it (other
+writers such as the Next.js analysis jobs and ad-hoc scripts). Uploads fill
+emp_key themselves, so the insert trigger does nothing for them.
+
+Join contract: employee joins compare emp_key on both sides, e.g.
+
+    FROM claim_data c
+    JOIN daily_analysis_results d ON d.emp_key = c.emp_key AND d.analysis_date = DATE(c.근무일)
+    JOIN employees e ON e.emp_key = c.emp_key
+
+never CAST(사번 AS TEXT) = employee_id, which cannot use an index.
+
+Day key (day_key): every time-series table gets an INTEGER day_key (YYYYMMDD,
+see utils/day_keys.py) computed from its date column the same way, with an
+index on day_key. Date range deletes and stats compare day_key ranges
+(index range scans) instead of parsing the mixed-type date column per row.
+
+Run for all tables with:
+
+    python scripts/migrate_keys.py
+"""
+import logging
+import sqlite3
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from utils.day_keys import DAY_KEY, day_key_sql
+from utils.employee_keys import EMP_KEY, employee_key_sql
+
+logger = logging.getLogger(__name__)
+
+# Table -> (employee number columns, first present is used; date column of the index or None)
+EMPLOYEE_KEY_TABLES: Dict[str, Tuple[List[str], Optional[str]]] = {
+    "tag_data": (["사번"], "ENTE_DT"),
+    "claim_data": (["사번"], "근무일"),
+    "organization_data": (["사번"], None),
+    "meal_data": (["사번"], "취식일시"),
+    "knox_approval_data": (["UserNo"], "Timestamp"),
+    "knox_mail_data": (["발신인사번_text"], "발신일시_GMT9"),
+    "knox_pims_data": (["employee_id"], "start_time"),
+    "eam_data": (["USERNO"], "ATTEMPTDATE"),
+    "equis_data": (["USERNO( ID->사번매칭 )", "사번"], "Timestamp"),
+    "lams_data": (["User_No"], "DATE"),
+    "mes_data": (["USERNo"], "login_time"),
+    "mdm_data": (["UserNo"], "Timestap"),
+    # Written by the analysis jobs, not by uploads
+    "daily_analysis_results": (["employee_id"], "analysis_date"),
+    "employees": (["employee_id"], None),
+}
+
+# Table -> date column of day_key
+DAY_KEY_TABLES: Dict[str, str] = {
+    "tag_data": "ENTE_DT",
+    "claim_data": "근무일",
+    "meal_data": "취식일시",
+    "knox_approval_data": "Timestamp",
+    "knox_mail_data": "발신일시_GMT9",
+    "knox_pims_data": "start_time",
+    "eam_data": "ATTEMPTDATE",
+    "equis_data": "Timestamp",
+    "lams_data": "DATE",
+    "mes_data": "login_time",
+    "mdm_data": "Timestap",
+    # Written by the analysis jobs, not by uploads
+    "daily_analysis_results": "analysis_date",
+}
+
+# Rows backfilled per transaction
+BACKFILL_BATCH_ROWS = 500_000
+
+
+def _columns(conn: sqlite3.Connection, table: str) -> List[str]:
+    return [row[1] for row in conn.execute(f'PRAGMA table_info("{table}")')]
+
+
+def ensure_employee_key(conn: sqlite3.Connection, table: str) -> bool:
+    """
+    Add, backfill and index emp_key of a table (idempotent)
+
+    Args:
+        conn: Connection to sambio_human.db
+        table: Table name (must be in EMPLOYEE_KEY_TABLES)
+
+    Returns:
+        True if the table exists and has an employee column
+    """
+    candidates, date_column = EMPLOYEE_KEY_TABLES[table]
+    columns = _columns(conn, table)
+    source = next((column for column in candidates if column in columns), None)
+    if source is None:
+        return False
+
+    index_columns = [EMP_KEY] if date_column is None or date_column not in columns else [EMP_KEY, date_column]
+    _ensure_key(conn, table, EMP_KEY, source, employee_key_sql, index_columns)
+    return True
+
+
+def ensure_day_key(conn: sqlite3.Connection, table: str) -> bool:
+    """
+    Add, backfill and index day_key of a table (idempotent)
+
+    Args:
+        conn: Connection to sambio_human.db
+        table: Table name (must be in DAY_KEY_TABLES)
+
+    Returns:
+        True if the table exists and has its date column
+    """
+    source = DAY_KEY_TABLES[table]
+    if source not in _columns(conn, table):
+        return False
+
+    _ensure_key(conn, table, DAY_KEY, source, day_key_sql, [DAY_KEY])
+    return True
+
+
+def _ensure_key(
+    conn: sqlite3.Connection,
+    table: str,
+    key: str,
+    source: str,
+    key_sql: Callable[[str], str],
+    index_columns: List[str]
+) -> None:
+    """Key column computed from a source column: add, backfill, index and keep filled by triggers"""
+    if key not in _columns(conn, table):
+        conn.execute(f'ALTER TABLE "{table}" ADD COLUMN {key} INTEGER')
+        conn.commit()
+        logger.info(f"{table}.{key} 컬럼 추가")
+
+    backfilled = _backfill(conn, table, key, source, key_sql)
+    if backfilled:
+        logger.info(f"{table}.{key} 백필: {backfilled:,}행")
+
+    expression = key_sql(f'NEW."{source}"')
+    indexed = ", ".join(f'"{column}"' for column in index_columns)
+    conn.executescript(
+        f"""
+        CREATE INDEX IF NOT EXISTS idx_{table}_{key} ON "{table}"({indexed});
+
+        CREATE TRIGGER IF NOT EXISTS trg_{table}_{key}_insert
+        AFTER INSERT ON "{table}"
+        WHEN NEW.{key} IS NULL AND NEW."{source}" IS NOT NULL
+        BEGIN
+            UPDATE "{table}" SET {key} = {expression} WHERE rowid = NEW.rowid;
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS trg_{table}_{key}_update
+        AFTER UPDATE OF "{source}" ON "{table}"
+        BEGIN
+            UPDATE "{table}" SET {key} = {expression} WHERE rowid = NEW.rowid;
+        END;
+        """
+    )
+
+
+def _backfill(conn: sqlite3.Connection, table: str, key: str, source: str, key_sql: Callable[[str], str]) -> int:
+    """Set the key of rows without one, BACKFILL_BATCH_ROWS rowids per transaction"""
+    min_rowid, max_rowid = conn.execute(
+        f'SELECT MIN(rowid), MAX(rowid) FROM "{table}" WHERE {key} IS NULL AND "{source}" IS NOT NULL'
+    ).fetchone()
+    if min_rowid is None:
+        return 0
+
+    expression = key_sql(f'"{source}"')
+    updated = 0
+    for start in range(min_rowid, max_rowid + 1, BACKFILL_BATCH_ROWS):
+        cursor = conn.execute(
+            f'UPDATE "{table}" SET {key} = {expression} '
+            f'WHERE rowid >= ? AND rowid < ? AND {key} IS NULL AND "{source}" IS NOT NULL',
+            (start, start + BACKFILL_BATCH_ROWS)
+        )
+        updated += cursor.rowcount
+        conn.commit()
+    return updated
+
+
+def migrate_keys(conn: sqlite3.Connection, tables: Optional[Iterable[str]] = None) -> Dict[str, float]:
+    """
+    emp_key and day_key of each table (None = every table in EMPLOYEE_KEY_TABLES / DAY_KEY_TABLES)
+
+    Returns:
+        Seconds spent per migrated table (missing tables are skipped)
+    """
+    if tables is None:
+        tables = list(dict.fromkeys([*EMPLOYEE_KEY_TABLES, *DAY_KEY_TABLES]))
+
+    elapsed: Dict[str, float] = {}
+    for table in tables:
+        started = time.perf_counter()
+        migrated = [
+            key for key, registry, ensure in (
+                (EMP_KEY, EMPLOYEE_KEY_TABLES, ensure_employee_key),
+                (DAY_KEY, DAY_KEY_TABLES, ensure_day_key),
+            )
+            if table in registry and ensure(conn, table)
+        ]
+        if migrated:
+            elapsed[table] = round(time.perf_counter() - started, 2)
+            logger.info(f"{table}: {', '.join(migrated)} 준비 완료 ({elapsed[table]:.2f}s)")
+    if elapsed:
+        conn.execute("ANALYZE")
+        conn.commit()
+    return elapsed
@@ -0,0 +1,158 @@
+"""
+Process-wide cache of the reference tables used by the transformers
+
+Reference data (organization_data, grade_level_mapping) is read from
+sambio_human.db once per server process and kept in join-ready form (typed
+keys), instead of being re-read and re-cast for every transformed file.
+
+Each lookup compares a cheap fingerprint of the source tables (schema, row
+count, max rowid) with the one the entry was loaded under and reloads on a
+change. Uploads into a reference table invalidate the entries built from it,
+which also covers in-place updates the fingerprint cannot see.
+"""
+import logging
+import sqlite3
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional, Sequence
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+_caches: Dict[Path, "ReferenceCache"] = {}
+_caches_lock = threading.Lock()
+
+
+def reference_cache_for_db(db_path: Path) -> "ReferenceCache":
+    """Shared reference cache of a database (one per process and database file)"""
+    key = Path(db_path).resolve()
+    with _caches_lock:
+        if key not in _caches:
+            _caches[key] = ReferenceCache(key)
+        return _caches[key]
+
+
+def _row_count(value: Any) -> Optional[int]:
+    """Rows held by a cached value (DataFrame or dict of DataFrames)"""
+    if isinstance(value, pd.DataFrame):
+        return len(value)
+    if isinstance(value, dict):
+        counts = [len(item) for item in value.values() if isinstance(item, pd.DataFrame)]
+        return sum(counts) if counts else None
+    return None
+
+
+class ReferenceCache:
+    """
+    Named reference data entries loaded from one SQLite database
+
+    metrics: hits (fingerprint unchanged), misses (first load), reloads
+             (fingerprint changed or invalidated), invalidations
+    """
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self.metrics: Counter = Counter()
+        self._entries: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _fingerprint(conn: sqlite3.Connection, tables: Sequence[str]) -> tuple:
+        """Schema, row count and max rowid of each table (None for a missing table)"""
+        parts = []
+        for table in tables:
+            row = conn.execute(
+                "SELECT sql FROM sqlite_master WHERE type='table' AND name=?", (table,)
+            ).fetchone()
+            if row is None:
+                parts.append((table, None))
+                continue
+            count, max_rowid = conn.execute(f'SELECT COUNT(*), MAX(rowid) FROM "{table}"').fetchone()
+            parts.append((table, row[0], count, max_rowid))
+        return tuple(parts)
+
+    def get(self, name: str, tables: Sequence[str], load: Callable[[sqlite3.Connection], Any]) -> Any:
+        """
+        Cached reference data, loaded or reloaded when its tables changed
+
+        Args:
+            name: Entry name
+            tables: Tables the entry is built from (fingerprinted on every call)
+            load: Builds the entry from a connection; its exceptions propagate
+
+        Returns:
+            The loaded value (shared between callers: do not modify it)
+        """
+        with self._lock:
+            conn = sqlite3.connect(str(self.db_path))
+            try:
+                fingerprint = self._fingerprint(conn, tables)
+                entry = self._entries.get(name)
+                if entry is not None and entry["fingerprint"] == fingerprint:
+                    self.metrics["hits"] += 1
+                    return entry["value"]
+
+                started = time.perf_counter()
+                value = load(conn)
+                elapsed = time.perf_counter() - started
+            finally:
+                conn.close()
+
+            self.metrics["reloads" if entry is not None else "misses"] += 1
+            self._entries[name] = {
+                "value": value,
+                "tables": list(tables),
+                "fingerprint": fingerprint,
+                "loaded_at": datetime.now().isoformat(timespec="seconds"),
+                "load_seconds": round(elapsed, 3),
+                "rows": _row_count(value),
+            }
+            logger.info(
+                f"Reference data {'reloaded' if entry is not None else 'loaded'}: {name} "
+                f"({elapsed:.2f}s, tables: {', '.join(tables)})"
+            )
+            return value
+
+    def invalidate(self, tables: Optional[Iterable[str]] = None) -> int:
+        """
+        Mark entries built from any of the tables (None = all) for reload
+
+        Returns:
+            Number of entries invalidated
+        """
+        tables = None if tables is None else set(tables)
+        invalidated = 0
+        with self._lock:
+            for name, entry in self._entries.items():
+                if entry["fingerprint"] is None:
+                    continue
+                if tables is None or tables.intersection(entry["tables"]):
+                    entry["fingerprint"] = None
+                    invalidated += 1
+                    logger.info(f"Reference data invalidated: {name}")
+            self.metrics["invalidations"] += invalidated
+        return invalidated
+
+    def stats(self) -> dict:
+        """Metrics and the loaded entries (without their values)"""
+        with self._lock:
+            return {
+                "hits": self.metrics["hits"],
+                "misses": self.metrics["misses"],
+                "reloads": self.metrics["reloads"],
+                "invalidations": self.metrics["invalidations"],
+                "entries": {
+                    name: {
+                        "tables": entry["tables"],
+                        "loaded_at": entry["loaded_at"],
+                        "load_seconds": entry["load_seconds"],
+                        "rows": entry["rows"],
+                        "stale": entry["fingerprint"] is None,
+                    }
+                    for name, entry in self._entries.items()
+                },
+            }
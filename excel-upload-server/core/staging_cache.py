@@ -0,0 +1,284 @@
+"""
+Content-addressed Parquet staging cache for parsed workbooks
+
+Parsed sheets are stored as Parquet files keyed by the SHA-256 of the
+uploaded bytes, so re-uploading the same file (e.g. after a transform fix)
+skips Excel parsing entirely. The cache is size-bounded with LRU eviction.
+
+Layout:
+    <cache_dir>/<sha256>[-<variant>]/manifest.json
+    <cache_dir>/<sha256>[-<variant>]/sheet_000.parquet ...
+"""
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Bump when the loader output for the same bytes changes
+CACHE_FORMAT_VERSION = 1
+
+HASH_BLOCK_SIZE = 1024 * 1024
+
+MANIFEST_NAME = "manifest.json"
+
+# Default size bound; override with UPLOAD_CACHE_MAX_MB (0 disables the cache)
+DEFAULT_CACHE_MAX_MB = 4096
+
+
+def hash_file(file_path: Path) -> str:
+    """SHA-256 of a file, read in fixed-size blocks"""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def parquet_available() -> bool:
+    """Check if pyarrow is installed"""
+    try:
+        import pyarrow  # noqa: F401
+        import pyarrow.parquet  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def staging_cache_for_db(db_path: Path) -> "StagingCache":
+    """Create the staging cache in .upload_cache next to the database"""
+    max_mb = int(os.getenv("UPLOAD_CACHE_MAX_MB", str(DEFAULT_CACHE_MAX_MB)))
+    return StagingCache(Path(db_path).parent / ".upload_cache", max_mb * 1024 * 1024)
+
+
+def frame_to_table(df: pd.DataFrame) -> tuple:
+    """
+    Convert a DataFrame to an Arrow table that round-trips exactly
+
+    Parquet and Arrow IPC need string column names and one type per column,
+    while Excel sheets often have numeric headers and mixed-type object
+    columns. Columns are stored positionally (c0, c1, ...) and a mixed column
+    is split into one part per Python type, so the exact cell values
+    round-trip. The index is not stored.
+
+    Returns:
+        (pyarrow.Table, column metadata for frame_from_table)
+    """
+    import pyarrow as pa
+
+    storable = {}
+    columns = []
+    for i, (name, series) in enumerate(df.items()):
+        key = f"c{i}"
+        meta = {"name": name.item() if hasattr(name, "item") else name, "dtype": str(series.dtype), "parts": []}
+
+        if series.dtype == object and pd.api.types.infer_dtype(series, skipna=True).startswith("mixed"):
+            kinds = series.map(lambda value: type(value).__name__ if pd.notna(value) else None)
+            for kind in kinds.dropna().unique():
+                part_key = f"{key}__{kind}"
+                storable[part_key] = series.where(kinds == kind, None)
+                meta["parts"].append(part_key)
+        else:
+            storable[key] = series
+            meta["parts"].append(key)
+
+        columns.append(meta)
+
+    table = pa.Table.from_pandas(pd.DataFrame(storable, copy=False), preserve_index=False)
+    return table, columns
+
+
+def frame_from_table(table, columns: list) -> pd.DataFrame:
+    """Rebuild a DataFrame from frame_to_table output, restoring names, dtypes and mixed columns"""
+    plain = [f"c{i}" for i, meta in enumerate(columns) if meta["parts"] == [f"c{i}"]]
+    plain_df = table.select(plain).to_pandas() if plain else pd.DataFrame(index=range(table.num_rows))
+
+    data = {}
+    for i, meta in enumerate(columns):
+        key = f"c{i}"
+        if meta["parts"] == [key]:
+            series = plain_df[key]
+            if meta["dtype"] == "object" and series.dtype != object:
+                series = series.astype(object)
+            data[i] = series
+            continue
+
+        # Mixed column: overlay each typed part, missing cells stay NaN like pd.read_excel
+        values = np.full(table.num_rows, np.nan, dtype=object)
+        for part_key in meta["parts"]:
+            part = table.column(part_key)
+            valid = part.is_valid().to_numpy(zero_copy_only=False)
+            values[valid] = np.array(part.to_pylist(), dtype=object)[valid]
+        data[i] = pd.Series(values, dtype=object)
+
+    df = pd.DataFrame(data, index=range(table.num_rows), copy=False)
+    df.columns = [meta["name"] for meta in columns]
+    return df
+
+
+def write_frame(df: pd.DataFrame, path: Path) -> list:
+    """
+    Write one sheet (DataFrame) to Parquet (see frame_to_table)
+
+    Returns:
+        Column metadata for the manifest
+    """
+    import pyarrow.parquet as pq
+
+    table, columns = frame_to_table(df)
+    pq.write_table(table, path)
+    return columns
+
+
+def read_frame(path: Path, columns: list) -> pd.DataFrame:
+    """Read a frame written by write_frame, restoring names, dtypes and mixed columns"""
+    import pyarrow.parquet as pq
+
+    return frame_from_table(pq.read_table(path), columns)
+
+
+class StagingCache:
+    """Size-bounded LRU cache of parsed sheets stored as Parquet"""
+
+    def __init__(self, cache_dir: Path, max_bytes: int):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.enabled = max_bytes > 0 and parquet_available()
+
+        if max_bytes <= 0:
+            logger.info("Staging cache disabled (size limit is 0)")
+            return
+        if not self.enabled:
+            logger.warning(
+                "Staging cache disabled: pyarrow is not installed "
+                "(also disables the spill load strategy and Arrow shard transport)"
+            )
+            return
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        logger.info(f"Staging cache: {self.cache_dir} (max {max_bytes / (1024 * 1024):,.0f} MB)")
+
+    def _entry_dir(self, file_hash: str, variant: str = "") -> Path:
+        name = f"{file_hash}-v{CACHE_FORMAT_VERSION}"
+        if variant:
+            name = f"{name}-{variant}"
+        return self.cache_dir / name
+
+    def get(self, file_hash: str, variant: str = "") -> Optional[List[Tuple[str, pd.DataFrame]]]:
+        """
+        Load cached sheets
+
+        Args:
+            file_hash: SHA-256 of the uploaded file
+            variant: Distinguishes different loader settings for the same bytes
+
+        Returns:
+            List of (sheet_name, DataFrame) in original sheet order, or None on a miss
+        """
+        if not self.enabled:
+            return None
+
+        entry = self._entry_dir(file_hash, variant)
+        manifest_path = entry / MANIFEST_NAME
+        if not manifest_path.exists():
+            return None
+
+        try:
+            manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+            sheets = [
+                (sheet["name"], read_frame(entry / sheet["file"], sheet["columns"]))
+                for sheet in manifest["sheets"]
+            ]
+        except Exception as e:
+            logger.warning(f"Staging cache entry unreadable, discarding: {entry.name} ({e})")
+            shutil.rmtree(entry, ignore_errors=True)
+            return None
+
+        # Touch manifest so LRU eviction sees this entry as recently used
+        os.utime(manifest_path)
+        logger.info(f"Staging cache hit: {file_hash[:12]} ({sum(len(df) for _, df in sheets):,} rows)")
+        return sheets
+
+    def put(self, file_hash: str, sheets: List[Tuple[str, pd.DataFrame]], variant: str = "") -> bool:
+        """
+        Store parsed sheets
+
+        Returns:
+            True if stored; False if disabled, too large or not Parquet-serializable
+        """
+        if not self.enabled or not sheets:
+            return False
+
+        entry = self._entry_dir(file_hash, variant)
+        if (entry / MANIFEST_NAME).exists():
+            return True
+
+        # Write into a temp dir next to the cache and rename, so readers never see partial entries
+        temp_dir = Path(tempfile.mkdtemp(prefix=".staging-", dir=self.cache_dir))
+        try:
+            manifest = {"file_hash": file_hash, "variant": variant, "created_at": time.time(), "sheets": []}
+            for i, (sheet_name, df) in enumerate(sheets):
+                file_name = f"sheet_{i:03d}.parquet"
+                columns = write_frame(df, temp_dir / file_name)
+                manifest["sheets"].append({
+                    "name": sheet_name,
+                    "file": file_name,
+                    "rows": len(df),
+                    "columns": columns
+                })
+
+            (temp_dir / MANIFEST_NAME).write_text(json.dumps(manifest, ensure_ascii=False), encoding="utf-8")
+
+            size = self._dir_size(temp_dir)
+            if size > self.max_bytes:
+                logger.info(f"Staging cache: entry too large to cache ({size / (1024 * 1024):,.0f} MB)")
+                return False
+
+            os.replace(temp_dir, entry)
+            logger.info(f"Staging cache stored: {file_hash[:12]} ({size / (1024 * 1024):,.1f} MB)")
+
+        except Exception as e:
+            logger.warning(f"Staging cache store skipped: {e}")
+            return False
+
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+        self.evict()
+        return True
+
+    def evict(self) -> int:
+        """Remove least recently used entries until the cache fits in max_bytes"""
+        if not self.enabled:
+            return 0
+
+        entries = []
+        for entry in self.cache_dir.iterdir():
+            manifest_path = entry / MANIFEST_NAME
+            if entry.is_dir() and manifest_path.exists():
+                entries.append((manifest_path.stat().st_mtime, self._dir_size(entry), entry))
+
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, entry in sorted(entries, key=lambda item: item[0]):
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+            removed += 1
+            logger.info(f"Staging cache evicted: {entry.name}")
+
+        return removed
+
+    @staticmethod
+    def _dir_size(path: Path) -> int:
+        return sum(f.stat().st_size for f in path.iterdir() if f.is_file())
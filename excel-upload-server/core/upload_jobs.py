@@ -0,0 +1,316 @@
+"""
+Background upload jobs of the upload server, persisted in batch_jobs
+
+POST /api/upload/{data_type} saves the file, records a job and returns its
+upload id at once. A worker pool (UPLOAD_WORKERS threads, default 1) runs the
+parse → transform → insert pipeline off the event loop, so progress polls
+and stats keep answering while a file loads.
+
+Job state lives in memory for polling and is written to batch_jobs
+(job_type 'excel_upload') through the database writer. The writes are queued,
+so the upload thread and the endpoint never wait for them. Finished jobs
+leave memory once their final state is written and are read back from
+batch_jobs. On startup
+(recover):
+
+- pending jobs whose file is still on disk are queued again
+- running jobs are marked failed and the rows they inserted (rowid above the
+  table's MAX(rowid) recorded before the load) are deleted
+
+A job that fails deletes its inserted rows the same way, so a retry does not
+duplicate them.
+
+Status: pending → running → completed | failed (the values of the batch
+analysis jobs in the same table)
+"""
+import logging
+import os
+import threading
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from core.db_manager import DatabaseManager
+from models.data_types import UploadJob
+
+logger = logging.getLogger(__name__)
+
+UPLOAD_JOB_TYPE = "excel_upload"
+DEFAULT_UPLOAD_WORKERS = 1
+
+# batch_jobs as created by scripts/migrate_db_schema.sql, for databases without one
+BATCH_JOBS_DDL = """
+CREATE TABLE IF NOT EXISTS batch_jobs (
+    job_id TEXT PRIMARY KEY,
+    job_name TEXT NOT NULL,
+    job_type TEXT,
+    start_time TIMESTAMP NOT NULL,
+    end_time TIMESTAMP,
+    status TEXT NOT NULL,
+    organization_id TEXT,
+    organization_name TEXT,
+    target_date_start DATE,
+    target_date_end DATE,
+    total_employees INTEGER DEFAULT 0,
+    processed_employees INTEGER DEFAULT 0,
+    success_count INTEGER DEFAULT 0,
+    failure_count INTEGER DEFAULT 0,
+    total_processing_time REAL DEFAULT 0,
+    avg_processing_time REAL DEFAULT 0,
+    error_message TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+)
+"""
+
+# Columns written by upload jobs, added to an existing batch_jobs when missing
+UPLOAD_JOB_COLUMNS = {
+    "job_name": "TEXT",
+    "job_type": "TEXT",
+    "start_time": "TIMESTAMP",
+    "end_time": "TIMESTAMP",
+    "status": "TEXT",
+    "error_message": "TEXT",
+    "updated_at": "TIMESTAMP",
+    "data_type": "TEXT",
+    "table_name": "TEXT",
+    "file_path": "TEXT",
+    "file_hash": "TEXT",
+    "total_rows": "INTEGER DEFAULT 0",
+    "processed_rows": "INTEGER DEFAULT 0",
+    "progress": "REAL DEFAULT 0",
+    "message": "TEXT",
+    "start_rowid": "INTEGER",
+}
+
+# UploadJob field -> batch_jobs column
+JOB_FIELD_COLUMNS = {
+    "upload_id": "job_id",
+    "file_name": "job_name",
+    "error": "error_message",
+    **{field: field for field in (
+        "data_type", "table_name", "file_path", "file_hash", "status", "total_rows",
+        "processed_rows", "progress", "message", "start_time", "end_time", "start_rowid",
+    )},
+}
+
+# Runs one job: runner(job, report) -> rows inserted; report(**fields) publishes progress
+JobRunner = Callable[[UploadJob, Callable[..., None]], int]
+
+
+def upload_workers() -> int:
+    """Configured number of concurrent uploads (UPLOAD_WORKERS env)"""
+    return max(1, int(os.getenv("UPLOAD_WORKERS", str(DEFAULT_UPLOAD_WORKERS))))
+
+
+def _now() -> str:
+    return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+
+class UploadJobQueue:
+    """
+    Upload jobs run by a thread pool, state mirrored to batch_jobs
+
+    Args:
+        db_manager: Database of batch_jobs (written through its writer thread)
+        runner: The upload pipeline
+        workers: Concurrent uploads (default UPLOAD_WORKERS)
+    """
+
+    def __init__(self, db_manager: DatabaseManager, runner: JobRunner, workers: Optional[int] = None):
+        self.db_manager = db_manager
+        self.runner = runner
+        self.workers = workers or upload_workers()
+        self.jobs: Dict[str, UploadJob] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def _submit(self, job: UploadJob) -> None:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="upload")
+            self._executor.submit(self._run, job)
+
+    def submit(self, data_type: str, table_name: str, file_name: str, file_path: Path, file_hash: Optional[str]) -> UploadJob:
+        """Record a pending job for a saved file and queue it; returns at once"""
+        job = UploadJob(
+            upload_id=f"{data_type}_{uuid.uuid4().hex[:12]}",
+            file_name=file_name,
+            data_type=data_type,
+            table_name=table_name,
+            file_path=str(file_path),
+            file_hash=file_hash,
+            total_rows=0,
+            processed_rows=0,
+            progress=0.0,
+            status="pending",
+            message="Queued",
+            start_time=_now(),
+        )
+        self.jobs[job.upload_id] = job
+        self._persist(job, insert=True)
+        self._submit(job)
+        logger.info(f"Upload job queued: {job.upload_id} ({file_name} → {table_name})")
+        return job
+
+    def get(self, upload_id: str) -> Optional[UploadJob]:
+        """A job of this run, else one recorded in batch_jobs (e.g. before a restart)"""
+        job = self.jobs.get(upload_id)
+        if job is not None:
+            return job
+
+        columns = list(JOB_FIELD_COLUMNS.values())
+        try:
+            rows = self.db_manager.execute_query(
+                f"SELECT {', '.join(columns)} FROM batch_jobs WHERE job_id = ? AND job_type = ?",
+                (upload_id, UPLOAD_JOB_TYPE)
+            )
+        except Exception as e:
+            logger.warning(f"Could not read upload job {upload_id}: {e}")
+            return None
+        if not rows:
+            return None
+        return self._from_row(rows[0])
+
+    def update(self, job: UploadJob, **fields: Any) -> Future:
+        """Set job fields and queue their write to batch_jobs; returns the write's future"""
+        for field, value in fields.items():
+            setattr(job, field, value)
+        return self._persist(job, fields=list(fields))
+
+    def _finish(self, job: UploadJob, **fields: Any) -> None:
+        """Record a job's final state; get() reads it from batch_jobs once it is written"""
+        written = self.update(job, end_time=_now(), **fields)
+        written.add_done_callback(lambda done: self._forget(job, done))
+
+    def _forget(self, job: UploadJob, written: Future) -> None:
+        if written.exception() is None:
+            self.jobs.pop(job.upload_id, None)
+
+    def recover(self) -> Dict[str, int]:
+        """
+        Create or extend batch_jobs, restore indexes an interrupted bulk load
+        dropped, then resume the upload jobs of a previous run
+
+        Returns:
+            Jobs requeued and jobs marked failed
+        """
+        self.db_manager.writer.call(self._ensure_table)
+        try:
+            self.db_manager.restore_dropped_indexes()
+        except Exception as e:
+            logger.error(f"Could not restore indexes dropped by an interrupted bulk load: {e}")
+
+        columns = list(JOB_FIELD_COLUMNS.values())
+        rows = self.db_manager.execute_query(
+            f"SELECT {', '.join(columns)} FROM batch_jobs "
+            f"WHERE job_type = ? AND status IN ('pending', 'running') ORDER BY start_time",
+            (UPLOAD_JOB_TYPE,)
+        )
+        counts = {"requeued": 0, "failed": 0}
+        for row in rows:
+            job = self._from_row(row)
+            self.jobs[job.upload_id] = job
+            if job.status == "pending" and Path(job.file_path).exists():
+                self._submit(job)
+                counts["requeued"] += 1
+                continue
+
+            if job.status == "running":
+                error = f"Server restarted during the upload ({self._undo_inserts(job)})"
+            else:
+                error = "Server restarted and the uploaded file is gone"
+            self._finish(job, status="failed", error=error, message=f"Upload failed: {error}")
+            self._remove_file(job)
+            counts["failed"] += 1
+
+        if rows:
+            logger.info(f"Upload jobs from a previous run: {counts['requeued']} requeued, {counts['failed']} marked failed")
+        return counts
+
+    def shutdown(self) -> None:
+        """Drop queued jobs (they stay pending and run after a restart) and wait for the running ones"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _run(self, job: UploadJob) -> None:
+        self.update(job, status="running", message="Loading file...")
+        try:
+            rows_inserted = self.runner(job, lambda **fields: self.update(job, **fields))
+        except Exception as e:
+            logger.error(f"Upload failed: {job.upload_id}: {e}", exc_info=True)
+            error = f"{e} ({self._undo_inserts(job)})"
+            self._finish(job, status="failed", error=error, message=f"Upload failed: {error}")
+        else:
+            self._finish(
+                job,
+                status="completed",
+                processed_rows=rows_inserted,
+                progress=100.0,
+                message=f"Successfully uploaded {rows_inserted:,} rows",
+            )
+            logger.info(f"Upload complete: {rows_inserted:,} rows inserted into {job.table_name} ({job.upload_id})")
+        finally:
+            self._remove_file(job)
+
+    def _undo_inserts(self, job: UploadJob) -> str:
+        """Delete the rows a failed job appended (rowid > start_rowid); returns what happened"""
+        inserted = f"{job.processed_rows:,} rows already inserted into {job.table_name}"
+        if job.start_rowid is None:
+            # Failed before its first insert, or recorded before start_rowid existed
+            return inserted if job.processed_rows else "no rows inserted"
+        try:
+            deleted = self.db_manager.delete_rows_after(job.table_name, job.start_rowid)
+        except Exception as e:
+            logger.error(f"Could not delete the rows of failed upload {job.upload_id}: {e}")
+            return inserted
+        return f"{deleted:,} inserted rows removed from {job.table_name}"
+
+    @staticmethod
+    def _remove_file(job: UploadJob) -> None:
+        try:
+            Path(job.file_path).unlink(missing_ok=True)
+        except OSError as e:
+            logger.warning(f"Could not delete upload file {job.file_path}: {e}")
+
+    def _ensure_table(self) -> None:
+        conn = self.db_manager.get_connection()
+        conn.execute(BATCH_JOBS_DDL)
+        existing = {row[1] for row in conn.execute("PRAGMA table_info(batch_jobs)")}
+        for column, column_type in UPLOAD_JOB_COLUMNS.items():
+            if column not in existing:
+                conn.execute(f"ALTER TABLE batch_jobs ADD COLUMN {column} {column_type}")
+                logger.info(f"batch_jobs.{column} 컬럼 추가")
+        conn.commit()
+
+    def _persist(self, job: UploadJob, insert: bool = False, fields: Optional[list] = None) -> Future:
+        """Queue the job's row (insert) or the given fields (update) to the writer"""
+        if insert:
+            columns = ["job_type", "updated_at", *JOB_FIELD_COLUMNS.values()]
+            values = [UPLOAD_JOB_TYPE, _now(), *(getattr(job, field) for field in JOB_FIELD_COLUMNS)]
+            sql = f"INSERT INTO batch_jobs ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+        else:
+            assignments = [f"{JOB_FIELD_COLUMNS[field]} = ?" for field in fields] + ["updated_at = ?"]
+            values = [getattr(job, field) for field in fields] + [_now(), job.upload_id]
+            sql = f"UPDATE batch_jobs SET {', '.join(assignments)} WHERE job_id = ?"
+
+        future = self.db_manager.writer.submit(lambda conn: conn.execute(sql, values).rowcount, statement=True)
+        future.add_done_callback(lambda done: self._log_write_error(job, done))
+        return future
+
+    @staticmethod
+    def _log_write_error(job: UploadJob, future: Future) -> None:
+        if future.exception() is not None:
+            logger.warning(f"Could not record upload job {job.upload_id} in batch_jobs: {future.exception()}")
+
+    @staticmethod
+    def _from_row(row: tuple) -> UploadJob:
+        values = dict(zip(JOB_FIELD_COLUMNS, row))
+        for field in ("total_rows", "processed_rows"):
+            values[field] = values[field] or 0
+        values["progress"] = values["progress"] or 0.0
+        return UploadJob(**values)
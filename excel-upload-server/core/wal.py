@@ -0,0 +1,101 @@
+"""
+WAL journaling and checkpoint policy of sambio_human.db
+
+In WAL mode the Next.js dashboard (better-sqlite3) keeps reading committed
+data while an upload writes, instead of waiting on the rollback journal's
+exclusive lock. The upload server checkpoints the WAL itself:
+
+- PASSIVE between inserted frames: copies what readers no longer need back
+  into the database without waiting for them
+- TRUNCATE after a load: waits for readers (busy timeout), then resets the
+  WAL file to zero bytes
+
+journal_size_limit caps what is left of the WAL file after each reset.
+
+Configuration (env):
+    DB_JOURNAL_MODE          wal (default) or delete
+    DB_WAL_SIZE_LIMIT_MB     WAL size kept after a checkpoint (default 64)
+"""
+import logging
+import os
+import sqlite3
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_JOURNAL_MODE = "wal"
+DEFAULT_WAL_SIZE_LIMIT_MB = 64
+
+CHECKPOINT_MODES = ("PASSIVE", "FULL", "RESTART", "TRUNCATE")
+
+
+def journal_mode() -> str:
+    """Configured journal mode (DB_JOURNAL_MODE env)"""
+    return os.getenv("DB_JOURNAL_MODE", DEFAULT_JOURNAL_MODE).lower()
+
+
+def wal_size_limit_bytes() -> int:
+    """Configured WAL size cap in bytes (DB_WAL_SIZE_LIMIT_MB env)"""
+    return int(float(os.getenv("DB_WAL_SIZE_LIMIT_MB", str(DEFAULT_WAL_SIZE_LIMIT_MB))) * 1024 * 1024)
+
+
+def wal_path(db_path: Path) -> Path:
+    return Path(f"{db_path}-wal")
+
+
+def wal_size(db_path: Path) -> int:
+    """Size of the database's WAL file in bytes (0 without one)"""
+    try:
+        return wal_path(db_path).stat().st_size
+    except FileNotFoundError:
+        return 0
+
+
+def apply_journal_mode(conn: sqlite3.Connection) -> str:
+    """
+    Switch a connection's database to the configured journal mode
+
+    Returns:
+        The journal mode in effect (the old one if the switch was refused,
+        e.g. while another connection holds a transaction)
+    """
+    mode = journal_mode()
+    try:
+        actual = conn.execute(f"PRAGMA journal_mode = {mode}").fetchone()[0].lower()
+    except sqlite3.OperationalError as e:
+        actual = conn.execute("PRAGMA journal_mode").fetchone()[0].lower()
+        logger.warning(f"journal_mode={mode} 설정 실패 ({e}), 현재 모드 {actual} 유지")
+        return actual
+
+    if actual != mode:
+        logger.warning(f"journal_mode={mode} 요청했으나 {actual} 모드로 동작")
+    if actual == "wal":
+        conn.execute(f"PRAGMA journal_size_limit = {wal_size_limit_bytes()}")
+    return actual
+
+
+def checkpoint(conn: sqlite3.Connection, mode: str = "PASSIVE") -> Dict[str, Any]:
+    """
+    Run a WAL checkpoint
+
+    Returns:
+        mode, busy (1 if it could not finish because of readers or writers),
+        log_frames (frames in the WAL), checkpointed_frames, seconds, at
+    """
+    mode = mode.upper()
+    if mode not in CHECKPOINT_MODES:
+        raise ValueError(f"Unknown checkpoint mode: {mode}")
+
+    started = time.perf_counter()
+    busy, log_frames, checkpointed = conn.execute(f"PRAGMA wal_checkpoint({mode})").fetchone()
+    return {
+        "mode": mode,
+        "busy": busy,
+        "log_frames": log_frames,
+        "checkpointed_frames": checkpointed,
+        "seconds": round(time.perf_counter() - started, 3),
+        "at": datetime.now().isoformat(timespec="seconds"),
+    }
@@ -0,0 +1,219 @@
+"""
+Zero-load .xlsx workbook inspector
+
+Reads only the zip directory, xl/workbook.xml (sheet list), each sheet's
+<dimension> element and its header row, so sheet names, row/column counts
+and headers are available in milliseconds even for 300 MB workbooks.
+"""
+import logging
+import posixpath
+import re
+import zipfile
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from xml.etree.ElementTree import iterparse
+
+logger = logging.getLogger(__name__)
+
+REL_TYPE_WORKSHEET = "/worksheet"
+REL_TYPE_SHARED_STRINGS = "/sharedStrings"
+
+_CELL_REF = re.compile(r"^([A-Z]+)(\d+)$")
+
+
+def _local(tag: str) -> str:
+    """Strip the XML namespace from a tag or attribute name"""
+    return tag.rsplit("}", 1)[-1]
+
+
+def _attr(element, name: str) -> Optional[str]:
+    """Get an attribute by local name (namespace-agnostic)"""
+    for key, value in element.attrib.items():
+        if _local(key) == name:
+            return value
+    return None
+
+
+def _column_index(letters: str) -> int:
+    """Convert column letters to a 0-based index: A -> 0, AA -> 26"""
+    index = 0
+    for char in letters:
+        index = index * 26 + (ord(char) - ord("A") + 1)
+    return index - 1
+
+
+def _parse_ref(ref: str) -> Tuple[int, int]:
+    """Split a cell reference into (0-based column, 1-based row)"""
+    match = _CELL_REF.match(ref.replace("$", "").upper())
+    if not match:
+        raise ValueError(f"Invalid cell reference: {ref}")
+    return _column_index(match.group(1)), int(match.group(2))
+
+
+def _read_relationships(zf: zipfile.ZipFile, rels_path: str, base_dir: str) -> Dict[str, Tuple[str, str]]:
+    """Map relationship id -> (type, absolute part path)"""
+    relationships = {}
+    if rels_path not in zf.NameToInfo:
+        return relationships
+
+    for _, element in iterparse(zf.open(rels_path)):
+        if _local(element.tag) != "Relationship":
+            continue
+        target = element.get("Target", "")
+        if target.startswith("/"):
+            path = target.lstrip("/")
+        else:
+            path = posixpath.normpath(posixpath.join(base_dir, target))
+        relationships[element.get("Id")] = (element.get("Type", ""), path)
+    return relationships
+
+
+class _SharedStrings:
+    """Lazily reads sharedStrings.xml only up to the highest index requested"""
+
+    def __init__(self, zf: zipfile.ZipFile, path: Optional[str]):
+        self._zf = zf
+        self._path = path
+        self._strings: List[str] = []
+        self._parser = None
+
+    def get(self, index: int) -> Optional[str]:
+        if self._path is None:
+            return None
+        if self._parser is None:
+            self._parser = iterparse(self._zf.open(self._path), events=("end",))
+
+        while len(self._strings) <= index:
+            try:
+                _, element = next(self._parser)
+            except StopIteration:
+                return None
+            if _local(element.tag) == "si":
+                self._strings.append("".join(
+                    node.text or "" for node in element.iter() if _local(node.tag) == "t"
+                ))
+                element.clear()
+
+        return self._strings[index]
+
+
+def _cell_value(cell, shared_strings: _SharedStrings):
+    """Decode a header cell value"""
+    cell_type = cell.get("t", "n")
+
+    if cell_type == "inlineStr":
+        return "".join(node.text or "" for node in cell.iter() if _local(node.tag) == "t") or None
+
+    raw = None
+    for node in cell:
+        if _local(node.tag) == "v":
+            raw = node.text
+            break
+    if raw is None:
+        return None
+
+    if cell_type == "s":
+        return shared_strings.get(int(raw))
+    if cell_type == "n":
+        number = float(raw)
+        return int(number) if number.is_integer() else number
+    if cell_type == "b":
+        return raw == "1"
+    return raw
+
+
+def _inspect_sheet(zf: zipfile.ZipFile, path: str, shared_strings: _SharedStrings) -> dict:
+    """Read <dimension> and the first row of one worksheet"""
+    dimension = None
+    header_row = None
+    header_cells: Dict[int, object] = {}
+    last_row = None
+
+    with zf.open(path) as stream:
+        for event, element in iterparse(stream, events=("start", "end")):
+            tag = _local(element.tag)
+
+            if event == "start":
+                if tag == "dimension":
+                    dimension = element.get("ref")
+                continue
+
+            if tag != "row":
+                continue
+
+            row_number = int(element.get("r")) if element.get("r") else (last_row or 0) + 1
+            last_row = row_number
+
+            if header_row is None:
+                cells = [c for c in element if _local(c.tag) == "c"]
+                values = {}
+                for position, cell in enumerate(cells):
+                    ref = cell.get("r")
+                    column = _parse_ref(ref)[0] if ref else position
+                    value = _cell_value(cell, shared_strings)
+                    if value is not None and value != "":
+                        values[column] = value
+                if values:
+                    header_row = row_number
+                    header_cells = values
+
+            element.clear()
+
+            # The dimension gives the last row, so only the header row has to be parsed
+            if header_row is not None and dimension and ":" in dimension:
+                break
+
+    first_col, last_col = 0, (max(header_cells) if header_cells else -1)
+    if dimension and ":" in dimension:
+        start, end = dimension.split(":", 1)
+        first_col, _ = _parse_ref(start)
+        last_col, last_row = _parse_ref(end)
+
+    # Like pd.read_excel, columns are counted from A even if the used range starts later
+    headers = [header_cells.get(col) for col in range(max(header_cells, default=-1) + 1)]
+    rows = max(0, (last_row or 0) - header_row) if header_row is not None else 0
+
+    return {
+        "dimension": dimension,
+        "rows": rows,
+        "columns": last_col - first_col + 1 if header_row is not None else 0,
+        "headers": headers,
+    }
+
+
+def inspect_xlsx(file_path: Path) -> dict:
+    """
+    Inspect an .xlsx workbook without loading its data
+
+    Args:
+        file_path: Path to .xlsx/.xlsm file
+
+    Returns:
+        Dictionary with per-sheet name, data row count (header excluded),
+        column count and raw header values, plus total_rows over all sheets
+    """
+    with zipfile.ZipFile(file_path) as zf:
+        workbook_rels = _read_relationships(zf, "xl/_rels/workbook.xml.rels", "xl")
+
+        shared_strings_path = next(
+            (path for rel_type, path in workbook_rels.values() if rel_type.endswith(REL_TYPE_SHARED_STRINGS)),
+            None
+        )
+        shared_strings = _SharedStrings(zf, shared_strings_path if shared_strings_path in zf.NameToInfo else None)
+
+        sheets = []
+        for _, element in iterparse(zf.open("xl/workbook.xml")):
+            if _local(element.tag) != "sheet":
+                continue
+            rel_type, path = workbook_rels.get(_attr(element, "id"), ("", None))
+            if path is None or not rel_type.endswith(REL_TYPE_WORKSHEET):
+                # Chart sheets and dialog sheets hold no rows
+                continue
+            sheet_info = _inspect_sheet(zf, path, shared_strings)
+            sheet_info["name"] = element.get("name")
+            sheets.append(sheet_info)
+
+    return {
+        "sheets": sheets,
+        "total_rows": sum(sheet["rows"] for sheet in sheets),
+    }
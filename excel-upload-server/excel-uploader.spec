@@ -40,8 +40,13 @@ a = Analysis(
         # Data processing
         'pandas',
         'openpyxl',
+        'python_calamine',
         'xlrd',
         'numpy',
+        # Staging cache, spill strategy and shard transport (Parquet / Arrow IPC)
+        'pyarrow',
+        'pyarrow.parquet',
+        'pyarrow.ipc',
         # Other
         'sqlite3',
         'altair',
@@ -1,888 +1,891 @@
 """
 Data transformation handlers for each data type
 Based on DATA_TABLES_COMPLETE_MAPPING.md specifications
+
+Each data type is described by a TransformSpec (renames, casts, business-rule
+steps) in TRANSFORM_SPECS and compiled into a single-pass transform
+(see handlers/transform_specs.py).
 """
 import pandas as pd
+import numpy as np
+import math
 from datetime import datetime
 import logging
-from typing import Callable, Dict
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from core.attendance_rules import TRIP_COLUMN, AttendanceRules, has_rules_table, read_rules
+from handlers.transform_specs import ChunkTransformer, TransformContext, TransformSpec, compile_spec
+from utils.employee_keys import EMP_KEY, employee_key
 
 logger = logging.getLogger(__name__)
 
+# 크로스 플랫폼 경로: 현재 파일 기준 2단계 상위의 sambio_human.db (reference tables)
+REFERENCE_DB_PATH = Path(__file__).parent.parent.parent / "sambio_human.db"
+
+
+def _fillna(series: pd.Series, values: pd.Series) -> pd.Series:
+    """fillna that also works on categorical columns (fill values become categories)"""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        new_categories = pd.Index(values.dropna().unique()).difference(series.cat.categories)
+        series = series.cat.add_categories(new_categories)
+    return series.fillna(values)
+
+
+def _distinct_values(series: pd.Series, func: Callable[[Any], Any]) -> np.ndarray:
+    """func applied once per distinct value, broadcast back to an object array (missing -> None)"""
+    if series.dtype == object and pd.api.types.infer_dtype(series, skipna=True).startswith("mixed"):
+        # 1, 1.0 and True hash alike but differ under str(): map each Python type separately
+        kind_codes, kinds = pd.factorize(series.map(type))
+        values = np.empty(len(series), dtype=object)
+        for i in range(len(kinds)):
+            positions = np.flatnonzero(kind_codes == i)
+            values[positions] = _distinct_values(series.iloc[positions], func)
+        return values
+
+    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    # Last slot holds the result for missing values (code -1)
+    mapped = np.empty(len(uniques) + 1, dtype=object)
+    mapped[:-1] = [func(value) for value in np.asarray(uniques, dtype=object)]
+    return mapped[codes]
+
+
+def _map_distinct(series: pd.Series, func: Callable[[Any], Any]) -> pd.Series:
+    """
+    Series.apply(func) for columns with few distinct values
+
+    Claim files repeat a few hundred distinct dates/times over ~1.4M rows, so
+    converting each distinct value once is much faster than a per-row apply.
+    func must return None for missing values; the result dtype is inferred
+    like Series.apply.
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        # Categoricals already map per category (and may stay categorical, like apply)
+        return series.apply(func)
+
+    if series.dtype == object and pd.api.types.infer_dtype(series, skipna=True).startswith("mixed"):
+        return pd.Series(_distinct_values(series, func), index=series.index).infer_objects()
+
+    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    results = [func(value) for value in np.asarray(uniques, dtype=object)]
+    if (codes < 0).any():
+        results.append(None)  # taken by code -1 (missing values)
+
+    # Infer the dtype from the distinct results, then expand to rows
+    distinct = np.empty(len(results), dtype=object)
+    distinct[:] = results
+    return pd.Series(distinct).infer_objects().take(codes).set_axis(series.index)
+
+
+def _parse_work_date(value) -> Optional[str]:
+    """근무일 -> 'YYYY-MM-DD HH:MM:SS' (None if not a recognizable date)"""
+    if pd.isna(value):
+        return None
+    date_str = str(value).strip()
+
+    # Already in correct format
+    if '-' in date_str and len(date_str) >= 10:
+        return date_str if ' ' in date_str else date_str + ' 00:00:00'
+
+    # YYYYMMDD format (8 digits)
+    if len(date_str) == 8 and date_str.isdigit():
+        return f"{date_str[:4]}-{date_str[4:6]}-{date_str[6:8]} 00:00:00"
+
+    return None
+
+
+def _time_to_hours(time_val) -> Optional[float]:
+    """
+    Convert various time formats to decimal hours:
+    - 숫자 (int/float): 분(minutes) 단위로 간주 (예: 480 → 8.0 hours)
+    - "HH:MM" 문자열: 시:분 형식 (예: "8:30" → 8.5 hours)
+    """
+    if pd.isna(time_val):
+        return None
+
+    # ✅ 숫자 형식 → 분(minutes) 단위로 간주
+    if isinstance(time_val, (int, float)):
+        try:
+            minutes = float(time_val)
+        except OverflowError:
+            return None
+        if minutes == 0:
+            return None
+        return minutes / 60.0  # 분을 시간으로 변환
+
+    # 문자열 형식 (HH:MM)
+    time_str = str(time_val).strip()
+    if time_str == '' or time_str == '00:00' or time_str == 'nan':
+        return None
+
+    try:
+        # HH:MM 형식
+        if ':' in time_str:
+            parts = time_str.split(':')
+            return int(parts[0]) + (int(parts[1]) / 60.0)
+
+        # 숫자만 있는 문자열 → 분 단위로 간주
+        if time_str.replace('.', '', 1).isdigit():
+            return float(time_str) / 60.0
+
+        return None
+    except (ValueError, OverflowError):
+        return None
+
+
+def _clock_minutes(value) -> Optional[int]:
+    """HHMM 숫자 (808 → 08:08) → 자정 기준 분 (None if not an integer)"""
+    try:
+        clock = int(value)
+    except (TypeError, ValueError, OverflowError):
+        return None
+    return (clock // 100) * 60 + clock % 100
+
+
+def _exclude_minutes(value) -> Optional[float]:
+    """제외시간 (분) as float (None if not a number)"""
+    try:
+        minutes = float(value)
+    except (TypeError, ValueError, OverflowError):
+        return None
+    # A NaN exclusion zeroes the work hours (max(0, nan) == 0); inf does the same arithmetically
+    return math.inf if math.isnan(minutes) else minutes
+
+
+def _shift_work_hours(df: pd.DataFrame) -> pd.Series:
+    """
+    근무시간, falling back to 시작/종료 (HHMM) minus 제외시간 where it is missing or <= 0
+
+    Shifts ending before they start wrap past midnight; results are clipped at 0.
+    Rows whose 시작/종료/제외시간 cannot be parsed get None.
+    """
+    hours = pd.to_numeric(df['근무시간']).to_numpy(dtype=float)
+    start = pd.to_numeric(_map_distinct(df['시작'], _clock_minutes)).to_numpy(dtype=float)
+    end = pd.to_numeric(_map_distinct(df['종료'], _clock_minutes)).to_numpy(dtype=float)
+
+    # 자정 넘김 처리
+    end = np.where(end < start, end + 24 * 60, end)
+    work_hours = (end - start) / 60.0
+
+    # 제외시간 차감 (분 단위 → 시간으로 변환); missing means no exclusion, unparsable means no result
+    if '제외시간' in df.columns:
+        exclude = df['제외시간']
+        exclude_mins = pd.to_numeric(_map_distinct(exclude, _exclude_minutes)).to_numpy(dtype=float, copy=True)
+        exclude_mins[exclude.isna().to_numpy()] = 0.0
+        work_hours = work_hours - exclude_mins / 60.0
+        invalid = np.isnan(exclude_mins)
+    else:
+        invalid = np.zeros(len(df), dtype=bool)
+
+    calculated = np.where(work_hours > 0, work_hours, 0.0)
+    calculated[np.isnan(start) | np.isnan(end) | invalid] = np.nan
+
+    # 근무시간이 이미 있으면 사용
+    result = np.where(~np.isnan(hours) & (hours > 0), hours, calculated)
+
+    values = result.astype(object)
+    values[np.isnan(result)] = None
+    return pd.Series(values, index=df.index).infer_objects()
+
+
+def _clock_text(value) -> Optional[str]:
+    """시작/종료 'HH:MM' → 'HHMM' (None if empty)"""
+    return str(value).replace(':', '') if pd.notna(value) and str(value) != '' else None
+
+
+def _id_text(values: pd.Series) -> pd.Series:
+    """Numeric IDs as text without the float part (20200181.0 → '20200181')"""
+    return _map_distinct(pd.to_numeric(values, errors='coerce'), lambda x: str(int(x)) if pd.notna(x) else None)
+
+
+def _whole_number(values: pd.Series) -> pd.Series:
+    """Numeric IDs as integers (missing values stay missing)"""
+    return _map_distinct(pd.to_numeric(values, errors='coerce'), lambda x: int(x) if pd.notna(x) else None)
+
+
+# ---------------------------------------------------------------------------
+# claim_data business rules (TransformSpec steps, run in this order)
+# ---------------------------------------------------------------------------
+
+def _claim_work_hours(df: pd.DataFrame, context: TransformContext) -> pd.DataFrame:
+    """✅ 근무시간이 비어있으면 시작/종료 시간으로 계산"""
+    if '근무시간' in df.columns and '시작' in df.columns and '종료' in df.columns:
+        calculated_count = df['근무시간'].isna().sum()
+        if calculated_count > 0:
+            df['근무시간'] = _shift_work_hours(df)
+            context.stats['work_hours_calculated'] += int(calculated_count)
+    return df
 
-class DataTransformers:
-    """Collection of data transformation functions for each data type"""
 
-    @staticmethod
-    def transform_tag_data(df: pd.DataFrame) -> pd.DataFrame:
+def _claim_actual_hours(df: pd.DataFrame, context: TransformContext) -> pd.DataFrame:
+    """✅ FIX: 실제근무시간이 없으면 근무시간으로 채우기"""
+    if '근무시간' not in df.columns:
+        return df
+
+    if '실제근무시간' not in df.columns:
+        # 실제근무시간 컬럼이 아예 없으면 생성
+        df['실제근무시간'] = df['근무시간']
+        context.stats['actual_hours_created'] += 1
+    else:
+        # 실제근무시간 컬럼은 있지만 값이 NULL인 경우 근무시간으로 채움
+        null_count = df['실제근무시간'].isna().sum()
+        if null_count > 0:
+            df.loc[df['실제근무시간'].isna(), '실제근무시간'] = df.loc[df['실제근무시간'].isna(), '근무시간']
+            context.stats['actual_hours_filled'] += int(null_count)
+    return df
+
+
+def _claim_leave_hours(df: pd.DataFrame, context: TransformContext) -> pd.DataFrame:
+    """
+    ✅ AUTOMATION: 근태명에서 휴가시간 자동 반영 (연차.휴가반영.md Phase 1)
+
+    휴가시간을 실제근무시간에 합산해 claim_data 테이블에 휴가가 반영된 근무시간을 저장하고,
+    출장/교육/파견인데 근무시간이 0인 경우 표준 8시간을 부여한다 (근무시간이 있으면 유지).
+    규칙은 attendance_rules 테이블에서 읽어 한 번의 lookup으로 적용한다 (core/attendance_rules.py).
+    """
+    if '근태명' not in df.columns:
+        return df
+
+    rules = context.references.get('attendance_rules')
+    if rules is None:
+        rules = AttendanceRules.from_defaults()
+    leave_hours, trip_hours = rules.lookup(df['근태명'])
+
+    # 휴가_연차 컬럼 초기화
+    if '휴가_연차' not in df.columns:
+        df['휴가_연차'] = 0.0
+        context.stats['leave_column_created'] += 1
+
+    # 근태명별로 휴가시간 설정 (규칙이 없는 근태명은 기존 값 유지)
+    mask = ~np.isnan(leave_hours)
+    if mask.any():
+        df.loc[mask, '휴가_연차'] = leave_hours[mask]
+        context.stats['leave_applied'] += int(mask.sum())
+
+    if '실제근무시간' not in df.columns:
+        return df
+
+    # 실제근무시간에 휴가시간 합산 (핵심 로직!)
+    original_sum = df['실제근무시간'].sum()
+    df['실제근무시간'] = df['실제근무시간'] + df['휴가_연차']
+    context.stats['leave_hours_added'] += float(df['실제근무시간'].sum() - original_sum)
+
+    # ✅ AUTOMATION: 출장/교육/파견 처리 (휴가가 아니라 근무)
+    # 부여한 시간은 출장_보정에 기록 (규칙 변경 시 재계산용)
+    if TRIP_COLUMN not in df.columns:
+        df[TRIP_COLUMN] = 0.0
+    mask = ~np.isnan(trip_hours) & (df['실제근무시간'] == 0).to_numpy()
+    if mask.any():
+        df.loc[mask, '실제근무시간'] = trip_hours[mask]
+        df.loc[mask, TRIP_COLUMN] = trip_hours[mask]
+        context.stats['trip_fixed'] += int(mask.sum())
+    return df
+
+
+def _claim_clock_text(df: pd.DataFrame, context: TransformContext) -> pd.DataFrame:
+    """시작, 종료 'HH:MM' → 'HHMM' (근무시간 계산 이후에 변환)"""
+    for col in ['시작', '종료']:
+        if col in df.columns:
+            df[col] = _map_distinct(df[col], _clock_text)
+    return df
+
+
+def _read_organization_references(conn) -> Dict[str, pd.DataFrame]:
+    """
+    organization_data (재직) indexed by emp_key of 사번, and the employee_level
+    of each grade_name (the lookups of _claim_organization)
+    """
+    # organization_data에서 조직 정보 가져오기
+    org_df = pd.read_sql_query(
         """
-        Transform tag_data Excel to DB format
-        Mapping: 일자→ENTE_DT, 사번→사번, DR_GB→DR_GB, etc.
+        SELECT
+            사번,
+            성명 as 조직_성명,
+            직급명 as 조직_직급,
+            센터 as 조직_센터,
+            BU as 조직_담당,
+            팀 as 조직_팀,
+            그룹 as 조직_그룹,
+            부서명 as 조직_부서
+        FROM organization_data
+        WHERE 재직상태 = '재직'
+        """,
+        conn
+    )
+    grade_mapping_df = pd.read_sql_query(
         """
-        logger.info("Transforming tag_data...")
+        SELECT
+            grade_name,
+            level as employee_level
+        FROM grade_level_mapping
+        """,
+        conn
+    )
+
+    # 사번 타입(INTEGER/REAL/TEXT)과 무관하게 정수 키로 조인 (사번당 한 행)
+    org_df[EMP_KEY] = employee_key(org_df['사번'])
+    org_df = (
+        org_df.dropna(subset=[EMP_KEY])
+        .drop_duplicates(subset=[EMP_KEY])
+        .drop(columns=['사번'])
+        .set_index(EMP_KEY)
+    )
+    grades = grade_mapping_df.drop_duplicates(subset=['grade_name']).set_index('grade_name')['employee_level']
+    return {'organization': org_df, 'grades': grades}
+
+
+def _load_organization_references() -> Optional[Dict[str, pd.DataFrame]]:
+    """
+    Organization references of claim_data, from the process-wide reference cache
+
+    Returns:
+        {'organization': ..., 'grades': ...}, or None if unavailable
+    """
+    try:
+        from core.reference_cache import reference_cache_for_db
+
+        db_path = REFERENCE_DB_PATH
+        if not db_path.exists():
+            logger.warning("DB 파일 없음 - 조직 정보 자동 채우기 생략")
+            return None
+
+        return reference_cache_for_db(db_path).get(
+            'claim_organization',
+            ['organization_data', 'grade_level_mapping'],
+            _read_organization_references
+        )
+
+    except Exception as e:
+        logger.warning(f"조직 정보 자동 채우기 실패: {e}")
+        import traceback
+        logger.warning(traceback.format_exc())
+        return None
+
+
+def _load_attendance_rules() -> Optional[AttendanceRules]:
+    """
+    Compiled attendance_rules of claim_data (read once per upload)
+
+    Returns:
+        The stored rules, or None (the defaults are used) if unavailable
+    """
+    try:
+        import sqlite3
+
+        if not REFERENCE_DB_PATH.exists():
+            return None
+
+        # Read only: the table (and claim_data.출장_보정) is created by DatabaseManager on upload
+        conn = sqlite3.connect(str(REFERENCE_DB_PATH))
+        try:
+            return read_rules(conn) if has_rules_table(conn) else None
+        finally:
+            conn.close()
+
+    except Exception as e:
+        logger.warning(f"근태 규칙 로드 실패 (기본 규칙 사용): {e}")
+        return None
+
+
+def _claim_organization(df: pd.DataFrame, context: TransformContext) -> pd.DataFrame:
+    """
+    ✅ ENHANCEMENT: organization_data에서 조직 정보 자동 채우기
+
+    신규 데이터에 조직 정보가 비어있는 경우, 사번으로 조직 마스터에서 가져오고
+    직급으로 grade_level_mapping의 employee_level을 설정한다.
+    """
+    references = context.references.get('organization')
+    if '사번' not in df.columns or references is None:
+        return df
 
-        # Column mapping
-        column_map = {
+    try:
+        # 사번의 정수 키로 조직 정보와 JOIN (left join으로 매칭되지 않는 직원도 유지, 사번 값은 그대로)
+        df['_org_key'] = employee_key(df['사번'])
+        df = df.join(references['organization'], on='_org_key').drop(columns=['_org_key'])
+
+        # 비어있는 필드만 조직 정보로 채우기
+        if '성명' in df.columns and '조직_성명' in df.columns:
+            df['성명'] = _fillna(df['성명'], df['조직_성명'])
+            df = df.drop(columns=['조직_성명'])
+
+        if '직급' in df.columns and '조직_직급' in df.columns:
+            df['직급'] = _fillna(df['직급'], df['조직_직급'])
+            df = df.drop(columns=['조직_직급'])
+
+        # 부서 정보 채우기 (claim_data의 '부서' 컬럼)
+        if '부서' in df.columns and '조직_부서' in df.columns:
+            empty_count = df['부서'].isna().sum()
+            if empty_count > 0:
+                df['부서'] = _fillna(df['부서'], df['조직_부서'])
+                context.stats['department_filled'] += int(empty_count)
+            df = df.drop(columns=['조직_부서'])
+
+        # 센터, 담당, 팀, 그룹 정보는 claim_data 스키마에 없으므로 제거
+        for col in ['조직_센터', '조직_담당', '조직_팀', '조직_그룹']:
+            if col in df.columns:
+                df = df.drop(columns=[col])
+
+        context.stats['organization_matched'] += len(df)
+
+        # ✅ FIX: Set employee_level from 직급 column using grade_level_mapping
+        if '직급' in df.columns:
+            # 직급 → employee_level 조회 (직급 값은 그대로)
+            levels = df['직급'].map(references['grades'])
+            if isinstance(levels.dtype, pd.CategoricalDtype):
+                # 범주형 직급은 범주형 결과를 돌려주므로 숫자로 되돌림
+                levels = levels.astype(references['grades'].dtype)
+            df['employee_level'] = levels
+
+            unmapped = df['employee_level'].isna()
+            context.stats['level_rows'] += len(df)
+            context.stats['level_mapped'] += len(df) - int(unmapped.sum())
+            context.seen.setdefault('unmapped_grades', set()).update(df.loc[unmapped, '직급'].dropna().unique())
+
+    except Exception as e:
+        logger.warning(f"조직 정보 자동 채우기 실패: {e}")
+        import traceback
+        logger.warning(traceback.format_exc())
+
+    return df
+
+
+def _claim_summary(context: TransformContext) -> None:
+    """Aggregate claim_data log lines (all chunks of an upload)"""
+    stats = context.stats
+
+    if stats['work_hours_calculated'] > 0:
+        logger.info(f"시작/종료 시간으로 근무시간 계산: {stats['work_hours_calculated']:,}건")
+    if stats['actual_hours_created'] > 0:
+        logger.info("실제근무시간 컬럼 생성: 근무시간 값으로 채움")
+    if stats['actual_hours_filled'] > 0:
+        logger.info(f"실제근무시간 NULL 값 {stats['actual_hours_filled']:,}개를 근무시간으로 채움")
+    if stats['leave_column_created'] > 0:
+        logger.info("휴가_연차 컬럼 생성 (초기값 0.0)")
+    if stats['leave_applied'] > 0:
+        logger.info(f"근태명에서 휴가시간 추출: {stats['leave_applied']:,}건")
+    if stats['leave_hours_added'] > 0:
+        logger.info(f"✅ 실제근무시간에 휴가시간 합산 완료: +{stats['leave_hours_added']:,.1f}시간 (총 {stats['leave_applied']:,}건)")
+        logger.info(f"   예: 년차 = 0h → 8h, 반차 = 6.8h → 10.8h")
+    if stats['trip_fixed'] > 0:
+        logger.info(f"✅ 출장/교육/파견 근무시간 보정 완료: {stats['trip_fixed']:,}건 (0h → 8h)")
+        logger.info(f"   예: 사외교육 0h → 8h, 해외출장 11h → 11h, 사외파견 0h → 8h")
+
+    if stats['department_filled'] > 0:
+        logger.info(f"조직 정보에서 부서 채움: {stats['department_filled']:,}건")
+    if stats['organization_matched'] > 0:
+        logger.info(f"organization_data에서 조직 정보 매칭 완료: {stats['organization_matched']:,}건")
+    if stats['level_rows'] > 0:
+        level_count, total_rows = stats['level_mapped'], stats['level_rows']
+        logger.info(f"직급에서 employee_level 설정 완료: {level_count:,}/{total_rows:,}행 ({level_count / total_rows * 100:.1f}%)")
+        unmapped_grades = context.seen.get('unmapped_grades', set())
+        if 0 < len(unmapped_grades) <= 10:
+            logger.warning(f"매핑되지 않은 직급: {', '.join(map(str, unmapped_grades))}")
+
+
+# ---------------------------------------------------------------------------
+# tag_data event log format (8월~ 태깅 데이터): mapped into the tag_data layout
+# ---------------------------------------------------------------------------
+
+# Columns of tag_data filled by the transformer (event log rows are projected to these)
+TAG_DATA_COLUMNS = [
+    'ENTE_DT', 'DAY_GB', 'DAY_NM', 'NAME', '사번', 'CENTER', 'BU', 'TEAM', 'GROUP_A', 'PART',
+    '출입시각', 'DR_NO', 'DR_NM', 'DR_GB', 'INOUT_GB'
+]
+
+
+def _code_text(value) -> Optional[str]:
+    """Door/equipment code as text (1234.0 → '1234', ' A-12 ' → 'A-12', missing → None)"""
+    if value is None or pd.isna(value):
+        return None
+    if isinstance(value, (int, float, np.integer, np.floating)) and float(value).is_integer():
+        return str(int(value))
+    text = str(value).strip()
+    return text or None
+
+
+def _read_tag_locations(conn) -> Dict[str, pd.DataFrame]:
+    """tag_location_master indexed by 게이트명 and by DR_NO (first row of a duplicated key wins)"""
+    locations = pd.read_sql_query("SELECT DR_NO, 게이트명, Tag_Code FROM tag_location_master", conn)
+    locations['DR_NO'] = _map_distinct(locations['DR_NO'], _code_text)
+    locations['게이트명'] = _map_distinct(locations['게이트명'], _code_text)
+
+    gates = locations.dropna(subset=['게이트명']).drop_duplicates('게이트명').set_index('게이트명')
+    doors = locations.dropna(subset=['DR_NO']).drop_duplicates('DR_NO').set_index('DR_NO')
+    return {'gates': gates[['DR_NO', 'Tag_Code']], 'doors': doors[['Tag_Code']]}
+
+
+def _load_tag_locations() -> Optional[Dict[str, pd.DataFrame]]:
+    """
+    tag_location_master lookups of tag_data, from the process-wide reference cache
+
+    Returns:
+        {'gates': ..., 'doors': ...}, or None if unavailable
+    """
+    try:
+        from core.reference_cache import reference_cache_for_db
+
+        if not REFERENCE_DB_PATH.exists():
+            return None
+
+        return reference_cache_for_db(REFERENCE_DB_PATH).get(
+            'tag_locations',
+            ['tag_location_master'],
+            _read_tag_locations
+        )
+
+    except Exception as e:
+        logger.warning(f"tag_location_master 로드 실패 (DR_NO/DR_GB 매핑 생략): {e}")
+        return None
+
+
+def _lookup(table: pd.DataFrame, column: str, keys: pd.Series) -> np.ndarray:
+    """table[column] of each key (object array, None where the key is missing or unknown)"""
+    codes, uniques = pd.factorize(keys)
+    # Position per distinct key, -1 for unknown keys and for missing rows (code -1): one trailing None
+    positions = np.append(table.index.get_indexer(pd.Index(uniques)), -1)[codes]
+    values = np.append(table[column].to_numpy(dtype=object), None)
+    return values[positions]
+
+
+def _tag_event_log(df: pd.DataFrame, context: TransformContext) -> pd.DataFrame:
+    """
+    8월~ 태깅 데이터(REGDATE, EMPLOYEENO, DOORNAME, EQUIPNO, ...)를 tag_data 형식으로 변환
+
+    - REGDATE (YYYYMMDDHHMMSS로 cast됨) → ENTE_DT (YYYYMMDD), 출입시각 (HHMMSS)
+    - DOORNAME(DR_NM)을 tag_location_master 게이트명으로 찾아 DR_NO, DR_GB(Tag_Code) 설정,
+      게이트명이 없으면 EQUIPNO를 DR_NO로 보고 Tag_Code를 찾음
+    - tag_data에 없는 컬럼(EVENTLOGSEQ, CARDNO, PROCDATE 등)은 제거
+
+    기존 형식(일자, 출입시각, 문번호, ...)의 파일은 그대로 통과한다.
+    """
+    if 'REGDATE' not in df.columns:
+        return df
+
+    event_time = df['REGDATE']
+    df['ENTE_DT'] = event_time // 1_000_000
+    df['출입시각'] = event_time % 1_000_000
+
+    missing = pd.Series(None, index=df.index, dtype=object)
+    door_names = _map_distinct(df['DR_NM'], _code_text) if 'DR_NM' in df.columns else missing
+    equipment = _map_distinct(df['EQUIPNO'], _code_text) if 'EQUIPNO' in df.columns else missing
+
+    locations = context.references.get('tag_locations')
+    if locations is not None:
+        door_numbers = _lookup(locations['gates'], 'DR_NO', door_names)
+        tag_codes = _lookup(locations['gates'], 'Tag_Code', door_names)
+
+        # 게이트명으로 못 찾은 행: EQUIPNO를 DR_NO로 보고 찾음
+        by_equipment = pd.isna(tag_codes)
+        tag_codes[by_equipment] = _lookup(locations['doors'], 'Tag_Code', equipment[by_equipment])
+        door_numbers = np.where(pd.isna(door_numbers), equipment.to_numpy(dtype=object), door_numbers)
+
+        unmatched = pd.isna(tag_codes)
+        context.stats['tag_location_unmatched'] += int(unmatched.sum())
+        context.seen.setdefault('unmatched_doors', set()).update(door_names[unmatched].dropna().unique())
+    else:
+        door_numbers = equipment.to_numpy(dtype=object)
+        tag_codes = np.full(len(df), None, dtype=object)
+
+    df['DR_NO'] = pd.Series(door_numbers, index=df.index)
+    df['DR_GB'] = pd.Series(tag_codes, index=df.index)
+
+    context.stats['event_log_rows'] += len(df)
+    return df.loc[:, [column for column in TAG_DATA_COLUMNS if column in df.columns]]
+
+
+def _tag_summary(context: TransformContext) -> None:
+    """Aggregate tag_data log lines (all chunks of an upload)"""
+    stats = context.stats
+    if stats['event_log_rows'] == 0:
+        return
+
+    logger.info(f"태깅 이벤트 로그 형식 → tag_data 변환: {stats['event_log_rows']:,}건")
+    if stats['tag_location_unmatched'] > 0:
+        logger.warning(f"tag_location_master에 없는 문: {stats['tag_location_unmatched']:,}건 (DR_GB NULL)")
+        unmatched_doors = context.seen.get('unmatched_doors', set())
+        if 0 < len(unmatched_doors) <= 10:
+            logger.warning(f"매핑되지 않은 문: {', '.join(map(str, unmatched_doors))}")
+
+
+# ---------------------------------------------------------------------------
+# Transform specs (Excel columns → DB format, per data type)
+# ---------------------------------------------------------------------------
+
+TRANSFORM_SPECS: Dict[str, TransformSpec] = {
+    # Mapping: 일자→ENTE_DT, 사번→사번, DR_GB→DR_GB, etc.
+    "tag_data": TransformSpec(
+        name="tag_data",
+        employee_columns=['사번'],
+        day_column='ENTE_DT',
+        renames={
             '일자': 'ENTE_DT',
             '요일구분': 'DAY_GB',
             '요일명': 'DAY_NM',
             '이름': 'NAME',
-            '사번': '사번',
             '센터': 'CENTER',
             '담당': 'BU',
             '팀': 'TEAM',
             '그룹': 'GROUP_A',
             '파트': 'PART',
-            '출입시각': '출입시각',
             '문번호': 'DR_NO',
             '문명칭': 'DR_NM',
             'DR구분': 'DR_GB',
-            '출입구분': 'INOUT_GB'
-        }
-
-        # Rename columns
-        df = df.rename(columns=column_map)
-
-        # Data type conversions
-        if 'ENTE_DT' in df.columns:
-            df['ENTE_DT'] = df['ENTE_DT'].astype(str).str.replace('-', '')
-            df['ENTE_DT'] = pd.to_numeric(df['ENTE_DT'], errors='coerce')
-
-        if '사번' in df.columns:
-            df['사번'] = pd.to_numeric(df['사번'], errors='coerce')
-
-        # ✅ FIX: 출입시각은 이미 HHMMSS 정수 형식이므로 변환하지 않음
-        # 출입시각 = 70553 → 07:05:53 (시:분:초)
-        # pandas가 자동으로 datetime으로 변환하지 않도록 명시적으로 정수로 유지
-        if '출입시각' in df.columns:
-            df['출입시각'] = pd.to_numeric(df['출입시각'], errors='coerce')
-
-        logger.info(f"tag_data transformation complete: {len(df):,} rows")
-        return df
-
-    @staticmethod
-    def transform_claim_data(df: pd.DataFrame) -> pd.DataFrame:
-        """
-        Transform claim_data Excel to DB format
-        Excel columns: 근무일, 급여요일, 성명, 사번, 부서, 직급, WORKSCHDTYPNM,
-                      근무시간, 시작, 종료, 제외시간, 근태명, 근태코드
-        """
-        logger.info("Transforming claim_data...")
-
-        # No column mapping needed - DB schema matches Excel structure
-        # Just ensure data types are correct
-
-        # Convert 근무일 to datetime format (YYYY-MM-DD HH:MM:SS)
-        if '근무일' in df.columns:
-            # Handle various date formats
-            def parse_date(date_val):
-                if pd.isna(date_val):
-                    return None
-                date_str = str(date_val).strip()
-
-                # Already in correct format
-                if '-' in date_str and len(date_str) >= 10:
-                    return date_str if ' ' in date_str else date_str + ' 00:00:00'
-
-                # YYYYMMDD format (8 digits)
-                if len(date_str) == 8 and date_str.isdigit():
-                    return f"{date_str[:4]}-{date_str[4:6]}-{date_str[6:8]} 00:00:00"
-
-                return None
-
-            df['근무일'] = df['근무일'].apply(parse_date)
-
-        # Convert 사번 to integer
-        if '사번' in df.columns:
-            df['사번'] = pd.to_numeric(df['사번'], errors='coerce')
-
-        # Convert 근무시간 from minutes or "HH:MM" format to decimal hours
-        if '근무시간' in df.columns:
-            def time_to_hours(time_val):
-                """
-                Convert various time formats to decimal hours:
-                - 숫자 (int/float): 분(minutes) 단위로 간주 (예: 480 → 8.0 hours)
-                - "HH:MM" 문자열: 시:분 형식 (예: "8:30" → 8.5 hours)
-                """
-                if pd.isna(time_val):
-                    return None
-
-                # ✅ 숫자 형식 → 분(minutes) 단위로 간주
-                if isinstance(time_val, (int, float)):
-                    try:
-                        minutes = float(time_val)
-                        if minutes == 0:
-                            return None
-                        return minutes / 60.0  # 분을 시간으로 변환
-                    except:
-                        return None
-
-                # 문자열 형식 (HH:MM)
-                time_str = str(time_val).strip()
-                if time_str == '' or time_str == '00:00' or time_str == 'nan':
-                    return None
-
-                try:
-                    # HH:MM 형식
-                    if ':' in time_str:
-                        parts = time_str.split(':')
-                        if len(parts) >= 2:
-                            hours = int(parts[0])
-                            minutes = int(parts[1])
-                            return hours + (minutes / 60.0)
-
-                    # 숫자만 있는 문자열 → 분 단위로 간주
-                    if time_str.replace('.', '', 1).isdigit():
-                        minutes = float(time_str)
-                        return minutes / 60.0
-
-                    return None
-                except:
-                    return None
-
-            df['근무시간'] = df['근무시간'].apply(time_to_hours)
-
-            # ✅ 근무시간이 비어있으면 시작/종료 시간으로 계산
-            if '시작' in df.columns and '종료' in df.columns:
-                def calculate_work_hours(row):
-                    """시작/종료 시간으로부터 근무시간 계산"""
-                    # 근무시간이 이미 있으면 사용
-                    if pd.notna(row['근무시간']) and row['근무시간'] > 0:
-                        return row['근무시간']
-
-                    # 시작/종료가 없으면 None
-                    if pd.isna(row['시작']) or pd.isna(row['종료']):
-                        return None
-
-                    try:
-                        start = int(row['시작'])
-                        end = int(row['종료'])
-
-                        # 숫자 형식: 808 → 08:08, 1453 → 14:53
-                        start_hour = start // 100
-                        start_min = start % 100
-                        end_hour = end // 100
-                        end_min = end % 100
-
-                        start_total_mins = start_hour * 60 + start_min
-                        end_total_mins = end_hour * 60 + end_min
-
-                        # 자정 넘김 처리
-                        if end_total_mins < start_total_mins:
-                            end_total_mins += 24 * 60
-
-                        work_mins = end_total_mins - start_total_mins
-                        work_hours = work_mins / 60.0
-
-                        # 제외시간 차감 (분 단위 → 시간으로 변환)
-                        if '제외시간' in row and pd.notna(row['제외시간']):
-                            exclude_mins = float(row['제외시간'])
-                            work_hours -= (exclude_mins / 60.0)
-
-                        return max(0, work_hours)
-                    except:
-                        return None
-
-                # 근무시간 계산 적용
-                calculated_count = df['근무시간'].isna().sum()
-                if calculated_count > 0:
-                    df['근무시간'] = df.apply(calculate_work_hours, axis=1)
-                    logger.info(f"시작/종료 시간으로 근무시간 계산: {calculated_count:,}건")
-
-        # ✅ FIX: 실제근무시간이 없으면 근무시간으로 채우기
-        if '근무시간' in df.columns:
-            if '실제근무시간' not in df.columns:
-                # 실제근무시간 컬럼이 아예 없으면 생성
-                df['실제근무시간'] = df['근무시간']
-                logger.info("실제근무시간 컬럼 생성: 근무시간 값으로 채움")
-            else:
-                # 실제근무시간 컬럼은 있지만 값이 NULL인 경우 근무시간으로 채움
-                null_count = df['실제근무시간'].isna().sum()
-                if null_count > 0:
-                    df.loc[df['실제근무시간'].isna(), '실제근무시간'] = df.loc[df['실제근무시간'].isna(), '근무시간']
-                    logger.info(f"실제근무시간 NULL 값 {null_count:,}개를 근무시간으로 채움")
-
-        # ✅ AUTOMATION: 근태명에서 휴가시간 자동 반영 (연차.휴가반영.md Phase 1)
-        if '근태명' in df.columns:
-            # 휴가_연차 컬럼 초기화
-            if '휴가_연차' not in df.columns:
-                df['휴가_연차'] = 0.0
-                logger.info("휴가_연차 컬럼 생성 (초기값 0.0)")
-
-            # 근태명 → 휴가시간 매핑 테이블 (휴가만 포함, 출장/교육 제외)
-            휴가_매핑 = {
-                # 연차/반차
-                '년차': 8.0,
-                '추가연차': 8.0,
-                '오전반차(탄력근무제)': 4.0,
-                '오후반차(탄력근무제)': 4.0,
-                '2시간 휴가(탄력근무제)': 2.0,
-                '4시간 휴가(선택근무제)': 4.0,
-                '6시간 휴가(선택근무제)': 6.0,
-                '2시간 휴가(선택근무제)': 2.0,
-
-                # 특별휴가
-                '장기근속휴가': 8.0,
-                '공휴일휴무(탄력)': 8.0,
-                '대휴': 8.0,
-                '대휴(오전)': 4.0,
-                '기타휴무': 8.0,
-                '기타결근(연차초과전일)': 8.0,
-                '재택근무': 8.0,
-
-                # 경조휴가
-                '본인결혼': 8.0,
-                '자녀결혼': 8.0,
-                '형제자매결혼': 8.0,
-                '배우자형제자매결혼': 8.0,
-                '부모사망': 8.0,
-                '배우자부모사망': 8.0,
-                '조부모사망': 8.0,
-                '형제자매사망': 8.0,
-                '경조휴가': 8.0,
-                '부모수연': 8.0,
-                '배우자부모수연': 8.0,
-
-                # 출산/육아 휴가
-                '출산전후휴가(유급)': 8.0,
-                '출산전후휴가(무급)': 8.0,
-                '배우자출산휴가': 8.0,
-                '임신기 근로시간 단축': 2.0,  # 하루 2시간 단축
-                '임신기 근로시간 단축(12~31주)': 2.0,
-                '육아기 근로시간 단축(6시간)': 2.0,
-                '육아기 근로시간 단축(5시간)': 3.0,
-
-                # 병가/공가
-                '직무외병결': 8.0,
-                '공가': 8.0,
-                '특별휴가': 8.0,
-
-                # 교육/훈련 (근무 외)
-                '예비군훈련(전일)': 8.0,
-                '종합검진(전일)': 8.0,
-                '예비군/민방위 훈련 후 휴식': 8.0,
-                '공용외출': 8.0,
-            }
-
-            # 근태명별로 휴가시간 설정
-            leave_applied_count = 0
-            for 근태명, 휴가시간 in 휴가_매핑.items():
-                mask = df['근태명'] == 근태명
-                if mask.any():
-                    df.loc[mask, '휴가_연차'] = 휴가시간
-                    leave_applied_count += mask.sum()
-
-            if leave_applied_count > 0:
-                logger.info(f"근태명에서 휴가시간 추출: {leave_applied_count:,}건")
-
-            # 실제근무시간에 휴가시간 합산 (핵심 로직!)
-            # 이렇게 하면 claim_data 테이블에 이미 휴가가 반영된 근무시간이 저장됨
-            if '실제근무시간' in df.columns:
-                original_sum = df['실제근무시간'].sum()
-                df['실제근무시간'] = df['실제근무시간'] + df['휴가_연차']
-                new_sum = df['실제근무시간'].sum()
-                added_hours = new_sum - original_sum
-
-                if added_hours > 0:
-                    logger.info(f"✅ 실제근무시간에 휴가시간 합산 완료: +{added_hours:,.1f}시간 (총 {leave_applied_count:,}건)")
-                    logger.info(f"   예: 년차 = 0h → 8h, 반차 = 6.8h → 10.8h")
-
-            # ✅ AUTOMATION: 출장/교육/파견 처리 (휴가가 아니라 근무)
-            # 출장/교육/파견인데 근무시간이 0인 경우 → 표준 8시간 부여
-            # 출장/교육/파견인데 근무시간이 있는 경우 → 그대로 유지
-            if '실제근무시간' in df.columns:
-                출장교육_근태명 = ['사외교육', '국내출장', '해외출장', '출장', '사외파견']
-
-                trip_fixed_count = 0
-                for 근태명 in 출장교육_근태명:
-                    # 해당 근태명이면서 실제근무시간이 0인 경우
-                    mask = (df['근태명'] == 근태명) & (df['실제근무시간'] == 0)
-                    if mask.any():
-                        df.loc[mask, '실제근무시간'] = 8.0
-                        trip_fixed_count += mask.sum()
-
-                if trip_fixed_count > 0:
-                    logger.info(f"✅ 출장/교육/파견 근무시간 보정 완료: {trip_fixed_count:,}건 (0h → 8h)")
-                    logger.info(f"   예: 사외교육 0h → 8h, 해외출장 11h → 11h, 사외파견 0h → 8h")
-
-        # Convert 시작, 종료 times if present
-        for col in ['시작', '종료']:
-            if col in df.columns:
-                df[col] = df[col].apply(
-                    lambda x: str(x).replace(':', '') if pd.notna(x) and str(x) != '' else None
-                )
-
-        # ✅ ENHANCEMENT: organization_data에서 조직 정보 자동 채우기
-        # 신규 데이터에 조직 정보가 비어있는 경우, 사번으로 조직 마스터에서 가져오기
-        if '사번' in df.columns:
-            try:
-                import sqlite3
-                from pathlib import Path
-
-                # 크로스 플랫폼 경로: 현재 파일 기준 2단계 상위의 sambio_human.db
-                db_path = Path(__file__).parent.parent.parent / "sambio_human.db"
-                if db_path.exists():
-                    conn = sqlite3.connect(str(db_path))
-
-                    # organization_data에서 조직 정보 가져오기
-                    org_df = pd.read_sql_query(
-                        """
-                        SELECT
-                            사번,
-                            성명 as 조직_성명,
-                            직급명 as 조직_직급,
-                            센터 as 조직_센터,
-                            BU as 조직_담당,
-                            팀 as 조직_팀,
-                            그룹 as 조직_그룹,
-                            부서명 as 조직_부서
-                        FROM organization_data
-                        WHERE 재직상태 = '재직'
-                        """,
-                        conn
-                    )
-
-                    # 사번을 문자열로 통일 (타입 불일치 방지)
-                    df['사번'] = df['사번'].astype(str)
-                    org_df['사번'] = org_df['사번'].astype(str)
-
-                    # 조직 정보와 JOIN (left join으로 매칭되지 않는 직원도 유지)
-                    df = df.merge(org_df, on='사번', how='left')
-
-                    # 비어있는 필드만 조직 정보로 채우기
-                    if '성명' in df.columns and '조직_성명' in df.columns:
-                        df['성명'] = df['성명'].fillna(df['조직_성명'])
-                        df = df.drop(columns=['조직_성명'])
-
-                    if '직급' in df.columns and '조직_직급' in df.columns:
-                        df['직급'] = df['직급'].fillna(df['조직_직급'])
-                        df = df.drop(columns=['조직_직급'])
-
-                    # 부서 정보 채우기 (claim_data의 '부서' 컬럼)
-                    if '부서' in df.columns and '조직_부서' in df.columns:
-                        empty_count = df['부서'].isna().sum()
-                        if empty_count > 0:
-                            df['부서'] = df['부서'].fillna(df['조직_부서'])
-                            logger.info(f"조직 정보에서 부서 채움: {empty_count:,}건")
-                        df = df.drop(columns=['조직_부서'])
-
-                    # 센터, 담당, 팀, 그룹 정보도 추가 (claim_data에는 원래 없지만 유용할 수 있음)
-                    # 하지만 claim_data 스키마에 없으므로 제거
-                    for col in ['조직_센터', '조직_담당', '조직_팀', '조직_그룹']:
-                        if col in df.columns:
-                            df = df.drop(columns=[col])
-
-                    matched_count = len(df)
-                    logger.info(f"organization_data에서 조직 정보 매칭 완료: {matched_count:,}건")
-
-                    # ✅ FIX: Set employee_level from 직급 column using grade_level_mapping
-                    # 타입 불일치 방지: 양쪽 컬럼을 문자열로 변환
-                    if '직급' in df.columns:
-                        grade_mapping_df = pd.read_sql_query(
-                            """
-                            SELECT
-                                grade_name,
-                                level as employee_level
-                            FROM grade_level_mapping
-                            """,
-                            conn
-                        )
-
-                        # 타입을 문자열로 통일
-                        df['직급'] = df['직급'].astype(str)
-                        grade_mapping_df['grade_name'] = grade_mapping_df['grade_name'].astype(str)
-
-                        # JOIN
-                        df = df.merge(
-                            grade_mapping_df,
-                            left_on='직급',
-                            right_on='grade_name',
-                            how='left'
-                        )
-
-                        # grade_name 컬럼 제거
-                        if 'grade_name' in df.columns:
-                            df = df.drop(columns=['grade_name'])
-
-                        level_count = df['employee_level'].notna().sum()
-                        total_rows = len(df)
-                        coverage_pct = (level_count / total_rows * 100) if total_rows > 0 else 0
-
-                        logger.info(f"직급에서 employee_level 설정 완료: {level_count:,}/{total_rows:,}행 ({coverage_pct:.1f}%)")
-
-                        if level_count < total_rows:
-                            unmapped_grades = df[df['employee_level'].isna()]['직급'].unique()
-                            if len(unmapped_grades) > 0 and len(unmapped_grades) <= 10:
-                                logger.warning(f"매핑되지 않은 직급: {', '.join(map(str, unmapped_grades))}")
-
-                    conn.close()
-
-                else:
-                    logger.warning("DB 파일 없음 - 조직 정보 자동 채우기 생략")
-
-            except Exception as e:
-                logger.warning(f"조직 정보 자동 채우기 실패: {e}")
-                import traceback
-                logger.warning(traceback.format_exc())
-
-        logger.info(f"claim_data transformation complete: {len(df):,} rows")
-        return df
-
-    @staticmethod
-    def transform_organization_data(df: pd.DataFrame) -> pd.DataFrame:
-        """Transform organization/employee data Excel to DB format"""
-        logger.info("Transforming organization_data...")
-
-        column_map = {
-            '사번': '사번',
-            '이름': '이름',
-            '소속': '소속',
-            '센터': '센터',
-            '담당': '담당',
-            '팀': '팀',
-            '그룹': '그룹',
-            '직급': '직급',
-            '직책': '직책',
-            '재직상태': '재직상태'
+            '출입구분': 'INOUT_GB',
+            # 8월~ 태깅 데이터 (이벤트 로그 형식): _tag_event_log가 나머지를 tag_data 형식으로 변환
+            'EMPLOYEENO': '사번',
+            'EMPLOYEENAME': 'NAME',
+            'DOORNAME': 'DR_NM'
+        },
+        casts={
+            'ENTE_DT': 'date_number',
+            '사번': 'numeric',
+            # ✅ FIX: 출입시각은 이미 HHMMSS 정수 형식 (70553 → 07:05:53)
+            # pandas가 자동으로 datetime으로 변환하지 않도록 명시적으로 정수로 유지
+            '출입시각': 'numeric',
+            'REGDATE': 'datetime_int'
+        },
+        steps=[_tag_event_log],
+        references={'tag_locations': _load_tag_locations},
+        summary=_tag_summary
+    ),
+    # Excel columns: 근무일, 급여요일, 성명, 사번, 부서, 직급, WORKSCHDTYPNM,
+    #               근무시간, 시작, 종료, 제외시간, 근태명, 근태코드
+    # No column mapping needed - DB schema matches Excel structure.
+    # 근무일/근무시간 conversions run once per distinct value, not per row (see _map_distinct)
+    "claim_data": TransformSpec(
+        name="claim_data",
+        employee_columns=['사번'],
+        day_column='근무일',
+        casts={
+            # 'YYYY-MM-DD HH:MM:SS'
+            '근무일': lambda values: _map_distinct(values, _parse_work_date),
+            '사번': 'numeric',
+            # 분 또는 "HH:MM" → 시간 (소수)
+            '근무시간': lambda values: _map_distinct(values, _time_to_hours)
+        },
+        steps=[
+            _claim_work_hours,
+            _claim_actual_hours,
+            _claim_leave_hours,
+            _claim_clock_text,
+            _claim_organization
+        ],
+        references={
+            'organization': _load_organization_references,
+            'attendance_rules': _load_attendance_rules
+        },
+        summary=_claim_summary
+    ),
+    "employees": TransformSpec(
+        name="organization_data",
+        employee_columns=['사번'],
+        casts={'사번': 'numeric'}
+    ),
+    # Excel columns (30 total) match the DB schema exactly, so no column mapping is needed:
+    # NO, 취식일시, 정산일, 식당명, 배식구, 식사가격, 카드번호, 수동입력여부,
+    # 회사코드, 회사, 사원증종류, 카드구분, 기기번호, 사번, Knox ID, 생년월일,
+    # Domain ID, 성명, 사원구분, 사업장 코드, 사업장, 부서, 직책, 식단,
+    # 테이크아웃, 처리일시, 식사대분류, 식사구분명, 취식이벤트, 취식번호
+    "meal_data": TransformSpec(
+        name="meal_data",
+        employee_columns=['사번'],
+        day_column='취식일시',
+        casts={
+            '취식일시': 'datetime',
+            '처리일시': 'datetime',
+            '정산일': 'date',
+            '사번': 'numeric',
+            'NO': 'numeric',
+            '식사가격': 'numeric',
+            '카드번호': 'numeric',
+            'Domain ID': 'numeric',
+            '취식번호': 'numeric'
         }
-
-        df = df.rename(columns=column_map)
-
-        if '사번' in df.columns:
-            df['사번'] = pd.to_numeric(df['사번'], errors='coerce')
-
-        logger.info(f"organization_data transformation complete: {len(df):,} rows")
-        return df
-
-    @staticmethod
-    def transform_meal_data(df: pd.DataFrame) -> pd.DataFrame:
-        """Transform meal_data Excel to DB format
-
-        Excel columns (30 total):
-        NO, 취식일시, 정산일, 식당명, 배식구, 식사가격, 카드번호, 수동입력여부,
-        회사코드, 회사, 사원증종류, 카드구분, 기기번호, 사번, Knox ID, 생년월일,
-        Domain ID, 성명, 사원구분, 사업장 코드, 사업장, 부서, 직책, 식단,
-        테이크아웃, 처리일시, 식사대분류, 식사구분명, 취식이벤트, 취식번호
-
-        These columns match the DB schema exactly, so no column mapping is needed.
-        Just ensure correct data types for timestamp and numeric columns.
-        """
-        logger.info("Transforming meal_data...")
-
-        # No column renaming needed - Excel columns match DB schema exactly
-
-        # Convert timestamp columns to proper format (YYYY-MM-DD HH:MM:SS)
-        for time_col in ['취식일시', '처리일시']:
-            if time_col in df.columns:
-                df[time_col] = pd.to_datetime(df[time_col], errors='coerce')
-                df[time_col] = df[time_col].apply(
-                    lambda x: x.strftime('%Y-%m-%d %H:%M:%S') if pd.notna(x) else None
-                )
-
-        # Convert date column (정산일)
-        if '정산일' in df.columns:
-            df['정산일'] = pd.to_datetime(df['정산일'], errors='coerce')
-            df['정산일'] = df['정산일'].apply(
-                lambda x: x.strftime('%Y-%m-%d') if pd.notna(x) else None
-            )
-
-        # Convert numeric columns
-        if '사번' in df.columns:
-            df['사번'] = pd.to_numeric(df['사번'], errors='coerce')
-
-        if 'NO' in df.columns:
-            df['NO'] = pd.to_numeric(df['NO'], errors='coerce')
-
-        if '식사가격' in df.columns:
-            df['식사가격'] = pd.to_numeric(df['식사가격'], errors='coerce')
-
-        if '카드번호' in df.columns:
-            df['카드번호'] = pd.to_numeric(df['카드번호'], errors='coerce')
-
-        if 'Domain ID' in df.columns:
-            df['Domain ID'] = pd.to_numeric(df['Domain ID'], errors='coerce')
-
-        if '취식번호' in df.columns:
-            df['취식번호'] = pd.to_numeric(df['취식번호'], errors='coerce')
-
-        logger.info(f"meal_data transformation complete: {len(df):,} rows")
-        return df
-
-    @staticmethod
-    def transform_knox_approval_data(df: pd.DataFrame) -> pd.DataFrame:
-        """Transform Knox approval data Excel to DB format"""
-        logger.info("Transforming knox_approval_data...")
-
-        column_map = {
-            '기안일': '기안일',
-            '기안자ID': '기안자ID',
-            '기안자명': '기안자명',
-            '결재구분': '결재구분',
-            '문서번호': '문서번호',
-            '제목': '제목'
-        }
-
-        df = df.rename(columns=column_map)
-
-        # Convert date
-        if '기안일' in df.columns:
-            df['기안일'] = pd.to_datetime(df['기안일'], errors='coerce')
-            df['기안일'] = df['기안일'].apply(
-                lambda x: int(x.strftime('%Y%m%d%H%M%S')) if pd.notna(x) else None
-            )
-
-        logger.info(f"knox_approval_data transformation complete: {len(df):,} rows")
-        return df
-
-    @staticmethod
-    def transform_knox_mail_data(df: pd.DataFrame) -> pd.DataFrame:
-        """Transform Knox mail data Excel to DB format"""
-        logger.info("Transforming knox_mail_data...")
-
-        column_map = {
-            '발송일시': '발송일시',
-            '발송자ID': '발송자ID',
-            '발송자명': '발송자명',
-            '수신자': '수신자',
-            '제목': '제목'
-        }
-
-        df = df.rename(columns=column_map)
-
-        if '발송일시' in df.columns:
-            df['발송일시'] = pd.to_datetime(df['발송일시'], errors='coerce')
-            df['발송일시'] = df['발송일시'].apply(
-                lambda x: int(x.strftime('%Y%m%d%H%M%S')) if pd.notna(x) else None
-            )
-
-        logger.info(f"knox_mail_data transformation complete: {len(df):,} rows")
-        return df
-
-    @staticmethod
-    def transform_knox_pims_data(df: pd.DataFrame) -> pd.DataFrame:
-        """Transform Knox PIMS data Excel to DB format"""
-        logger.info("Transforming knox_pims_data...")
-
-        column_map = {
-            '회의일자': '회의일자',
-            '예약자ID': '예약자ID',
-            '예약자명': '예약자명',
-            '회의실': '회의실',
-            '회의제목': '회의제목'
-        }
-
-        df = df.rename(columns=column_map)
-
-        if '회의일자' in df.columns:
-            df['회의일자'] = pd.to_datetime(df['회의일자'], errors='coerce')
-            df['회의일자'] = df['회의일자'].apply(
-                lambda x: int(x.strftime('%Y%m%d')) if pd.notna(x) else None
-            )
-
-        logger.info(f"knox_pims_data transformation complete: {len(df):,} rows")
-        return df
-
-    @staticmethod
-    def transform_eam_data(df: pd.DataFrame) -> pd.DataFrame:
-        """Transform EAM data Excel to DB format
-
-        Excel columns (new format):
-        - Timestamp: 2025-08-01 00:07:15
-        - USERNO( ID->사번매칭 ): 20200181.0 (float)
-        - Event: "LOGIN"
-        - APP: NaN or app name
-
-        DB columns:
-        - ATTEMPTDATE (TEXT): Timestamp
-        - USERNO (TEXT): USERNO (float → int → str)
-        - ATTEMPTRESULT (TEXT): Event
-        - APP (TEXT): APP
-        """
-        logger.info("Transforming eam_data...")
-
-        # 컬럼명 매핑
-        column_map = {
+    ),
+    "knox_approval": TransformSpec(
+        name="knox_approval_data",
+        employee_columns=['UserNo'],
+        day_column='Timestamp',
+        casts={'기안일': 'datetime_int'}
+    ),
+    "knox_mail": TransformSpec(
+        name="knox_mail_data",
+        employee_columns=['발신인사번_text'],
+        day_column='발신일시_GMT9',
+        casts={'발송일시': 'datetime_int'}
+    ),
+    "knox_pims": TransformSpec(
+        name="knox_pims_data",
+        employee_columns=['employee_id'],
+        day_column='start_time',
+        casts={'회의일자': 'date_int'}
+    ),
+    # Excel (new format): Timestamp 2025-08-01 00:07:15, USERNO( ID->사번매칭 ) 20200181.0,
+    # Event "LOGIN", APP
+    # DB: ATTEMPTDATE (TEXT), USERNO (TEXT, float → int → str), ATTEMPTRESULT (TEXT), APP (TEXT)
+    "eam_data": TransformSpec(
+        name="eam_data",
+        employee_columns=['USERNO'],
+        day_column='ATTEMPTDATE',
+        renames={
             'Timestamp': 'ATTEMPTDATE',
             'USERNO( ID->사번매칭 )': 'USERNO',
-            'Event': 'ATTEMPTRESULT',
-            'APP': 'APP'
+            'Event': 'ATTEMPTRESULT'
+        },
+        casts={
+            'ATTEMPTDATE': 'datetime',
+            'USERNO': _id_text
+        },
+        converters={'USERNO': 'numeric'}
+    ),
+    "equis_data": TransformSpec(
+        name="equis_data",
+        employee_columns=['사번', 'USERNO( ID->사번매칭 )'],
+        day_column='Timestamp',
+        casts={
+            '사용시작일시': 'datetime_int',
+            '사용종료일시': 'datetime_int',
+            '사번': 'numeric'
         }
-
-        df = df.rename(columns=column_map)
-
-        # ATTEMPTDATE를 datetime 문자열로 변환
-        if 'ATTEMPTDATE' in df.columns:
-            df['ATTEMPTDATE'] = pd.to_datetime(df['ATTEMPTDATE'], errors='coerce')
-            df['ATTEMPTDATE'] = df['ATTEMPTDATE'].apply(
-                lambda x: x.strftime('%Y-%m-%d %H:%M:%S') if pd.notna(x) else None
-            )
-
-        # USERNO를 text로 변환 (float → int → str)
-        if 'USERNO' in df.columns:
-            df['USERNO'] = pd.to_numeric(df['USERNO'], errors='coerce')
-            df['USERNO'] = df['USERNO'].apply(
-                lambda x: str(int(x)) if pd.notna(x) else None
-            )
-
-        logger.info(f"eam_data transformation complete: {len(df):,} rows")
-        return df
-
-    @staticmethod
-    def transform_equis_data(df: pd.DataFrame) -> pd.DataFrame:
-        """Transform Equis data Excel to DB format"""
-        logger.info("Transforming equis_data...")
-
-        column_map = {
-            '사용시작일시': '사용시작일시',
-            '사용종료일시': '사용종료일시',
-            '사번': '사번',
-            '이름': '이름',
-            '장비명': '장비명',
-            '장비코드': '장비코드'
-        }
-
-        df = df.rename(columns=column_map)
-
-        # Convert timestamps
-        for col in ['사용시작일시', '사용종료일시']:
-            if col in df.columns:
-                df[col] = pd.to_datetime(df[col], errors='coerce')
-                df[col] = df[col].apply(
-                    lambda x: int(x.strftime('%Y%m%d%H%M%S')) if pd.notna(x) else None
-                )
-
-        if '사번' in df.columns:
-            df['사번'] = pd.to_numeric(df['사번'], errors='coerce')
-
-        logger.info(f"equis_data transformation complete: {len(df):,} rows")
-        return df
-
-    @staticmethod
-    def transform_lams_data(df: pd.DataFrame) -> pd.DataFrame:
-        """Transform LAMS data Excel to DB format
-
-        Excel columns (new format):
-        - Timestamp: 2025-08-01 00:00:00.000
-        - USERNO( ID->사번매칭 ): 20190146.0 (float)
-        - Event: "Create", "Modify"
-
-        DB columns:
-        - User_No (REAL): USERNO (float)
-        - DATE (TEXT): Timestamp
-        - Task (TEXT): Event (소문자)
-        """
-        logger.info("Transforming lams_data...")
-
-        # 컬럼명 매핑
-        column_map = {
+    ),
+    # Excel (new format): Timestamp 2025-08-01 00:00:00.000, USERNO( ID->사번매칭 ) 20190146.0,
+    # Event "Create", "Modify"
+    # DB: User_No (REAL), DATE (TEXT), Task (TEXT, 소문자)
+    "lams_data": TransformSpec(
+        name="lams_data",
+        employee_columns=['User_No'],
+        day_column='DATE',
+        renames={
             'Timestamp': 'DATE',
             'USERNO( ID->사번매칭 )': 'User_No',
             'Event': 'Task'
+        },
+        casts={
+            'DATE': 'datetime',
+            'User_No': 'numeric',
+            'Task': 'lower'
         }
-
-        df = df.rename(columns=column_map)
-
-        # DATE를 datetime 문자열로 변환
-        if 'DATE' in df.columns:
-            df['DATE'] = pd.to_datetime(df['DATE'], errors='coerce')
-            df['DATE'] = df['DATE'].apply(
-                lambda x: x.strftime('%Y-%m-%d %H:%M:%S') if pd.notna(x) else None
-            )
-
-        # User_No는 float로 유지 (DB 컬럼이 REAL)
-        if 'User_No' in df.columns:
-            df['User_No'] = pd.to_numeric(df['User_No'], errors='coerce')
-
-        # Task를 소문자로 변환
-        if 'Task' in df.columns:
-            df['Task'] = df['Task'].str.lower()
-
-        logger.info(f"lams_data transformation complete: {len(df):,} rows")
-        return df
-
-    @staticmethod
-    def transform_mes_data(df: pd.DataFrame) -> pd.DataFrame:
-        """Transform MES data Excel to DB format
-
-        Excel columns (new format):
-        - Unnamed: 0 (index, empty)
-        - DATETIME (KST): 2025-08-01 00:00:04
-        - 사번: 20240562
-        - APPLICATION: "SBL CEM"
-
-        DB columns:
-        - session (TEXT): APPLICATION 값
-        - login_time (TIMESTAMP): DATETIME (KST)
-        - USERNo (INTEGER): 사번
-        """
-        logger.info("Transforming mes_data...")
-
-        # 컬럼명 매핑
-        column_map = {
+    ),
+    # Excel (new format): Unnamed: 0 (index, empty), DATETIME (KST) 2025-08-01 00:00:04,
+    # 사번 20240562, APPLICATION "SBL CEM"
+    # DB: session (TEXT), login_time (TIMESTAMP), USERNo (INTEGER)
+    "mes_data": TransformSpec(
+        name="mes_data",
+        employee_columns=['USERNo'],
+        day_column='login_time',
+        renames={
             'DATETIME (KST)': 'login_time',
             '사번': 'USERNo',
             'APPLICATION': 'session'
-        }
-
-        # Unnamed 컬럼 제거
-        df = df.drop(columns=[col for col in df.columns if 'Unnamed' in str(col)], errors='ignore')
-
-        df = df.rename(columns=column_map)
-
-        # login_time을 datetime 형식으로 변환 (문자열 형식 유지)
-        if 'login_time' in df.columns:
-            df['login_time'] = pd.to_datetime(df['login_time'], errors='coerce')
-            df['login_time'] = df['login_time'].apply(
-                lambda x: x.strftime('%Y-%m-%d %H:%M:%S') if pd.notna(x) else None
-            )
-
-        # USERNo를 integer로 변환
-        if 'USERNo' in df.columns:
-            df['USERNo'] = pd.to_numeric(df['USERNo'], errors='coerce')
-
-        logger.info(f"mes_data transformation complete: {len(df):,} rows")
-        return df
-
-    @staticmethod
-    def transform_mdm_data(df: pd.DataFrame) -> pd.DataFrame:
-        """Transform MDM data Excel to DB format
-
-        Excel columns (new format):
-        - Client: 2025-08-01 06:10:50
-        - 사번: 20240616
-        - Audit Log Msg. Text: "Logon failed "
-
-        DB columns:
-        - UserNo (INTEGER): 사번
-        - Timestap (TIMESTAMP): Client (datetime string)
-        - task (TEXT): Audit Log Msg. Text (stripped)
-        """
-        logger.info("Transforming mdm_data...")
-
-        # 컬럼명 매핑
-        column_map = {
+        },
+        casts={
+            'login_time': 'datetime',
+            'USERNo': 'numeric'
+        },
+        drop_unnamed=True
+    ),
+    # Excel (new format): Client 2025-08-01 06:10:50, 사번 20240616,
+    # Audit Log Msg. Text "Logon failed "
+    # DB: UserNo (INTEGER), Timestap (TIMESTAMP), task (TEXT, stripped)
+    "mdm_data": TransformSpec(
+        name="mdm_data",
+        employee_columns=['UserNo'],
+        day_column='Timestap',
+        renames={
             'Client': 'Timestap',
             '사번': 'UserNo',
             'Audit Log Msg. Text': 'task'
+        },
+        casts={
+            'Timestap': 'datetime',
+            'UserNo': 'numeric',
+            'task': 'strip'
         }
-
-        df = df.rename(columns=column_map)
-
-        # Timestap을 datetime 문자열로 변환
-        if 'Timestap' in df.columns:
-            df['Timestap'] = pd.to_datetime(df['Timestap'], errors='coerce')
-            df['Timestap'] = df['Timestap'].apply(
-                lambda x: x.strftime('%Y-%m-%d %H:%M:%S') if pd.notna(x) else None
-            )
-
-        # UserNo를 integer로 변환
-        if 'UserNo' in df.columns:
-            df['UserNo'] = pd.to_numeric(df['UserNo'], errors='coerce')
-
-        # task 텍스트 정리 (앞뒤 공백 제거)
-        if 'task' in df.columns:
-            df['task'] = df['task'].str.strip()
-
-        logger.info(f"mdm_data transformation complete: {len(df):,} rows")
-        return df
-
-    @staticmethod
-    def transform_lims_data(df: pd.DataFrame) -> pd.DataFrame:
-        """Transform LIMS data Excel to DB format
-
-        Excel columns:
-        - timestamp: 2025-08-01 09:00:02.337
-        - userno: 20250454
-        - event: "Edit", "Create"
-
-        DB columns:
-        - User_No (REAL): userno
-        - DATE (TEXT): timestamp (datetime string)
-        - Task (TEXT): event (lowercase)
-        """
-        logger.info("Transforming lims_data...")
-
-        # 컬럼명 매핑
-        column_map = {
+    ),
+    # Excel: timestamp 2025-08-01 09:00:02.337, userno 20250454, event "Edit", "Create"
+    # DB: User_No (REAL), DATE (TEXT), Task (TEXT, lowercase)
+    "lims_data": TransformSpec(
+        name="lims_data",
+        employee_columns=['User_No'],
+        day_column='DATE',
+        renames={
             'timestamp': 'DATE',
             'userno': 'User_No',
             'event': 'Task'
+        },
+        casts={
+            'DATE': 'datetime',
+            'User_No': 'numeric',
+            'Task': 'lower'
         }
-
-        df = df.rename(columns=column_map)
-
-        # DATE를 datetime 문자열로 변환
-        if 'DATE' in df.columns:
-            df['DATE'] = pd.to_datetime(df['DATE'], errors='coerce')
-            df['DATE'] = df['DATE'].apply(
-                lambda x: x.strftime('%Y-%m-%d %H:%M:%S') if pd.notna(x) else None
-            )
-
-        # User_No는 float로 변환 (DB 컬럼이 REAL)
-        if 'User_No' in df.columns:
-            df['User_No'] = pd.to_numeric(df['User_No'], errors='coerce')
-
-        # Task를 소문자로 변환
-        if 'Task' in df.columns:
-            df['Task'] = df['Task'].str.lower()
-
-        logger.info(f"lims_data transformation complete: {len(df):,} rows")
-        return df
-
-    @staticmethod
-    def transform_tag_data_aug(df: pd.DataFrame) -> pd.DataFrame:
-        """Transform Tag Data (August-October format) Excel to DB format
-
-        Excel columns:
-        - REGDATE, EVENTLOGSEQ, EMPLOYEENAME, CARDNO, EMPLOYEENO,
-          COMPANYCD, CARDTYPE, DOORNAME, EQUIPNO, DOMAINID,
-          EVENTSTATUSCODE, PROCDATE, BICD
-
-        DB columns (tag_data_aug):
-        - Same as Excel columns, minimal transformation
-        """
-        logger.info("Transforming tag_data_aug...")
-
-        # Unnamed 컬럼 제거
-        df = df.drop(columns=[col for col in df.columns if 'Unnamed' in str(col)], errors='ignore')
-
-        # EMPLOYEENO를 integer로 변환 (NaN은 그대로)
-        if 'EMPLOYEENO' in df.columns:
-            df['EMPLOYEENO'] = pd.to_numeric(df['EMPLOYEENO'], errors='coerce')
-            df['EMPLOYEENO'] = df['EMPLOYEENO'].apply(
-                lambda x: int(x) if pd.notna(x) else None
-            )
-
-        # REGDATE와 PROCDATE를 문자열로 변환
-        for col in ['REGDATE', 'PROCDATE']:
-            if col in df.columns:
-                df[col] = df[col].astype(str)
-
-        logger.info(f"tag_data_aug transformation complete: {len(df):,} rows")
-        return df
-
+    ),
+    # Tag Data (August-October format), same columns as tag_data_aug:
+    # REGDATE, EVENTLOGSEQ, EMPLOYEENAME, CARDNO, EMPLOYEENO, COMPANYCD, CARDTYPE,
+    # DOORNAME, EQUIPNO, DOMAINID, EVENTSTATUSCODE, PROCDATE, BICD
+    # Legacy raw copy: the tag_data transformer maps these files into tag_data directly.
+    # No emp_key: tag_data_aug is not a keyed table (see core/migrations.py)
+    "tag_data_aug": TransformSpec(
+        name="tag_data_aug",
+        casts={
+            'EMPLOYEENO': _whole_number,
+            'REGDATE': 'text',
+            'PROCDATE': 'text'
+        },
+        converters={'EMPLOYEENO': 'numeric'},
+        drop_unnamed=True
+    ),
+}
 
 # Registry of transformation functions
 TRANSFORM_FUNCTIONS: Dict[str, Callable[[pd.DataFrame], pd.DataFrame]] = {
-    "tag_data": DataTransformers.transform_tag_data,
-    "claim_data": DataTransformers.transform_claim_data,
-    "employees": DataTransformers.transform_organization_data,
-    "meal_data": DataTransformers.transform_meal_data,
-    "knox_approval": DataTransformers.transform_knox_approval_data,
-    "knox_mail": DataTransformers.transform_knox_mail_data,
-    "knox_pims": DataTransformers.transform_knox_pims_data,
-    "eam_data": DataTransformers.transform_eam_data,
-    "equis_data": DataTransformers.transform_equis_data,
-    "lams_data": DataTransformers.transform_lams_data,
-    "mes_data": DataTransformers.transform_mes_data,
-    "mdm_data": DataTransformers.transform_mdm_data,
-    "lims_data": DataTransformers.transform_lims_data,
-    "tag_data_aug": DataTransformers.transform_tag_data_aug,
+    data_type: compile_spec(spec) for data_type, spec in TRANSFORM_SPECS.items()
 }
 
 
+class DataTransformers:
+    """Transformation functions for each data type (compiled from TRANSFORM_SPECS)"""
+
+    transform_tag_data = staticmethod(TRANSFORM_FUNCTIONS["tag_data"])
+    transform_claim_data = staticmethod(TRANSFORM_FUNCTIONS["claim_data"])
+    transform_organization_data = staticmethod(TRANSFORM_FUNCTIONS["employees"])
+    transform_meal_data = staticmethod(TRANSFORM_FUNCTIONS["meal_data"])
+    transform_knox_approval_data = staticmethod(TRANSFORM_FUNCTIONS["knox_approval"])
+    transform_knox_mail_data = staticmethod(TRANSFORM_FUNCTIONS["knox_mail"])
+    transform_knox_pims_data = staticmethod(TRANSFORM_FUNCTIONS["knox_pims"])
+    transform_eam_data = staticmethod(TRANSFORM_FUNCTIONS["eam_data"])
+    transform_equis_data = staticmethod(TRANSFORM_FUNCTIONS["equis_data"])
+    transform_lams_data = staticmethod(TRANSFORM_FUNCTIONS["lams_data"])
+    transform_mes_data = staticmethod(TRANSFORM_FUNCTIONS["mes_data"])
+    transform_mdm_data = staticmethod(TRANSFORM_FUNCTIONS["mdm_data"])
+    transform_lims_data = staticmethod(TRANSFORM_FUNCTIONS["lims_data"])
+    transform_tag_data_aug = staticmethod(TRANSFORM_FUNCTIONS["tag_data_aug"])
+
+
 def get_transformer(data_type: str) -> Callable[[pd.DataFrame], pd.DataFrame]:
     """Get transformation function for a data type"""
     if data_type not in TRANSFORM_FUNCTIONS:
         raise ValueError(f"No transformer found for data type: {data_type}")
     return TRANSFORM_FUNCTIONS[data_type]
+
+
+def get_chunk_transformer(data_type: str, workers: Optional[int] = None) -> ChunkTransformer:
+    """
+    New streaming transformer for one upload of a data type
+
+    Call setup() before the first chunk, transform_chunk() per chunk and
+    finalize() after the last one.
+
+    Args:
+        data_type: Registered data type
+        workers: Worker processes to shard large frames across
+                 (None = TRANSFORM_WORKERS env, 1 = in-process)
+    """
+    if data_type not in TRANSFORM_SPECS:
+        raise ValueError(f"No transformer found for data type: {data_type}")
+
+    from handlers.sharded_transform import ShardedTransformer, transform_workers
+
+    workers = transform_workers() if workers is None else workers
+    if workers > 1:
+        return ShardedTransformer(data_type, TRANSFORM_SPECS[data_type], workers)
+    return ChunkTransformer(TRANSFORM_SPECS[data_type])
@@ -0,0 +1,170 @@
+"""
+Process-pool sharded transformation for very large frames
+
+ShardedTransformer splits each frame (a whole loaded file or one chunk of the
+stream) into contiguous row shards and runs the data type's transformer on
+them in worker processes, so a 12M-row tag_data month uses every core.
+
+- Reference tables are loaded once in the parent and shipped to each worker
+  once, through the pool initializer.
+- Shards and results cross the process boundary as Arrow IPC streams (one
+  bytes payload per shard, no per-object pickling). Mixed-type object columns
+  round-trip via frame_to_table; pyarrow missing means pickled frames.
+- Results are reassembled in the original row order, and the workers'
+  aggregate counts are merged so finalize() logs upload-wide totals.
+
+Enable with TRANSFORM_WORKERS (default 1 = transform in-process).
+"""
+import logging
+import os
+import pickle
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from core.staging_cache import frame_from_table, frame_to_table, parquet_available
+from handlers.transform_specs import ChunkTransformer, TransformSpec
+from utils.memory import align_categories
+
+logger = logging.getLogger(__name__)
+
+# Frames are only sharded into pieces of at least this many rows
+# (smaller shards cost more in serialization than they save)
+MIN_SHARD_ROWS = 100_000
+
+# Transformer of the data type in each worker process (set by _init_worker)
+_worker_transformer: Optional[ChunkTransformer] = None
+
+
+def transform_workers() -> int:
+    """Configured transform worker processes (TRANSFORM_WORKERS env, 1 = no sharding)"""
+    return max(1, int(os.getenv("TRANSFORM_WORKERS", "1")))
+
+
+def _dump_frame(df: pd.DataFrame) -> Tuple[bytes, Any]:
+    """Serialize a frame as an Arrow IPC stream (pickle without pyarrow); the index is dropped"""
+    if not parquet_available():
+        return pickle.dumps(df.reset_index(drop=True), protocol=pickle.HIGHEST_PROTOCOL), None
+
+    import pyarrow as pa
+
+    table, columns = frame_to_table(df)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes(), columns
+
+
+def _load_frame(payload: bytes, columns: Any) -> pd.DataFrame:
+    """Inverse of _dump_frame"""
+    if columns is None:
+        return pickle.loads(payload)
+
+    import pyarrow as pa
+
+    return frame_from_table(pa.ipc.open_stream(payload).read_all(), columns)
+
+
+def _init_worker(data_type: str, references: Dict[str, Any]) -> None:
+    """Pool initializer: set up the data type's transformer with the shipped reference tables"""
+    from handlers.data_transformers import TRANSFORM_SPECS
+
+    global _worker_transformer
+    _worker_transformer = ChunkTransformer(TRANSFORM_SPECS[data_type])
+    _worker_transformer.setup(references)
+
+
+def _transform_shard(payload: bytes, columns: Any, start: int) -> tuple:
+    """
+    Transform one shard (rows start.. of the frame) in a worker process
+
+    Returns:
+        (result payload, result columns, index kept, counts, distinct values)
+        of this shard only
+    """
+    shard = _load_frame(payload, columns)
+    shard.index = pd.RangeIndex(start, start + len(shard))
+    result = _worker_transformer.transform_chunk(shard)
+
+    # Hand this shard's aggregates to the parent and start the next shard from zero
+    context = _worker_transformer.context
+    stats, seen = context.stats, context.seen
+    context.stats, context.seen = Counter(), {}
+
+    # Steps that merge (claim_data) renumber the rows like they do on a whole frame
+    index_kept = result.index.equals(shard.index)
+    return (*_dump_frame(result), index_kept, dict(stats), seen)
+
+
+class ShardedTransformer(ChunkTransformer):
+    """
+    ChunkTransformer that shards large frames across a process pool
+
+    Same setup / transform_chunk / finalize protocol; frames shorter than
+    two shards, and any frame after the pool fails, are transformed in-process.
+    """
+
+    def __init__(self, data_type: str, spec: TransformSpec, workers: int):
+        super().__init__(spec)
+        self.data_type = data_type
+        self.workers = workers
+        self.executor: Optional[ProcessPoolExecutor] = None
+
+    def setup(self, references: Optional[Dict[str, Any]] = None) -> None:
+        super().setup(references)
+        try:
+            self.executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(self.data_type, self.context.references)
+            )
+            logger.info(f"Sharding {self.spec.name} transforms across {self.workers} worker processes")
+        except (OSError, ValueError) as e:
+            logger.warning(f"Transform worker pool unavailable ({e}), transforming in-process")
+            self.executor = None
+
+    def transform_chunk(self, df: pd.DataFrame) -> pd.DataFrame:
+        shard_count = min(self.workers, len(df) // MIN_SHARD_ROWS)
+        if self.context is None:
+            self.setup()
+        if self.executor is None or shard_count < 2:
+            return super().transform_chunk(df)
+
+        bounds = np.linspace(0, len(df), shard_count + 1).astype(int)
+        try:
+            futures = [
+                self.executor.submit(_transform_shard, *_dump_frame(df.iloc[start:end]), int(start))
+                for start, end in zip(bounds[:-1], bounds[1:])
+            ]
+            results = [future.result() for future in futures]
+        except (BrokenProcessPool, OSError) as e:
+            logger.warning(f"Transform worker pool failed ({e}), transforming in-process")
+            self._shutdown()
+            return super().transform_chunk(df)
+
+        parts: List[pd.DataFrame] = []
+        index_kept = True
+        for payload, columns, kept, stats, seen in results:
+            parts.append(_load_frame(payload, columns))
+            index_kept = index_kept and kept
+            self.context.stats.update(stats)
+            for key, values in seen.items():
+                self.context.seen.setdefault(key, set()).update(values)
+
+        result = pd.concat(align_categories(parts), ignore_index=True)
+        if index_kept:
+            result.index = df.index
+        return result
+
+    def finalize(self) -> Counter:
+        self._shutdown()
+        return super().finalize()
+
+    def _shutdown(self) -> None:
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
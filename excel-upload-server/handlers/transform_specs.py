@@ -0,0 +1,255 @@
+"""
+Declarative transform specs compiled into streaming DataFrame transformers
+
+A TransformSpec lists what a data type's transformer does to a loaded frame:
+column renames, per-column casts (by output name), dropped "Unnamed" columns
+and business-rule steps that need several columns. ChunkTransformer runs a
+spec in three phases so uploads can stream chunk by chunk:
+
+- setup:           load reference tables once (e.g. organization_data)
+- transform_chunk: one pass over a chunk's source columns, assembling the
+                   output frame from them (columns without a cast are passed
+                   through uncopied), then the steps with the shared context,
+                   then the canonical emp_key and day_key columns
+                   (utils/employee_keys.py, utils/day_keys.py)
+- finalize:        log aggregate counts collected by the steps over all chunks
+
+compile_spec wraps the three phases into a whole-frame function.
+
+Specs are plain data, so the loader can derive a parse-time ReadSchema from
+them (TransformSpec.read_schema): casts that start with a numeric or datetime
+parse are pushed down to the reader.
+"""
+import logging
+from collections import Counter
+from typing import Any, Callable, Dict, List, Literal, Optional, Set, Union
+
+import pandas as pd
+from pydantic import BaseModel
+
+from models.data_types import ReadSchema
+from utils.day_keys import DAY_KEY, day_key
+from utils.employee_keys import EMP_KEY, employee_key
+from utils.timestamps import date_int, datetime_int, format_date, format_datetime
+
+logger = logging.getLogger(__name__)
+
+Transform = Callable[[pd.DataFrame], pd.DataFrame]
+Cast = Callable[[pd.Series], pd.Series]
+
+
+class TransformContext:
+    """
+    State of one upload shared by all of its chunks
+
+    references: Reference tables loaded once in setup (name -> value)
+    stats: Aggregate counts added by the steps, logged at finalize
+    seen: Distinct values collected by the steps (e.g. unmapped grades)
+    """
+
+    def __init__(self, references: Dict[str, Any]):
+        self.references = references
+        self.stats: Counter = Counter()
+        self.seen: Dict[str, Set[Any]] = {}
+
+
+Step = Callable[[pd.DataFrame, TransformContext], pd.DataFrame]
+
+# Named column casts:
+# - numeric:      pd.to_numeric (unparseable -> NaN)
+# - date_number:  '2025-08-01' / 20250801 -> 20250801 (dashes removed, then numeric)
+# - text:         astype(str)
+# - lower/strip:  string methods
+# - datetime/date/date_int/datetime_int: utils.timestamps formatters
+CastKind = Literal[
+    "numeric", "date_number", "text", "lower", "strip",
+    "datetime", "date", "date_int", "datetime_int"
+]
+
+
+def _numeric(values: pd.Series) -> pd.Series:
+    return pd.to_numeric(values, errors='coerce')
+
+
+def _date_number(values: pd.Series) -> pd.Series:
+    if values.dtype.kind in 'iuf':
+        # Already numbers: no text round trip needed
+        return pd.to_numeric(values, errors='coerce')
+    return pd.to_numeric(values.astype(str).str.replace('-', ''), errors='coerce')
+
+
+CASTS: Dict[str, Cast] = {
+    "numeric": _numeric,
+    "date_number": _date_number,
+    "text": lambda values: values.astype(str),
+    "lower": lambda values: values.str.lower(),
+    "strip": lambda values: values.str.strip(),
+    "datetime": format_datetime,
+    "date": format_date,
+    "date_int": date_int,
+    "datetime_int": datetime_int,
+}
+
+# Read-schema converter implied by each cast (parsing first does not change the cast result)
+CAST_CONVERTERS: Dict[str, str] = {
+    "numeric": "numeric",
+    "datetime": "datetime",
+    "date": "datetime",
+    "date_int": "datetime",
+    "datetime_int": "datetime",
+}
+
+
+class TransformSpec(BaseModel):
+    """
+    Declarative transformer of one data type
+
+    name: Label used in log messages (e.g. "organization_data")
+    renames: Source column -> DB column
+    casts: DB column -> cast kind (see CastKind) or a Series -> Series function
+    drop_unnamed: Drop "Unnamed: n" columns (index columns of exported sheets)
+    steps: (frame, context) -> frame business rules run after renames and casts,
+           in order; they must be row-local so chunks can be transformed separately
+    references: Reference table loaders, called once per upload in setup
+    summary: Logs the aggregate context.stats at finalize
+    converters: Parse-time converters of columns converted by custom casts
+                (merged into read_schema)
+    employee_columns: DB columns holding the employee number; the first one
+                      present is normalized into an emp_key column
+    day_column: DB date column normalized into a day_key column (YYYYMMDD)
+    """
+    name: str
+    renames: Dict[str, str] = {}
+    casts: Dict[str, Union[CastKind, Cast]] = {}
+    drop_unnamed: bool = False
+    steps: List[Step] = []
+    references: Dict[str, Callable[[], Any]] = {}
+    summary: Optional[Callable[[TransformContext], None]] = None
+    converters: Dict[str, Literal["numeric", "datetime"]] = {}
+    employee_columns: List[str] = []
+    day_column: Optional[str] = None
+
+    def source_names(self, column: str) -> List[str]:
+        """Source columns that end up as a DB column (the column itself included)"""
+        return [column] + [source for source, target in self.renames.items() if target == column and source != column]
+
+    def read_schema(self) -> ReadSchema:
+        """
+        Parse-time schema implied by the casts
+
+        Only converters are declared: the spec does not know every stored
+        column, so nothing is projected away and columns without a converter
+        keep the loader's type inference.
+        """
+        converters = dict(self.converters)
+        for column, cast in self.casts.items():
+            if isinstance(cast, str) and cast in CAST_CONVERTERS:
+                converters.setdefault(column, CAST_CONVERTERS[cast])
+
+        return ReadSchema(
+            converters={source: kind for column, kind in converters.items() for source in self.source_names(column)},
+            infer_numeric=True
+        )
+
+
+def _first_column(df: pd.DataFrame, name: str) -> pd.Series:
+    """Column of a frame by name (the first one if the name is duplicated)"""
+    values = df[name]
+    return values.iloc[:, 0] if isinstance(values, pd.DataFrame) else values
+
+
+class ChunkTransformer:
+    """
+    Streaming transformer of one data type (one instance per upload)
+
+    Usage:
+        transformer.setup()
+        for chunk in chunks:
+            insert(transformer.transform_chunk(chunk))
+        transformer.finalize()
+    """
+
+    def __init__(self, spec: TransformSpec):
+        self.spec = spec
+        self.casts = {column: CASTS[cast] if isinstance(cast, str) else cast for column, cast in spec.casts.items()}
+        self.context: Optional[TransformContext] = None
+
+    def setup(self, references: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Load the reference tables and reset the aggregate counts
+
+        Args:
+            references: Reference tables loaded elsewhere (e.g. shipped to a
+                        worker process); None = call the spec's loaders
+        """
+        logger.info(f"Transforming {self.spec.name}...")
+        if references is None:
+            references = {name: load() for name, load in self.spec.references.items()}
+        self.context = TransformContext(references)
+
+    def transform_chunk(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Transform one chunk (the input frame is not modified)"""
+        if self.context is None:
+            self.setup()
+
+        names, columns = [], []
+        for position, source in enumerate(df.columns):
+            if self.spec.drop_unnamed and 'Unnamed' in str(source):
+                continue
+            name = self.spec.renames.get(source, source)
+            values = df.iloc[:, position]
+            cast = self.casts.get(name)
+            names.append(name)
+            columns.append(cast(values) if cast is not None else values)
+
+        # One new frame over the (cast) columns; duplicate names are kept like rename() would
+        result = pd.DataFrame(dict(enumerate(columns)), index=df.index, copy=False)
+        result.columns = names
+
+        for step in self.spec.steps:
+            result = step(result, self.context)
+
+        column = next((column for column in self.spec.employee_columns if column in result.columns), None)
+        if column is not None:
+            result[EMP_KEY] = employee_key(_first_column(result, column))
+        if self.spec.day_column is not None and self.spec.day_column in result.columns:
+            result[DAY_KEY] = day_key(_first_column(result, self.spec.day_column))
+
+        self.context.stats['rows'] += len(result)
+        return result
+
+    def finalize(self) -> Counter:
+        """
+        Log the aggregate counts of all chunks
+
+        Returns:
+            The aggregate counts (context.stats)
+        """
+        if self.context is None:
+            self.setup()
+        context, self.context = self.context, None
+
+        if self.spec.summary is not None:
+            self.spec.summary(context)
+        logger.info(f"{self.spec.name} transformation complete: {context.stats['rows']:,} rows")
+        return context.stats
+
+
+def compile_spec(spec: TransformSpec) -> Transform:
+    """
+    Compile a spec into a whole-frame DataFrame -> DataFrame transform
+
+    The frame is transformed as a single chunk. The transform never modifies
+    its input frame.
+    """
+    def transform(df: pd.DataFrame) -> pd.DataFrame:
+        transformer = ChunkTransformer(spec)
+        transformer.setup()
+        result = transformer.transform_chunk(df)
+        transformer.finalize()
+        return result
+
+    transform.__name__ = f"transform_{spec.name}"
+    transform.__doc__ = f"Transform {spec.name} Excel to DB format (compiled from its TransformSpec)"
+    transform.spec = spec
+    return transform
@@ -2,20 +2,25 @@
 FastAPI Server for Excel Data Upload
 On-Demand server spawned by Next.js
 """
-from fastapi import FastAPI, UploadFile, File, HTTPException, BackgroundTasks
+from fastapi import FastAPI, UploadFile, File, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import JSONResponse
 from pathlib import Path
 import logging
-import tempfile
 import uvicorn
 from typing import List
+import multiprocessing
 import os
 
-from models.data_types import DATA_TYPES, UploadStatus, DataStats
-from core.db_manager import DatabaseManager
-from core.excel_loader import ExcelLoader
-from handlers.data_transformers import get_transformer
+from models.data_types import DATA_TYPES, DataStats, UploadJob
+from core.db_manager import DatabaseManager, rebuild_indexes_enabled
+from core.excel_loader import SUPPORTED_EXTENSIONS, ExcelLoader
+from core.reference_cache import reference_cache_for_db
+from core.staging_cache import staging_cache_for_db
+from core.upload_jobs import UploadJobQueue
+from handlers.data_transformers import get_chunk_transformer
+from utils.uploads import copy_to_temp_file
 
 # Logging setup
 logging.basicConfig(
@@ -43,10 +48,8 @@ app.add_middleware(
 # Database path (relative to project root)
 DB_PATH = Path(__file__).parent.parent / "sambio_human.db"
 db_manager = DatabaseManager(str(DB_PATH))
-excel_loader = ExcelLoader()
-
-# Upload progress tracking
-upload_progress = {}
+excel_loader = ExcelLoader(staging_cache=staging_cache_for_db(DB_PATH))
+reference_cache = reference_cache_for_db(DB_PATH)
 
 
 @app.get("/")
@@ -83,7 +86,9 @@ async def get_database_stats():
     stats_list = []
 
     for data_type_id, data_type_info in DATA_TYPES.items():
-        table_stats = db_manager.get_table_stats(
+        # Read pool connection in a worker thread: answers while an upload writes
+        table_stats = await run_in_threadpool(
+            db_manager.get_table_stats,
             data_type_info.table_name,
             data_type_info.date_column
         )
@@ -106,7 +111,8 @@ async def get_data_type_stats(data_type: str):
         raise HTTPException(status_code=404, detail=f"Data type not found: {data_type}")
 
     data_type_info = DATA_TYPES[data_type]
-    table_stats = db_manager.get_table_stats(
+    table_stats = await run_in_threadpool(
+        db_manager.get_table_stats,
         data_type_info.table_name,
         data_type_info.date_column
     )
@@ -120,35 +126,109 @@ async def get_data_type_stats(data_type: str):
     )
 
 
+@app.get("/api/health/db")
+async def get_database_health():
+    """Journal mode, WAL size against its cap and the last checkpoint"""
+    return await run_in_threadpool(db_manager.wal_health)
+
+
+@app.get("/api/reference-cache")
+async def get_reference_cache_stats():
+    """Reference data cache metrics (hits, misses, reloads, invalidations) and loaded entries"""
+    return reference_cache.stats()
+
+
+def _job_response(job: UploadJob) -> dict:
+    """Job state returned by the progress endpoints (without server-side paths)"""
+    return job.model_dump(exclude={"file_path", "file_hash"})
+
+
 @app.get("/api/upload/progress/{upload_id}")
 async def get_upload_progress(upload_id: str):
     """Get upload progress for a specific upload ID"""
-    if upload_id in upload_progress:
-        progress_data = upload_progress[upload_id]
-        return {
-            "upload_id": upload_id,
-            "file_name": progress_data.file_name,
-            "data_type": progress_data.data_type,
-            "total_rows": progress_data.total_rows,
-            "processed_rows": progress_data.processed_rows,
-            "progress": progress_data.progress,
-            "status": progress_data.status,
-            "message": progress_data.message,
-            "error": progress_data.error if hasattr(progress_data, 'error') else None
-        }
-    else:
+    job = await run_in_threadpool(upload_jobs.get, upload_id)
+    if job is None:
         raise HTTPException(status_code=404, detail=f"Upload ID not found: {upload_id}")
+    return _job_response(job)
 
 
-@app.post("/api/upload/{data_type}")
+def run_upload(job: UploadJob, report) -> int:
+    """
+    Load, transform and insert one uploaded file (runs in an upload worker thread)
+
+    Args:
+        job: The upload job (file_path, data_type, ...)
+        report: report(**fields) publishes progress fields of the job
+
+    Returns:
+        Rows inserted
+    """
+    temp_path = Path(job.file_path)
+
+    # Exact row count from the workbook index, before any parsing
+    file_info = excel_loader.get_excel_info(temp_path)
+    if file_info.get("total_rows"):
+        report(total_rows=file_info["total_rows"])
+        logger.info(f"Rows to load: {file_info['total_rows']:,} ({file_info['sheet_count']} sheets)")
+
+    # Pick whole-frame / spill / chunked loading from the estimated memory footprint
+    plan = excel_loader.plan_load(temp_path, data_type=job.data_type)
+
+    # Load, transform and insert one frame (file, sheet or chunk) at a time
+    report(message=f"Loading Excel file ({plan.strategy})...")
+    # Reference tables are loaded once; aggregate transform counts are logged at finalize
+    transformer = get_chunk_transformer(job.data_type)
+    transformer.setup()
+    rows_inserted = 0
+
+    # Rows above this rowid are deleted if the upload fails (see UploadJobQueue)
+    report(start_rowid=db_manager.max_rowid(job.table_name))
+
+    # Bulk session settings; large loads drop and recreate the table's secondary indexes
+    # only when BULK_LOAD_REBUILD_INDEXES=1 (see DatabaseManager.bulk_load)
+    rebuild_indexes = None if rebuild_indexes_enabled() else False
+    with db_manager.bulk_load(job.table_name, expected_rows=file_info.get("total_rows"), rebuild_indexes=rebuild_indexes):
+        for df in excel_loader.iter_frames(temp_path, data_type=job.data_type, file_hash=job.file_hash, plan=plan):
+            logger.info(f"Excel loaded: {len(df):,} rows, {len(df.columns)} columns")
+
+            # Transform data
+            report(message="Transforming data...")
+            df_transformed = transformer.transform_chunk(df)
+            del df
+
+            # Insert into database
+            report(message="Inserting into database...")
+            rows_inserted += db_manager.dataframe_to_table(
+                df_transformed,
+                job.table_name,
+                if_exists='append'  # Always append by default
+            )
+            progress = {"processed_rows": rows_inserted}
+            if job.total_rows:
+                progress["progress"] = min(99.0, rows_inserted / job.total_rows * 100)
+            report(**progress)
+
+    transformer.finalize()
+
+    # Reference data built from this table (e.g. employees → organization_data) is reloaded on next use
+    reference_cache.invalidate([job.table_name])
+    return rows_inserted
+
+
+upload_jobs = UploadJobQueue(db_manager, run_upload)
+
+
+@app.post("/api/upload/{data_type}", status_code=202)
 async def upload_excel(
     data_type: str,
-    file: UploadFile = File(...),
-    background_tasks: BackgroundTasks = BackgroundTasks()
+    file: UploadFile = File(...)
 ):
     """
     Upload Excel file for a specific data type
 
+    The file is saved and queued as a background job; poll
+    /api/upload/progress/{upload_id} for its progress.
+
     Args:
         data_type: Type of data being uploaded (e.g., 'tag_data', 'claim_data')
         file: Excel file to upload
@@ -160,98 +240,48 @@ async def upload_excel(
         raise HTTPException(status_code=400, detail=f"Invalid data type: {data_type}")
 
     # Validate file extension
-    if not file.filename.endswith(('.xlsx', '.xls')):
-        raise HTTPException(status_code=400, detail="Only Excel files (.xlsx, .xls) are supported")
-
-    # Initialize upload progress
-    upload_id = f"{data_type}_{file.filename}"
-    upload_progress[upload_id] = UploadStatus(
-        file_name=file.filename,
-        data_type=data_type,
-        total_rows=0,
-        processed_rows=0,
-        progress=0.0,
-        status="processing",
-        message="Reading Excel file..."
-    )
+    suffix = Path(file.filename).suffix.lower()
+    if suffix not in SUPPORTED_EXTENSIONS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported file type {suffix or '(none)'}; supported: {', '.join(SUPPORTED_EXTENSIONS)}"
+        )
 
     try:
         # Save uploaded file to temporary location
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.xlsx') as temp_file:
-            temp_path = Path(temp_file.name)
-            content = await file.read()
-            temp_file.write(content)
-
-        logger.info(f"Temporary file saved: {temp_path}")
-
-        # Load Excel file
-        upload_progress[upload_id].message = "Loading Excel file..."
-        df = excel_loader.load_excel_file(temp_path, auto_merge_sheets=True)
-        upload_progress[upload_id].total_rows = len(df)
-
-        logger.info(f"Excel loaded: {len(df):,} rows, {len(df.columns)} columns")
-
-        # Transform data
-        upload_progress[upload_id].message = "Transforming data..."
-        transformer = get_transformer(data_type)
-        df_transformed = transformer(df)
-
-        # Insert into database
-        upload_progress[upload_id].message = "Inserting into database..."
-        data_type_info = DATA_TYPES[data_type]
-        rows_inserted = db_manager.dataframe_to_table(
-            df_transformed,
-            data_type_info.table_name,
-            if_exists='append',  # Always append by default
-            chunk_size=5000
-        )
-
-        # Update progress
-        upload_progress[upload_id].processed_rows = rows_inserted
-        upload_progress[upload_id].progress = 100.0
-        upload_progress[upload_id].status = "completed"
-        upload_progress[upload_id].message = f"Successfully uploaded {rows_inserted:,} rows"
-
-        # Clean up temp file
-        temp_path.unlink()
-
-        logger.info(f"Upload complete: {rows_inserted:,} rows inserted into {data_type_info.table_name}")
-
-        return JSONResponse(
-            status_code=200,
-            content={
-                "success": True,
-                "upload_id": upload_id,
-                "data_type": data_type,
-                "file_name": file.filename,
-                "rows_inserted": rows_inserted,
-                "table_name": data_type_info.table_name
-            }
-        )
-
+        # Stream to disk in fixed-size blocks (hashing on the way) instead of
+        # reading the whole upload into memory; keep the extension for the loader
+        temp_path, file_hash = await run_in_threadpool(copy_to_temp_file, file.file, suffix)
     except Exception as e:
         logger.error(f"Upload failed: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
 
-        # Update progress with error
-        if upload_id in upload_progress:
-            upload_progress[upload_id].status = "error"
-            upload_progress[upload_id].error = str(e)
-            upload_progress[upload_id].message = f"Upload failed: {str(e)}"
-
-        # Clean up temp file if it exists
-        if 'temp_path' in locals() and temp_path.exists():
-            temp_path.unlink()
+    logger.info(f"Temporary file saved: {temp_path} (sha256 {file_hash[:12]})")
 
-        raise HTTPException(status_code=500, detail=str(e))
+    data_type_info = DATA_TYPES[data_type]
+    job = upload_jobs.submit(data_type, data_type_info.table_name, file.filename, temp_path, file_hash)
+
+    return JSONResponse(
+        status_code=202,
+        content={
+            "success": True,
+            "upload_id": job.upload_id,
+            "status": job.status,
+            "data_type": data_type,
+            "file_name": file.filename,
+            "table_name": data_type_info.table_name
+        }
+    )
 
 
 @app.get("/api/upload-progress/{upload_id}")
-async def get_upload_progress(upload_id: str):
+async def get_upload_progress_legacy(upload_id: str):
     """Get progress of an upload"""
-    if upload_id not in upload_progress:
+    job = await run_in_threadpool(upload_jobs.get, upload_id)
+    if job is None:
         raise HTTPException(status_code=404, detail="Upload not found")
 
-    return upload_progress[upload_id]
+    return _job_response(job)
 
 
 @app.post("/api/validate-file")
@@ -260,18 +290,16 @@ async def validate_excel_file(file: UploadFile = File(...)):
     Validate an Excel file before upload
     Returns file info and detected data type
     """
-    if not file.filename.endswith(('.xlsx', '.xls')):
-        raise HTTPException(status_code=400, detail="Only Excel files are supported")
+    suffix = Path(file.filename).suffix.lower()
+    if suffix not in SUPPORTED_EXTENSIONS:
+        raise HTTPException(status_code=400, detail="Only Excel, CSV/TSV and Parquet files are supported")
 
     try:
         # Save to temp file
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.xlsx') as temp_file:
-            temp_path = Path(temp_file.name)
-            content = await file.read()
-            temp_file.write(content)
+        temp_path, _ = await run_in_threadpool(copy_to_temp_file, file.file, suffix)
 
-        # Get file info
-        file_info = excel_loader.get_excel_info(temp_path)
+        # Get file info (parses .xls and scans CSV encoding: off the event loop)
+        file_info = await run_in_threadpool(excel_loader.get_excel_info, temp_path)
 
         # Try to detect data type from filename or columns
         detected_type = None
@@ -290,11 +318,15 @@ async def validate_excel_file(file: UploadFile = File(...)):
                     detected_type = dt_id
                     break
 
+        # How the upload would be loaded (whole frame / spill / chunked)
+        load_plan = await run_in_threadpool(excel_loader.plan_load, temp_path, data_type=detected_type)
+
         # Clean up
         temp_path.unlink()
 
         return {
             "file_info": file_info,
+            "load_plan": load_plan.model_dump(),
             "detected_type": detected_type,
             "confidence": "high" if detected_type else "low"
         }
@@ -305,10 +337,18 @@ async def validate_excel_file(file: UploadFile = File(...)):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.on_event("startup")
+async def startup_event():
+    """Resume upload jobs left by a previous run (see core/upload_jobs.py)"""
+    await run_in_threadpool(upload_jobs.recover)
+
+
 @app.on_event("shutdown")
 async def shutdown_event():
     """Cleanup on server shutdown"""
     logger.info("Shutting down Excel upload server...")
+    # Queued uploads stay pending in batch_jobs; the running one finishes first
+    await run_in_threadpool(upload_jobs.shutdown)
     db_manager.close()
 
 
@@ -319,6 +359,9 @@ def start_server(port: int = 8000, host: str = "127.0.0.1"):
 
 
 if __name__ == "__main__":
+    # Required for the sheet-loading process pool in frozen builds
+    multiprocessing.freeze_support()
+
     # Get port from environment or default to 8000
     port = int(os.getenv("PORT", "8000"))
     start_server(port=port)
@@ -2,7 +2,7 @@
 Data type definitions matching DATA_TABLES_COMPLETE_MAPPING.md
 """
 from enum import Enum
-from typing import Dict, List
+from typing import Dict, List, Literal
 from pydantic import BaseModel
 
 
@@ -13,6 +13,24 @@ class DataTypePriority(str, Enum):
     LOW = "low"
 
 
+class ReadSchema(BaseModel):
+    """
+    Parse-time schema for a data type's Excel files
+
+    columns: Source columns to read; any other column is never materialized
+             (empty = read all). Missing columns are ignored.
+    dtypes: Column dtypes passed to the reader (e.g. "str" for code columns)
+    converters: Vectorized conversions applied right after parsing,
+                "numeric" (pd.to_numeric, coerce) or "datetime" (pd.to_datetime, coerce)
+    infer_numeric: Keep the numeric conversion trial for columns without a converter
+                   (schemas derived from transform specs, which only know the converted columns)
+    """
+    columns: List[str] = []
+    dtypes: Dict[str, str] = {}
+    converters: Dict[str, Literal["numeric", "datetime"]] = {}
+    infer_numeric: bool = False
+
+
 class DataTypeInfo(BaseModel):
     id: str
     label: str
@@ -23,6 +41,7 @@ class DataTypeInfo(BaseModel):
     sample_columns: List[str]
     date_column: str | None = None
     employee_column: str | None = None
+    read_schema: ReadSchema | None = None
 
 
 # Complete mapping of all 12 data types
@@ -36,7 +55,20 @@ DATA_TYPES: Dict[str, DataTypeInfo] = {
         file_pattern="입출문기록*.xlsx",
         sample_columns=["일자", "사번", "출입시각", "DR_GB"],
         date_column="ENTE_DT",
-        employee_column="사번"
+        employee_column="사번",
+        # Source names renamed by transform_tag_data, plus files already using DB names
+        # and the columns of the Aug-Oct event log format (REGDATE, EMPLOYEENO, DOORNAME, ...)
+        read_schema=ReadSchema(
+            columns=[
+                "일자", "요일구분", "요일명", "이름", "사번", "센터", "담당", "팀", "그룹", "파트",
+                "출입시각", "문번호", "문명칭", "DR구분", "출입구분",
+                "ENTE_DT", "DAY_GB", "DAY_NM", "NAME", "CENTER", "BU", "TEAM", "GROUP_A", "PART",
+                "DR_NO", "DR_NM", "DR_GB", "INOUT_GB",
+                "REGDATE", "EMPLOYEENO", "EMPLOYEENAME", "DOORNAME", "EQUIPNO"
+            ],
+            dtypes={"문번호": "str", "DR_NO": "str", "EQUIPNO": "str"},
+            converters={"사번": "numeric", "출입시각": "numeric", "EMPLOYEENO": "numeric", "REGDATE": "datetime"}
+        )
     ),
     "claim_data": DataTypeInfo(
         id="claim_data",
@@ -47,7 +79,16 @@ DATA_TYPES: Dict[str, DataTypeInfo] = {
         file_pattern="claim_data*.xlsx",
         sample_columns=["일자", "사번", "근무시간"],
         date_column="근무일",
-        employee_column="사번"
+        employee_column="사번",
+        read_schema=ReadSchema(
+            columns=[
+                "근무일", "급여요일", "성명", "사번", "부서", "직급", "WORKSCHDTYPNM",
+                "근무시간", "시작", "종료", "제외시간", "근태명", "근태코드",
+                "시작시간", "종료시간", "cross_day_work", "실제근무시간", "휴가_연차"
+            ],
+            dtypes={"시작": "str", "종료": "str", "근태코드": "str"},
+            converters={"사번": "numeric", "제외시간": "numeric"}
+        )
     ),
     "employees": DataTypeInfo(
         id="employees",
@@ -69,7 +110,19 @@ DATA_TYPES: Dict[str, DataTypeInfo] = {
         file_pattern="Meal_*.xlsx",
         sample_columns=["취식일시", "사번", "테이크아웃"],
         date_column="취식일시",
-        employee_column="사번"
+        employee_column="사번",
+        # Columns of the meal_data schema; the remaining export columns are not stored
+        read_schema=ReadSchema(
+            columns=[
+                "NO", "취식일시", "정산일", "식당명", "배식구", "식사가격", "카드번호",
+                "사번", "성명", "부서", "식단", "테이크아웃", "식사구분명"
+            ],
+            dtypes={"배식구": "str", "테이크아웃": "str"},
+            converters={
+                "취식일시": "datetime", "정산일": "datetime",
+                "NO": "numeric", "식사가격": "numeric", "카드번호": "numeric", "사번": "numeric"
+            }
+        )
     ),
     "knox_approval": DataTypeInfo(
         id="knox_approval",
@@ -169,11 +222,33 @@ class UploadStatus(BaseModel):
     total_rows: int
     processed_rows: int
     progress: float
-    status: str  # 'processing', 'completed', 'error'
+    status: str  # 'pending', 'running', 'completed', 'failed'
     message: str | None = None
     error: str | None = None
 
 
+class UploadJob(UploadStatus):
+    """Background upload job, persisted in batch_jobs (see core/upload_jobs.py)"""
+    upload_id: str
+    table_name: str
+    file_path: str
+    file_hash: str | None = None
+    start_time: str               # when the upload was accepted
+    end_time: str | None = None
+    start_rowid: int | None = None  # MAX(rowid) of the table before the first insert
+
+
+class LoadPlan(BaseModel):
+    """Loader strategy chosen for one file from its estimated in-memory size"""
+    strategy: Literal["frame", "chunked", "spill"]
+    estimated_mb: float
+    budget_mb: float
+    sheet_count: int
+    reason: str
+    chunk_size: int | None = None  # rows per chunk ('chunked')
+    workers: int | None = None     # concurrent sheet loads ('spill')
+
+
 class DataStats(BaseModel):
     """Database statistics for a data type"""
     data_type: str
@@ -6,6 +6,7 @@ PyInstaller 패키징 시 streamlit run 명령을 실행하기 위한 래퍼
 
 import sys
 import os
+import multiprocessing
 from pathlib import Path
 
 # PyInstaller 패키징 모드 감지
@@ -20,6 +21,9 @@ else:
 streamlit_script = bundle_dir / 'streamlit_app.py'
 
 if __name__ == '__main__':
+    # 시트 병렬 로딩(ProcessPoolExecutor)이 패키징된 실행 파일에서도 동작하도록 설정
+    multiprocessing.freeze_support()
+
     # Streamlit CLI 실행
     from streamlit.web import cli as stcli
 
@@ -22,7 +22,6 @@ from pathlib import Path
 import sys
 import logging
 from datetime import datetime
-import tempfile
 import os
 from st_aggrid import AgGrid, GridOptionsBuilder, GridUpdateMode
 
@@ -32,8 +31,12 @@ sys.path.insert(0, str(current_dir))
 
 from models.data_types import DATA_TYPES
 from core.db_manager import DatabaseManager
-from core.excel_loader import ExcelLoader
-from handlers.data_transformers import get_transformer
+from core.excel_loader import SUPPORTED_EXTENSIONS, ExcelLoader
+from core.ingest import DateRangeClearer
+from core.reference_cache import reference_cache_for_db
+from core.staging_cache import staging_cache_for_db
+from handlers.data_transformers import get_chunk_transformer
+from utils.uploads import copy_to_temp_file
 
 # 로깅 설정
 logging.basicConfig(
@@ -120,50 +123,55 @@ def get_data_stats():
                 try:
                     date_col, date_format = date_column_map[data_type_id]
 
-                    # claim_data는 혼합 형식이므로 별도 처리
-                    if table_name == "claim_data":
-                        # Integer와 Text 형식 모두 고려 (CAST 필수!)
-                        query = f"""
-                        SELECT
-                            MIN(CAST(
-                                CASE WHEN typeof({date_col}) = 'integer' THEN {date_col}
-                                     WHEN typeof({date_col}) = 'text' THEN CAST(substr(replace({date_col}, '-', ''), 1, 8) AS INTEGER)
-                                END AS INTEGER
-                            )) as min_date,
-                            MAX(CAST(
-                                CASE WHEN typeof({date_col}) = 'integer' THEN {date_col}
-                                     WHEN typeof({date_col}) = 'text' THEN CAST(substr(replace({date_col}, '-', ''), 1, 8) AS INTEGER)
-                                END AS INTEGER
-                            )) as max_date
-                        FROM {table_name} WHERE {date_col} IS NOT NULL
-                        """
+                    # day_key 인덱스가 있으면 MIN/MAX를 인덱스에서 바로 조회 (혼합 형식 CAST 불필요)
+                    day_range = db_manager.get_day_range(table_name)
+                    if day_range is not None:
+                        date_range = f"{day_range['min']} ~ {day_range['max']}"
                     else:
-                        query = f"SELECT MIN({date_col}) as min_date, MAX({date_col}) as max_date FROM {table_name} WHERE {date_col} IS NOT NULL"
-
-                    result = db_manager.conn.execute(query).fetchone()
-
-                    if result and result[0]:
-                        min_date = str(result[0])
-                        max_date = str(result[1])
-
-                        # 숫자 형식 (20250101) -> 날짜 문자열 (2025-01-01)
-                        if date_format == "number":
-                            # 혼합 형식 처리 (숫자 또는 datetime 문자열)
-                            if len(min_date) == 8 and min_date.isdigit():
-                                min_date = f"{min_date[:4]}-{min_date[4:6]}-{min_date[6:8]}"
-                            elif ' ' in min_date:
+                        # claim_data는 혼합 형식이므로 별도 처리
+                        if table_name == "claim_data":
+                            # Integer와 Text 형식 모두 고려 (CAST 필수!)
+                            query = f"""
+                            SELECT
+                                MIN(CAST(
+                                    CASE WHEN typeof({date_col}) = 'integer' THEN {date_col}
+                                         WHEN typeof({date_col}) = 'text' THEN CAST(substr(replace({date_col}, '-', ''), 1, 8) AS INTEGER)
+                                    END AS INTEGER
+                                )) as min_date,
+                                MAX(CAST(
+                                    CASE WHEN typeof({date_col}) = 'integer' THEN {date_col}
+                                         WHEN typeof({date_col}) = 'text' THEN CAST(substr(replace({date_col}, '-', ''), 1, 8) AS INTEGER)
+                                    END AS INTEGER
+                                )) as max_date
+                            FROM {table_name} WHERE {date_col} IS NOT NULL
+                            """
+                        else:
+                            query = f"SELECT MIN({date_col}) as min_date, MAX({date_col}) as max_date FROM {table_name} WHERE {date_col} IS NOT NULL"
+
+                        result = db_manager.execute_query(query)[0]
+
+                        if result and result[0]:
+                            min_date = str(result[0])
+                            max_date = str(result[1])
+
+                            # 숫자 형식 (20250101) -> 날짜 문자열 (2025-01-01)
+                            if date_format == "number":
+                                # 혼합 형식 처리 (숫자 또는 datetime 문자열)
+                                if len(min_date) == 8 and min_date.isdigit():
+                                    min_date = f"{min_date[:4]}-{min_date[4:6]}-{min_date[6:8]}"
+                                elif ' ' in min_date:
+                                    min_date = min_date.split(' ')[0]
+
+                                if len(max_date) == 8 and max_date.isdigit():
+                                    max_date = f"{max_date[:4]}-{max_date[4:6]}-{max_date[6:8]}"
+                                elif ' ' in max_date:
+                                    max_date = max_date.split(' ')[0]
+                            # datetime 형식에서 날짜만 추출
+                            elif date_format == "datetime":
                                 min_date = min_date.split(' ')[0]
-
-                            if len(max_date) == 8 and max_date.isdigit():
-                                max_date = f"{max_date[:4]}-{max_date[4:6]}-{max_date[6:8]}"
-                            elif ' ' in max_date:
                                 max_date = max_date.split(' ')[0]
-                        # datetime 형식에서 날짜만 추출
-                        elif date_format == "datetime":
-                            min_date = min_date.split(' ')[0]
-                            max_date = max_date.split(' ')[0]
 
-                        date_range = f"{min_date} ~ {max_date}"
+                            date_range = f"{min_date} ~ {max_date}"
 
                 except Exception as e:
                     logger.debug(f"날짜 조회 실패 ({table_name}): {e}")
@@ -172,7 +180,7 @@ def get_data_stats():
             if row_count > 0:
                 try:
                     upload_query = f"SELECT MAX(uploaded_at) FROM {table_name} WHERE uploaded_at IS NOT NULL"
-                    upload_result = db_manager.conn.execute(upload_query).fetchone()
+                    upload_result = db_manager.execute_query(upload_query)[0]
                     if upload_result and upload_result[0]:
                         # YYYY-MM-DD HH:MM:SS -> YYYY-MM-DD만 추출
                         last_upload = str(upload_result[0]).split(' ')[0]
@@ -375,8 +383,8 @@ def render_file_upload_section():
 
         # 파일 업로더
         uploaded_files = st.file_uploader(
-            "Select Files (Excel 파일 복수 선택 가능)",
-            type=['xlsx', 'xls'],
+            "Select Files (Excel/CSV/Parquet 파일 복수 선택 가능)",
+            type=[ext.lstrip('.') for ext in SUPPORTED_EXTENSIONS],
             accept_multiple_files=True,
             key=f"file_uploader_{selected_type}",
             label_visibility="visible"
@@ -435,6 +443,7 @@ def load_data(selected_type, uploaded_files):
     """데이터 로드 처리"""
     progress_bar = st.progress(0)
     status_text = st.empty()
+    db_manager = None
 
     try:
         data_type_info = DATA_TYPES[selected_type]
@@ -446,107 +455,71 @@ def load_data(selected_type, uploaded_files):
         status_text.text(f"📊 {data_type_info.label} 로딩 중...")
         progress_bar.progress(0.1)
 
-        excel_loader = ExcelLoader()
+        excel_loader = ExcelLoader(staging_cache=staging_cache_for_db(DB_PATH))
         db_manager = DatabaseManager(str(DB_PATH))
+        # 참조 테이블(조직 정보 등)은 한 번만 로드하고, 집계 로그는 모든 프레임 처리 후 출력
+        transformer = get_chunk_transformer(selected_type)
+        transformer.setup()
 
-        all_dfs = []
-        temp_files_to_delete = []
-
-        total_files = len(uploaded_files)
-        for idx, uploaded_file in enumerate(uploaded_files):
-            status_text.text(f"📖 파일 로딩 중: {uploaded_file.name} ({idx+1}/{total_files})")
-            progress = 0.1 + (idx / total_files) * 0.4
-            progress_bar.progress(progress)
-
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.xlsx') as tmp_file:
-                tmp_file.write(uploaded_file.getbuffer())
-                tmp_path = tmp_file.name
-
-            try:
-                from pathlib import Path
-                df = excel_loader.load_excel_file(Path(tmp_path))
-                if df is not None and not df.empty:
-                    all_dfs.append(df)
-                temp_files_to_delete.append(tmp_path)
-            except Exception as e:
-                if os.path.exists(tmp_path):
-                    os.unlink(tmp_path)
-                raise e
-
-        if all_dfs:
-            status_text.text("🔄 데이터 병합 중...")
-            progress_bar.progress(0.6)
-
-            combined_df = pd.concat(all_dfs, ignore_index=True)
-            logger.info(f"데이터 병합 완료: {len(combined_df):,}행")
-
-            transformer = get_transformer(selected_type)
-            if transformer:
-                status_text.text("🔄 데이터 변환 중...")
-                progress_bar.progress(0.7)
-                combined_df = transformer(combined_df)
-
-            # 날짜 범위 기반 중복 방지: 업로드할 데이터의 날짜 범위에 해당하는 기존 데이터 삭제
-            date_column_map = {
-                "tag_data": ("ENTE_DT", "number"),
-                "claim_data": ("근무일", "datetime"),  # ✅ 수정: data_transformers.py에서 'YYYY-MM-DD HH:MM:SS' 형식으로 변환함
-                "meal_data": ("취식일시", "datetime"),
-                "knox_approval": ("Timestamp", "datetime"),
-                "knox_mail": ("발신일시_GMT9", "datetime"),
-                "knox_pims": ("start_time", "datetime"),
-                "eam_data": ("ATTEMPTDATE", "datetime"),
-                "equis_data": ("Timestamp", "datetime"),
-                "lams_data": ("DATE", "datetime"),
-                "mes_data": ("login_time", "datetime"),
-                "mdm_data": ("Timestap", "datetime"),
-            }
+        # 날짜 범위 기반 중복 방지: 업로드할 데이터의 날짜 범위에 해당하는 기존 데이터 삭제
+        # (프레임 단위로 저장하므로 이번 업로드에서 이미 삭제한 날짜는 다시 삭제하지 않음)
+        date_clearer = DateRangeClearer(db_manager, data_type_info.table_name, selected_type)
 
-            # 해당 데이터 타입의 날짜 컬럼 확인
-            if selected_type in date_column_map and not combined_df.empty:
-                date_column, date_format = date_column_map[selected_type]
+        total_rows = 0
+        claim_days = set()
+
+        # 대용량 적재용 세션 (cache_size, temp_store=MEMORY, 종료 시 PRAGMA optimize)
+        with db_manager.bulk_load(data_type_info.table_name):
+            total_files = len(uploaded_files)
+            for idx, uploaded_file in enumerate(uploaded_files):
+                status_text.text(f"📖 파일 로딩 중: {uploaded_file.name} ({idx+1}/{total_files})")
+                progress = 0.1 + (idx / total_files) * 0.8
+                progress_bar.progress(progress)
+
+                # 블록 단위로 디스크에 복사하면서 SHA-256 계산 (확장자로 리더를 선택하므로 원본 확장자 유지)
+                uploaded_file.seek(0)
+                tmp_path, file_hash = copy_to_temp_file(uploaded_file, os.path.splitext(uploaded_file.name)[1].lower())
+
+                try:
+                    # 예상 메모리 사용량에 따라 전체 로드 / 시트별 디스크 스필 / 청크 스트리밍 중 선택
+                    plan = excel_loader.plan_load(tmp_path, data_type=selected_type)
+
+                    # 프레임(파일, 시트 또는 청크)마다 변환 → 중복 제거 → 저장 후 메모리에서 해제
+                    for df in excel_loader.iter_frames(tmp_path, data_type=selected_type, file_hash=file_hash, plan=plan):
+                        if df is None or df.empty:
+                            continue
+
+                        status_text.text(f"🔄 데이터 변환 중: {uploaded_file.name}")
+                        df = transformer.transform_chunk(df)
 
-                if date_column in combined_df.columns:
-                    try:
                         status_text.text("🗑️ 기존 데이터 중복 제거 중...")
-                        progress_bar.progress(0.75)
-
-                        # 업로드할 데이터의 날짜 범위 추출
-                        if date_format == "number":
-                            # 숫자 형식 (20250101)
-                            min_date = str(int(combined_df[date_column].min()))
-                            max_date = str(int(combined_df[date_column].max()))
-                            # YYYYMMDD -> YYYY-MM-DD 형식으로 변환
-                            min_date_formatted = f"{min_date[:4]}-{min_date[4:6]}-{min_date[6:8]}"
-                            max_date_formatted = f"{max_date[:4]}-{max_date[4:6]}-{max_date[6:8]}"
-                        else:
-                            # datetime 형식
-                            min_date_formatted = pd.to_datetime(combined_df[date_column]).min().strftime('%Y-%m-%d')
-                            max_date_formatted = pd.to_datetime(combined_df[date_column]).max().strftime('%Y-%m-%d')
+                        date_clearer.clear(df)
 
-                        # 해당 날짜 범위의 기존 데이터 삭제
-                        deleted_rows = db_manager.delete_by_date_range(
-                            table_name=data_type_info.table_name,
-                            date_column=date_column,
-                            min_date=min_date_formatted,
-                            max_date=max_date_formatted,
-                            date_format=date_format
-                        )
+                        status_text.text(f"💾 데이터베이스 저장 중: {uploaded_file.name} ({total_rows + len(df):,}행)")
+                        db_manager.insert_dataframe(data_type_info.table_name, df)
+                        total_rows += len(df)
 
-                        if deleted_rows > 0:
-                            logger.info(f"중복 방지: {deleted_rows:,}행 삭제 완료 ({min_date_formatted} ~ {max_date_formatted})")
+                        if selected_type == "claim_data" and '근무일' in df.columns:
+                            claim_days.update(df['근무일'].dropna().astype(str).unique())
+                finally:
+                    try:
+                        if os.path.exists(tmp_path):
+                            os.unlink(tmp_path)
+                    except Exception as del_error:
+                        logger.warning(f"임시 파일 삭제 실패: {tmp_path} - {del_error}")
 
-                    except Exception as e:
-                        logger.warning(f"날짜 범위 삭제 실패 (계속 진행): {e}")
+        transformer.finalize()
 
-            status_text.text("💾 데이터베이스 저장 중...")
-            progress_bar.progress(0.8)
+        # 이 테이블로 만든 참조 데이터(employees → organization_data)는 다음 사용 시 다시 로드
+        reference_cache_for_db(DB_PATH).invalidate([data_type_info.table_name])
 
-            db_manager.insert_dataframe(data_type_info.table_name, combined_df)
+        if total_rows:
+            logger.info(f"데이터 저장 완료: {total_rows:,}행")
 
             # tag_data 업로드 시 Master 테이블 자동 마이그레이션 (비활성화)
             # 이유: 시간이 오래 걸리고 진행률 피드백이 없어서 사용자 경험이 나쁨
             # 필요시 터미널에서 수동 실행: npx tsx scripts/migrate-complete-master.ts YYYYMMDD YYYYMMDD
-            # if selected_type == "tag_data" and not combined_df.empty:
+            # if selected_type == "tag_data" and total_rows:
             #     ... (마이그레이션 코드 비활성화)
 
             progress_bar.progress(1.0)
@@ -558,14 +531,7 @@ def load_data(selected_type, uploaded_files):
             if 'selected_data_type' in st.session_state:
                 del st.session_state['selected_data_type']
 
-            for tmp_path in temp_files_to_delete:
-                try:
-                    if os.path.exists(tmp_path):
-                        os.unlink(tmp_path)
-                except Exception as del_error:
-                    logger.warning(f"임시 파일 삭제 실패: {tmp_path} - {del_error}")
-
-            st.success(f"🎉 {data_type_info.label} 업로드 완료! ({len(combined_df):,}행)")
+            st.success(f"🎉 {data_type_info.label} 업로드 완료! ({total_rows:,}행)")
 
             # claim_data 업로드 후 자동으로 통계 재계산
             if selected_type == "claim_data":
@@ -575,10 +541,9 @@ def load_data(selected_type, uploaded_files):
                 # 업로드된 데이터의 월 추출
                 try:
                     # 근무일 컬럼에서 월 정보 추출
-                    dates = combined_df['근무일'].dropna().astype(str)
                     months = set()
 
-                    for date_str in dates:
+                    for date_str in claim_days:
                         # YYYY-MM-DD 형식 또는 YYYYMMDD 형식
                         if '-' in date_str and len(date_str) >= 7:
                             month = date_str[:7]  # YYYY-MM
@@ -625,6 +590,9 @@ def load_data(selected_type, uploaded_files):
     finally:
         progress_bar.empty()
         status_text.empty()
+        # 쓰기 스레드 종료 및 연결 정리
+        if db_manager is not None:
+            db_manager.close()
 
 def main():
     """메인 애플리케이션"""
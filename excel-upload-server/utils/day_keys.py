@@ -0,0 +1,93 @@
+"""
+Integer day key (day_key, YYYYMMDD) of the time-series tables
+
+Date columns hold mixed values depending on the table and the upload
+(20250701, 20250701.0, '2025-07-01', '2025-07-01 08:30:00',
+20250701083000). Every time-series table also carries day_key, the day as a
+YYYYMMDD INTEGER, so date range deletes and stats are index range scans
+instead of a CASE typeof(...) over every row.
+
+Rule: numbers of 14 or more digits are YYYYMMDDHHMMSS, other numbers are
+truncated; text drops '-' and its first 8 characters are read as an integer
+(like SQLite CAST). Results outside 19000101..29991231 become NULL.
+
+day_key() normalizes a column at ingest; day_key_sql() is the same rule as
+an SQLite expression, for backfills and triggers.
+"""
+import re
+
+import numpy as np
+import pandas as pd
+
+DAY_KEY = "day_key"
+
+MIN_DAY_KEY = 19000101
+MAX_DAY_KEY = 29991231
+
+# Leading integer of a text, as SQLite CAST(text AS INTEGER) reads it
+_LEADING_INTEGER = re.compile(r"[ \t\n\f\r]*([+-]?[0-9]+)")
+
+
+def _number_day_keys(numbers: np.ndarray) -> pd.Series:
+    """Day keys of a float array (Int64, <NA> outside the valid range)"""
+    with np.errstate(invalid='ignore'):
+        days = np.trunc(np.where(numbers >= 1e13, numbers / 1e6, numbers))
+        valid = (days >= MIN_DAY_KEY) & (days <= MAX_DAY_KEY)
+    keys = np.zeros(len(numbers), dtype='int64')
+    keys[valid] = days[valid].astype('int64')
+    return pd.Series(pd.arrays.IntegerArray(keys, ~valid))
+
+
+def _text_day_key(value: str):
+    """Day key of a text value (None outside the valid range)"""
+    match = _LEADING_INTEGER.match(value.replace('-', '')[:8])
+    day = int(match.group(1)) if match else 0
+    return day if MIN_DAY_KEY <= day <= MAX_DAY_KEY else None
+
+
+def day_key(values: pd.Series) -> pd.Series:
+    """
+    Day keys of a date column (Int64, <NA> where the value is not a day)
+
+    Numeric and datetime64 columns are converted with array arithmetic; other
+    columns once per distinct value.
+    """
+    if pd.api.types.is_datetime64_any_dtype(values.dtype):
+        keys = _number_day_keys((values.dt.year * 10000 + values.dt.month * 100 + values.dt.day).to_numpy(dtype=float, na_value=np.nan))
+        keys.index = values.index
+        return keys
+    if isinstance(values.dtype, np.dtype) and values.dtype.kind in 'iuf':
+        keys = _number_day_keys(values.to_numpy(dtype=float))
+        keys.index = values.index
+        return keys
+
+    codes, uniques = pd.factorize(values)
+    distinct = pd.Series(np.asarray(uniques, dtype=object))
+
+    def convert(value):
+        if isinstance(value, str):
+            return _text_day_key(value)
+        if isinstance(value, pd.Timestamp):
+            return value.year * 10000 + value.month * 100 + value.day
+        if isinstance(value, (int, float, np.integer, np.floating)) and not isinstance(value, bool):
+            key = _number_day_keys(np.array([value], dtype=float))[0]
+            return None if pd.isna(key) else int(key)
+        return None
+
+    # Missing values have code -1: one trailing <NA>
+    unique_keys = np.array(distinct.map(convert).tolist() + [None], dtype=object)
+    keys = pd.array(unique_keys[codes], dtype='Int64')
+    return pd.Series(keys, index=values.index)
+
+
+def day_key_sql(column: str) -> str:
+    """SQLite expression computing day_key from a column (same rule as day_key)"""
+    day = (
+        f"CASE"
+        f" WHEN typeof({column}) IN ('integer', 'real') AND {column} >= 10000000000000"
+        f" THEN CAST({column} / 1000000 AS INTEGER)"
+        f" WHEN typeof({column}) IN ('integer', 'real') THEN CAST({column} AS INTEGER)"
+        f" WHEN typeof({column}) = 'text' THEN CAST(substr(replace({column}, '-', ''), 1, 8) AS INTEGER)"
+        f" END"
+    )
+    return f"CASE WHEN ({day}) BETWEEN {MIN_DAY_KEY} AND {MAX_DAY_KEY} THEN ({day}) END"
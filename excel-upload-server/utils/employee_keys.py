@@ -0,0 +1,84 @@
+"""
+Canonical integer employee key (emp_key)
+
+The employee number is stored as INTEGER, REAL or TEXT depending on the
+table (사번, UserNo, USERNO, User_No, employee_id, ...). Every ingested and
+analysis table also carries emp_key, the same number as an INTEGER, so
+joins compare integers through an index instead of CAST(... AS TEXT).
+
+A value is an employee number when it is a positive whole number: integers,
+whole floats (20200181.0) and digit strings with an optional zero fraction
+('20200181', ' 20200181.0 '). Anything else becomes NULL.
+
+employee_key() normalizes a column at ingest; employee_key_sql() is the
+same rule as an SQLite expression, for backfills and triggers.
+"""
+import re
+
+import numpy as np
+import pandas as pd
+
+EMP_KEY = "emp_key"
+
+_EMPLOYEE_TEXT = re.compile(r"[0-9]+(\.0*)?")
+
+
+def _text_key(value: str):
+    """Employee number of a digit string (None if it is not one)"""
+    text = value.strip(' ')  # like SQLite trim()
+    if not _EMPLOYEE_TEXT.fullmatch(text):
+        return None
+    number = int(text.split('.')[0])
+    return number if 0 < number < 2 ** 63 else None
+
+
+def _number_keys(numbers: np.ndarray) -> pd.Series:
+    """Employee numbers of a float array (Int64, <NA> if not positive whole numbers)"""
+    with np.errstate(invalid='ignore'):
+        valid = np.isfinite(numbers) & (numbers >= 1) & (numbers < 2.0 ** 63) & (numbers == np.floor(numbers))
+    keys = np.zeros(len(numbers), dtype='int64')
+    keys[valid] = numbers[valid].astype('int64')
+    return pd.Series(pd.arrays.IntegerArray(keys, ~valid))
+
+
+def employee_key(values: pd.Series) -> pd.Series:
+    """
+    Canonical employee keys of a column (Int64, <NA> where the value is not an employee number)
+
+    Numeric columns are converted with array arithmetic; other columns once
+    per distinct value.
+    """
+    if isinstance(values.dtype, np.dtype) and values.dtype.kind in 'iuf':
+        keys = _number_keys(values.to_numpy(dtype=float))
+        keys.index = values.index
+        return keys
+
+    codes, uniques = pd.factorize(values)
+    distinct = pd.Series(np.asarray(uniques, dtype=object))
+    numeric = distinct.map(lambda v: isinstance(v, (int, float, np.integer, np.floating)) and not isinstance(v, bool))
+    text = distinct.map(lambda v: isinstance(v, str))
+
+    unique_keys = pd.Series(pd.NA, index=distinct.index, dtype='Int64')
+    if numeric.any():
+        unique_keys[numeric] = _number_keys(distinct[numeric].to_numpy(dtype=float)).to_numpy()
+    if text.any():
+        unique_keys[text] = pd.array(distinct[text].map(_text_key).tolist(), dtype='Int64')
+
+    # Missing values have code -1: one trailing <NA>
+    keys = pd.array(np.append(unique_keys.to_numpy(dtype=object), pd.NA)[codes], dtype='Int64')
+    return pd.Series(keys, index=values.index)
+
+
+def employee_key_sql(column: str) -> str:
+    """SQLite expression computing emp_key from a column (same rule as employee_key)"""
+    return (
+        f"CASE"
+        f" WHEN typeof({column}) IN ('integer', 'real')"
+        f" AND {column} >= 1 AND {column} = CAST({column} AS INTEGER)"
+        f" THEN CAST({column} AS INTEGER)"
+        f" WHEN typeof({column}) = 'text'"
+        f" AND trim({column}) GLOB '[0-9]*' AND trim({column}) NOT GLOB '*[^0-9.]*'"
+        f" AND trim({column}) NOT GLOB '*.*[^0]*'"
+        f" THEN NULLIF(CAST(trim({column}) AS INTEGER), 0)"
+        f" END"
+    )
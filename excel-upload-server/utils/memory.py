@@ -0,0 +1,129 @@
+"""
+DataFrame memory helpers: low-cardinality string encoding and per-column reports
+"""
+import logging
+from typing import List, Tuple
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Encode a string column as categorical when distinct values <= ratio * rows
+DEFAULT_CATEGORY_THRESHOLD = 0.05
+
+# Below this many rows the savings are not worth the dtype change
+CATEGORY_MIN_ROWS = 1_000
+
+# Rows checked first so high-cardinality columns are rejected without a full pass
+CATEGORY_SAMPLE_ROWS = 10_000
+
+
+def _is_string_column(series: pd.Series) -> bool:
+    if pd.api.types.is_string_dtype(series.dtype) and series.dtype != object:
+        return True
+    return series.dtype == object and pd.api.types.infer_dtype(series, skipna=True) == "string"
+
+
+def encode_low_cardinality(
+    df: pd.DataFrame,
+    threshold: float = DEFAULT_CATEGORY_THRESHOLD
+) -> Tuple[pd.DataFrame, List[str]]:
+    """
+    Dictionary-encode low-cardinality string columns as pandas categoricals
+
+    Only pure string columns are encoded; mixed-type object columns are left
+    as they are.
+
+    Args:
+        df: Input DataFrame (modified in place)
+        threshold: Maximum distinct values as a fraction of rows (0 disables)
+
+    Returns:
+        (DataFrame, list of encoded column names)
+    """
+    if threshold <= 0 or len(df) < CATEGORY_MIN_ROWS:
+        return df, []
+
+    max_unique = int(len(df) * threshold)
+    encoded = []
+    for col in df.columns:
+        series = df[col]
+        if not _is_string_column(series):
+            continue
+
+        if len(series) > CATEGORY_SAMPLE_ROWS and series.iloc[:CATEGORY_SAMPLE_ROWS].nunique() > max_unique:
+            continue
+        if series.nunique() > max_unique:
+            continue
+
+        df[col] = series.astype("category")
+        encoded.append(col)
+
+    return df, encoded
+
+
+def align_categories(dfs: List[pd.DataFrame]) -> List[pd.DataFrame]:
+    """
+    Give categorical columns the same categories in every frame
+
+    pd.concat only keeps a categorical dtype when all inputs share the exact
+    categories; otherwise the column silently falls back to object.
+    """
+    columns = {
+        col
+        for df in dfs
+        for col in df.columns
+        if isinstance(df[col].dtype, pd.CategoricalDtype)
+    }
+
+    for col in columns:
+        if not all(isinstance(df[col].dtype, pd.CategoricalDtype) for df in dfs if col in df.columns):
+            continue
+
+        categories = pd.Index(
+            dict.fromkeys(value for df in dfs if col in df.columns for value in df[col].cat.categories)
+        )
+        for df in dfs:
+            if col in df.columns and not df[col].cat.categories.equals(categories):
+                df[col] = df[col].cat.set_categories(categories)
+
+    return dfs
+
+
+def memory_report(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Per-column memory usage, with categorical columns compared to plain strings
+
+    Returns:
+        DataFrame indexed by column with dtype, bytes (current) and
+        unencoded_bytes (same column without dictionary encoding)
+    """
+    rows = []
+    for col in df.columns:
+        series = df[col]
+        current = int(series.memory_usage(index=False, deep=True))
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            # Same values in the dtype of the categories (object, or str on pandas 3)
+            before = int(series.astype(series.cat.categories.dtype).memory_usage(index=False, deep=True))
+        else:
+            before = current
+        rows.append({"column": col, "dtype": str(series.dtype), "bytes": current, "unencoded_bytes": before})
+
+    return pd.DataFrame(rows).set_index("column")
+
+
+def log_memory_report(df: pd.DataFrame, label: str = "DataFrame") -> None:
+    """Log memory_report() as a table, largest columns first"""
+    report = memory_report(df).sort_values("unencoded_bytes", ascending=False)
+    total_before = report["unencoded_bytes"].sum()
+    total_after = report["bytes"].sum()
+
+    logger.info(
+        f"Memory report: {label} ({len(df):,} rows) "
+        f"{total_before / (1024 * 1024):,.1f} MB -> {total_after / (1024 * 1024):,.1f} MB"
+    )
+    for col, row in report.iterrows():
+        logger.info(
+            f"  {str(col):<24} {row['dtype']:<16} "
+            f"{row['unencoded_bytes'] / 1024:>12,.0f} KB -> {row['bytes'] / 1024:>12,.0f} KB"
+        )
@@ -0,0 +1,76 @@
+"""
+Vectorized timestamp normalization for the log transformers
+
+Converts timestamp columns with NumPy arithmetic on datetime64 values instead
+of per-row Timestamp.strftime calls:
+- format_datetime: 'YYYY-MM-DD HH:MM:SS' text
+- format_date:     'YYYY-MM-DD' text
+- date_int:        YYYYMMDD integers
+- datetime_int:    YYYYMMDDHHMMSS integers
+
+Unparseable values and NaT become missing (NaN text / <NA> integers), which
+are written as NULL.
+"""
+import numpy as np
+import pandas as pd
+
+
+def to_datetime64(values: pd.Series) -> pd.Series:
+    """
+    Parse a column to naive datetime64 (unparseable -> NaT)
+
+    Timezone-aware values keep their wall-clock time, like strftime would.
+    """
+    parsed = pd.to_datetime(values, errors='coerce')
+    if parsed.dt.tz is not None:
+        parsed = parsed.dt.tz_localize(None)
+    return parsed
+
+
+def _seconds(values: pd.Series) -> np.ndarray:
+    """datetime64[s] array of a column (sub-second parts are dropped)"""
+    return to_datetime64(values).to_numpy(dtype='datetime64[s]')
+
+
+def _format(values: pd.Series, unit: str, width: int) -> pd.Series:
+    seconds = _seconds(values)
+    text = np.datetime_as_string(seconds, unit=unit).astype(f'U{width}')
+    if unit == 's':
+        # 'YYYY-MM-DDTHH:MM:SS' -> 'YYYY-MM-DD HH:MM:SS' (overwrite the 'T' code point)
+        text.view(np.uint32).reshape(-1, width)[:, 10] = ord(' ')
+    return pd.Series(text, index=values.index).where(~np.isnat(seconds))
+
+
+def format_datetime(values: pd.Series) -> pd.Series:
+    """Timestamps as 'YYYY-MM-DD HH:MM:SS' text"""
+    return _format(values, 's', 19)
+
+
+def format_date(values: pd.Series) -> pd.Series:
+    """Timestamps as 'YYYY-MM-DD' text"""
+    return _format(values, 'D', 10)
+
+
+def _date_parts(seconds: np.ndarray) -> tuple:
+    """(YYYYMMDD, seconds since midnight) as int64 arrays"""
+    days = seconds.astype('datetime64[D]')
+    months = seconds.astype('datetime64[M]')
+    year = seconds.astype('datetime64[Y]').astype(np.int64) + 1970
+    month = months.astype(np.int64) % 12 + 1
+    day = (days - months.astype('datetime64[D]')).astype(np.int64) + 1
+    return year * 10000 + month * 100 + day, (seconds - days).astype(np.int64)
+
+
+def date_int(values: pd.Series) -> pd.Series:
+    """Timestamps as YYYYMMDD integers (nullable Int64)"""
+    seconds = _seconds(values)
+    ymd, _ = _date_parts(seconds)
+    return pd.Series(pd.array(ymd, dtype='Int64'), index=values.index).mask(np.isnat(seconds))
+
+
+def datetime_int(values: pd.Series) -> pd.Series:
+    """Timestamps as YYYYMMDDHHMMSS integers (nullable Int64)"""
+    seconds = _seconds(values)
+    ymd, second_of_day = _date_parts(seconds)
+    hhmmss = (second_of_day // 3600) * 10000 + (second_of_day // 60 % 60) * 100 + second_of_day % 60
+    return pd.Series(pd.array(ymd * 1_000_000 + hhmmss, dtype='Int64'), index=values.index).mask(np.isnat(seconds))
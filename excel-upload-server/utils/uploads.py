@@ -0,0 +1,42 @@
+"""
+Upload helpers: copy uploaded files to disk in fixed-size blocks
+"""
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+from typing import BinaryIO, Tuple
+
+# Copy block size; memory per upload stays at one block regardless of file size
+UPLOAD_BLOCK_SIZE = 1024 * 1024
+
+
+def copy_to_temp_file(
+    fileobj: BinaryIO,
+    suffix: str = "",
+    block_size: int = UPLOAD_BLOCK_SIZE
+) -> Tuple[Path, str]:
+    """
+    Copy a file object to a named temp file, computing its SHA-256 on the fly
+
+    Args:
+        fileobj: Readable binary file object (positioned at the start)
+        suffix: Temp file suffix (keep the original extension, the loader
+                picks the reader from it)
+        block_size: Bytes read and written per step
+
+    Returns:
+        (temp file path, SHA-256 hex digest); the caller deletes the file
+    """
+    digest = hashlib.sha256()
+    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as temp_file:
+        try:
+            for block in iter(lambda: fileobj.read(block_size), b""):
+                digest.update(block)
+                temp_file.write(block)
+        except BaseException:
+            temp_file.close()
+            os.unlink(temp_file.name)
+            raise
+
+    return Path(temp_file.name), digest.hexdigest()
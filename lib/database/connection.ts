@@ -88,8 +88,9 @@ class DatabaseManager {
     if (!this.db) return
 
     // Performance optimizations
-    // WAL mode disabled for external module compatibility
-    this.db.pragma('journal_mode = DELETE') // Changed from WAL to DELETE mode
+    // Same journal mode as the upload server (DB_JOURNAL_MODE, default wal):
+    // in WAL mode reads keep running while an upload writes
+    this.db.pragma(`journal_mode = ${(process.env.DB_JOURNAL_MODE || 'wal').toLowerCase()}`)
     this.db.pragma('cache_size = 10000')
     this.db.pragma('foreign_keys = ON')
     this.db.pragma('synchronous = FULL') // Changed from NORMAL for better durability
@@ -46,23 +46,23 @@ if (isBuildTime) {
 }
 
 // 성능 최적화
-// WAL 모드 비활성화 - DELETE 모드 사용 (기본 rollback journal)
-// journal_mode 변경 전에 체크포인트 실행
+// journal mode: 업로드 서버(excel-upload-server)와 같은 DB_JOURNAL_MODE (기본 wal)
+// WAL 모드에서는 업로드 중에도 커밋된 데이터를 계속 읽음 (체크포인트는 업로드 서버가 관리)
 // 빌드 타임에는 스킵
 if (!isBuildTime) {
+  const journalMode = (process.env.DB_JOURNAL_MODE || 'wal').toLowerCase();
   try {
-    // 먼저 현재 journal mode 확인
-    const currentMode = db.pragma('journal_mode') as { journal_mode: string };
+    const currentMode = db.pragma('journal_mode', { simple: true }) as string;
     console.log('Current journal mode:', currentMode);
-  
-  // WAL 모드였다면 체크포인트 실행
-  if (currentMode.journal_mode === 'wal') {
-    db.pragma('wal_checkpoint(TRUNCATE)');
-  }
-  
-  // DELETE 모드로 변경 (WAL 비활성화)
-  db.pragma('journal_mode = DELETE');
-    console.log('Journal mode changed to DELETE');
+
+    if (currentMode !== journalMode) {
+      // WAL에서 나갈 때는 체크포인트 후 변경
+      if (currentMode === 'wal') {
+        db.pragma('wal_checkpoint(TRUNCATE)');
+      }
+      db.pragma(`journal_mode = ${journalMode}`);
+      console.log(`Journal mode changed to ${journalMode.toUpperCase()}`);
+    }
   } catch (error) {
     console.error('Error changing journal mode:', error);
   }
@@ -11,7 +11,7 @@ print('='*80)
 print('10월 센터별 DAR 커버리지 확인')
 print('='*80)
 
-# precompute-stats.ts의 adjusted CTE 로직 재현
+# precompute-stats.ts의 adjusted CTE 로직 재현 (사번 조인은 emp_key, DATABASE_SCHEMA_REFERENCE.md 조인 규칙)
 cursor.execute("""
     SELECT
         e.center_name,
@@ -20,12 +20,12 @@ cursor.execute("""
         ROUND(COUNT(dar.employee_id) * 100.0 / COUNT(*), 1) as coverage_pct
     FROM claim_data c
     LEFT JOIN daily_analysis_results dar
-        ON dar.employee_id = CAST(c.사번 AS TEXT)
-        AND DATE(dar.analysis_date) = DATE(c.근무일)
-    JOIN employees e ON e.employee_id = CAST(c.사번 AS TEXT)
-    WHERE DATE(c.근무일) BETWEEN '2025-10-01' AND '2025-10-31'
+        ON dar.emp_key = c.emp_key
+        AND dar.analysis_date = DATE(c.근무일)
+    JOIN employees e ON e.emp_key = c.emp_key
+    WHERE c.근무일 >= '2025-10-01' AND c.근무일 < '2025-11-01'
         AND e.center_name NOT IN ('경영진단팀', '대표이사', '이사회', '자문역/고문')
-        AND c.사번 NOT IN ('20190287', '20200207', '20120150')
+        AND c.emp_key NOT IN (20190287, 20200207, 20120150)
     GROUP BY e.center_name
     ORDER BY e.center_name
 """)
@@ -46,12 +46,12 @@ cursor.execute("""
         COUNT(*) as total_count
     FROM claim_data c
     LEFT JOIN daily_analysis_results dar
-        ON dar.employee_id = CAST(c.사번 AS TEXT)
-        AND DATE(dar.analysis_date) = DATE(c.근무일)
-    JOIN employees e ON e.employee_id = CAST(c.사번 AS TEXT)
-    WHERE DATE(c.근무일) BETWEEN '2025-10-01' AND '2025-10-31'
+        ON dar.emp_key = c.emp_key
+        AND dar.analysis_date = DATE(c.근무일)
+    JOIN employees e ON e.emp_key = c.emp_key
+    WHERE c.근무일 >= '2025-10-01' AND c.근무일 < '2025-11-01'
         AND e.center_name NOT IN ('경영진단팀', '대표이사', '이사회', '자문역/고문')
-        AND c.사번 NOT IN ('20190287', '20200207', '20120150')
+        AND c.emp_key NOT IN (20190287, 20200207, 20120150)
 """)
 
 dar_count, total_count = cursor.fetchone()
@@ -0,0 +1,46 @@
+"""
+정수 키 마이그레이션: 사번 키(emp_key), 일자 키(day_key) 컬럼 추가, 기존 행 백필, 인덱스/트리거 생성
+
+사번/날짜가 테이블마다 INTEGER / REAL / TEXT로 섞여 저장되어 CAST 조인과 날짜 범위 조건이
+인덱스를 못 쓰는 문제를 해결한다 (excel-upload-server/core/migrations.py). 여러 번 실행해도 안전하다.
+
+사용법:
+    python scripts/migrate_keys.py                                   # 전체 테이블
+    python scripts/migrate_keys.py --tables claim_data employees     # 지정 테이블
+"""
+import argparse
+import logging
+import sqlite3
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "excel-upload-server"))
+
+from core.migrations import DAY_KEY_TABLES, EMPLOYEE_KEY_TABLES, migrate_keys  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="emp_key / day_key 마이그레이션")
+    parser.add_argument("--db", default=str(ROOT / "sambio_human.db"), help="DB 파일 경로")
+    parser.add_argument("--tables", nargs="*", choices=sorted({*EMPLOYEE_KEY_TABLES, *DAY_KEY_TABLES}), help="대상 테이블 (생략 시 전체)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    db_path = Path(args.db)
+    if not db_path.exists():
+        print(f"DB 파일 없음: {db_path}")
+        sys.exit(1)
+
+    conn = sqlite3.connect(str(db_path))
+    try:
+        elapsed = migrate_keys(conn, args.tables or None)
+    finally:
+        conn.close()
+
+    print(f"\n마이그레이션 완료: {len(elapsed)}개 테이블 ({sum(elapsed.values()):.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
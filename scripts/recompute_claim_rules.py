@@ -0,0 +1,51 @@
+"""
+claim_data 근태 규칙 재계산: attendance_rules 변경 사항을 저장된 claim_data에 반영
+
+재업로드 없이 월 단위 set-based UPDATE로 휴가_연차, 출장_보정, 실제근무시간을 다시 계산한다
+(excel-upload-server/core/attendance_rules.py). 값이 바뀌는 행만 갱신한다.
+
+사용법:
+    python scripts/recompute_claim_rules.py                          # 전체 월
+    python scripts/recompute_claim_rules.py --months 2025-08 2025-09 # 지정 월
+    python scripts/recompute_claim_rules.py --dry-run                # 변경 행 수만 확인
+"""
+import argparse
+import logging
+import sqlite3
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "excel-upload-server"))
+
+from core.attendance_rules import recompute_claim_rules  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="claim_data 근태 규칙 재계산")
+    parser.add_argument("--db", default=str(ROOT / "sambio_human.db"), help="DB 파일 경로")
+    parser.add_argument("--months", nargs="*", help="재계산할 월 (YYYY-MM, 생략 시 전체)")
+    parser.add_argument("--dry-run", action="store_true", help="변경 행 수만 세고 반영하지 않음")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    db_path = Path(args.db)
+    if not db_path.exists():
+        print(f"DB 파일 없음: {db_path}")
+        sys.exit(1)
+
+    conn = sqlite3.connect(str(db_path))
+    try:
+        changed = recompute_claim_rules(conn, args.months or None, dry_run=args.dry_run)
+    finally:
+        conn.close()
+
+    total = sum(changed.values())
+    print(f"\n{'변경 예정' if args.dry_run else '재계산 완료'}: {total:,}행 ({len(changed)}개월)")
+    if total and not args.dry_run:
+        print("통계 테이블 갱신: /api/admin/recalculate-stats?month=YYYY-MM 호출")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+"""
+claim_data 변환 패리티 테스트: 행 단위 apply (기존) vs 벡터화 (현재)
+
+기존 구현(parse_date / time_to_hours / calculate_work_hours / 시작·종료 변환)을 그대로
+옮겨 두고, 현재 구현(_map_distinct / _shift_work_hours)과 결과가 값·dtype까지 같은지 확인한다.
+
+사용법:
+    python scripts/test_claim_transform_parity.py                      # 경계 케이스 + 합성 데이터
+    python scripts/test_claim_transform_parity.py --rows 1400000       # 합성 데이터 크기 지정
+    python scripts/test_claim_transform_parity.py "25년도 8-10 Claim Data.xlsx"   # 실제 파일
+"""
+import argparse
+import sys
+import time
+from datetime import datetime, time as dt_time, timedelta
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "excel-upload-server"))
+
+from handlers.data_transformers import (  # noqa: E402
+    DataTransformers,
+    _map_distinct,
+    _parse_work_date,
+    _shift_work_hours,
+    _time_to_hours,
+)
+
+
+# ---------------------------------------------------------------------------
+# 기존 구현 (행 단위) - 비교 기준
+# ---------------------------------------------------------------------------
+
+def legacy_parse_date(date_val):
+    if pd.isna(date_val):
+        return None
+    date_str = str(date_val).strip()
+    if '-' in date_str and len(date_str) >= 10:
+        return date_str if ' ' in date_str else date_str + ' 00:00:00'
+    if len(date_str) == 8 and date_str.isdigit():
+        return f"{date_str[:4]}-{date_str[4:6]}-{date_str[6:8]} 00:00:00"
+    return None
+
+
+def legacy_time_to_hours(time_val):
+    if pd.isna(time_val):
+        return None
+    if isinstance(time_val, (int, float)):
+        try:
+            minutes = float(time_val)
+            if minutes == 0:
+                return None
+            return minutes / 60.0
+        except:  # noqa: E722
+            return None
+    time_str = str(time_val).strip()
+    if time_str == '' or time_str == '00:00' or time_str == 'nan':
+        return None
+    try:
+        if ':' in time_str:
+            parts = time_str.split(':')
+            if len(parts) >= 2:
+                hours = int(parts[0])
+                minutes = int(parts[1])
+                return hours + (minutes / 60.0)
+        if time_str.replace('.', '', 1).isdigit():
+            minutes = float(time_str)
+            return minutes / 60.0
+        return None
+    except:  # noqa: E722
+        return None
+
+
+def legacy_calculate_work_hours(row):
+    if pd.notna(row['근무시간']) and row['근무시간'] > 0:
+        return row['근무시간']
+    if pd.isna(row['시작']) or pd.isna(row['종료']):
+        return None
+    try:
+        start = int(row['시작'])
+        end = int(row['종료'])
+        start_total_mins = (start // 100) * 60 + start % 100
+        end_total_mins = (end // 100) * 60 + end % 100
+        if end_total_mins < start_total_mins:
+            end_total_mins += 24 * 60
+        work_hours = (end_total_mins - start_total_mins) / 60.0
+        if '제외시간' in row and pd.notna(row['제외시간']):
+            exclude_mins = float(row['제외시간'])
+            work_hours -= (exclude_mins / 60.0)
+        return max(0, work_hours)
+    except:  # noqa: E722
+        return None
+
+
+def legacy_clock(x):
+    return str(x).replace(':', '') if pd.notna(x) and str(x) != '' else None
+
+
+def legacy_steps(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.copy()
+    df['근무일'] = df['근무일'].apply(legacy_parse_date)
+    df['근무시간'] = df['근무시간'].apply(legacy_time_to_hours)
+    if df['근무시간'].isna().sum() > 0:
+        df['근무시간'] = df.apply(legacy_calculate_work_hours, axis=1)
+    for col in ['시작', '종료']:
+        df[col] = df[col].apply(legacy_clock)
+    return df
+
+
+def vectorized_steps(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.copy()
+    df['근무일'] = _map_distinct(df['근무일'], _parse_work_date)
+    df['근무시간'] = _map_distinct(df['근무시간'], _time_to_hours)
+    if df['근무시간'].isna().sum() > 0:
+        df['근무시간'] = _shift_work_hours(df)
+    for col in ['시작', '종료']:
+        df[col] = _map_distinct(df[col], legacy_clock)
+    return df
+
+
+# ---------------------------------------------------------------------------
+# 테스트 데이터
+# ---------------------------------------------------------------------------
+
+EDGE_CASES = {
+    '근무일': [
+        '2025-08-01', '2025-08-01 00:00:00', ' 2025-08-01 ', 20250801, 20250801.0, '20250801',
+        pd.Timestamp('2025-08-02'), datetime(2025, 8, 3, 9, 30), '2025/08/01', '', None, np.nan,
+        '2025-8-1', 'abcdefgh', '１２３４５６７８', 2025080,
+    ],
+    '근무시간': [
+        480, 480.0, 0, 0.0, -30, '8:30', '08:30', '8:30:15', '00:00', '0:00', '0', '', 'nan',
+        ' 510 ', '510.5', '1.2.3', 'abc', '8:xx', dt_time(8, 30), timedelta(hours=9, minutes=15),
+        None, np.nan, True, '-1:30',
+    ],
+    '시작': [
+        808, '0808', '808', 808.0, 808.7, '08:08', '', None, 2330, '2330', 'x', -5, '+900', ' 900 ',
+        '808.0', 0, 2400, 900, 1000, 1453, '1_000', 730, 700, 830,
+    ],
+    '종료': [
+        1730, '1730', '0130', 1730.0, 100, '17:30', '1730', 1730, None, '0600', 1800, 1700, '1800',
+        '1800', 1730, 0, 2400, 1800, 900, 808, 1200, '1900', 1900, '',
+    ],
+    '제외시간': [
+        60, 60.0, None, np.nan, '30', 'nan', 'abc', 0, -60, 1e9, '1_0', ' 45 ', 'inf', '-inf',
+        60, 60, 60, 60, 60, 60, 60, 60, 60, 60,
+    ],
+}
+
+
+def edge_case_frame() -> pd.DataFrame:
+    width = max(len(values) for values in EDGE_CASES.values())
+    data = {col: (values * width)[:width] for col, values in EDGE_CASES.items()}
+    return pd.DataFrame({col: pd.Series(values, dtype=object) for col, values in data.items()})
+
+
+def synthetic_frame(rows: int, seed: int = 42) -> pd.DataFrame:
+    """Frame shaped like the loader output for 8-10월 claim files"""
+    rng = np.random.default_rng(seed)
+    days = pd.date_range('2025-08-01', '2025-10-31').strftime('%Y-%m-%d')
+    starts = np.array([f"{h:02d}{m:02d}" for h in range(6, 11) for m in range(0, 60, 5)])
+    ends = np.array([f"{h:02d}{m:02d}" for h in list(range(16, 24)) + [0, 1, 2] for m in range(0, 60, 5)])
+
+    minutes = rng.choice([480.0, 510.0, 540.0, 600.0, 0.0, np.nan], size=rows, p=[.3, .2, .15, .1, .1, .15])
+    start = rng.choice(starts, size=rows).astype(object)
+    end = rng.choice(ends, size=rows).astype(object)
+    start[rng.random(rows) < 0.05] = None
+    end[rng.random(rows) < 0.02] = None
+
+    df = pd.DataFrame({
+        '근무일': rng.choice(days, size=rows),
+        '사번': rng.integers(10_000_000, 10_005_000, size=rows).astype(float),
+        '근무시간': minutes,
+        '시작': pd.Series(start, dtype='str'),
+        '종료': pd.Series(end, dtype='str'),
+        '제외시간': rng.choice([0.0, 30.0, 60.0, np.nan], size=rows),
+        '근태명': rng.choice(['정상근무', '년차', '오전반차(탄력근무제)', '국내출장'], size=rows),
+    })
+
+    # Loader encodes low-cardinality strings as categoricals
+    for col in ['근무일', '시작', '종료', '근태명']:
+        df[col] = df[col].astype('category')
+    return df
+
+
+# ---------------------------------------------------------------------------
+
+def check_parity(label: str, df: pd.DataFrame) -> None:
+    started = time.perf_counter()
+    expected = legacy_steps(df)
+    legacy_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    actual = vectorized_steps(df)
+    vectorized_seconds = time.perf_counter() - started
+
+    pd.testing.assert_frame_equal(actual, expected, check_exact=True)
+    speedup = legacy_seconds / vectorized_seconds if vectorized_seconds else float('inf')
+    print(
+        f"✅ {label}: {len(df):,}행 일치 "
+        f"(기존 {legacy_seconds:.2f}s → 벡터화 {vectorized_seconds:.3f}s, {speedup:,.0f}x)"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="claim_data 변환 패리티 테스트")
+    parser.add_argument("file", nargs="?", help="실제 Claim Excel 파일 (선택)")
+    parser.add_argument("--rows", type=int, default=200_000, help="합성 데이터 행 수")
+    args = parser.parse_args()
+
+    check_parity("경계 케이스 (object)", edge_case_frame())
+    check_parity("경계 케이스 (str)", edge_case_frame().astype(str).replace('None', None))
+    synthetic = synthetic_frame(args.rows)
+    check_parity("합성 데이터 (범주형)", synthetic)
+    check_parity("합성 데이터 (문자열)", synthetic.astype({col: 'str' for col in ['근무일', '시작', '종료', '근태명']}))
+
+    if args.file:
+        from core.excel_loader import ExcelLoader
+
+        df = ExcelLoader().load_excel_file(Path(args.file), data_type="claim_data")
+        check_parity(Path(args.file).name, df)
+
+        started = time.perf_counter()
+        DataTransformers.transform_claim_data(df.copy())
+        print(f"transform_claim_data 전체: {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -30,14 +30,14 @@ def upload_tag_aug_file(file_path, db_path):
                 logger.info(f"  {sheet_name}: 데이터 없음, 스킵")
                 continue
 
-            # 데이터 변환
-            df_transformed = DataTransformers.transform_tag_data_aug(df)
+            # 데이터 변환 (REGDATE/DOORNAME/EQUIPNO → ENTE_DT, 출입시각, DR_NO, DR_GB)
+            df_transformed = DataTransformers.transform_tag_data(df)
 
             # uploaded_at 컬럼 추가
             df_transformed['uploaded_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
 
             # DB 업로드
-            rows_inserted = db_manager.insert_dataframe('tag_data_aug', df_transformed, if_exists='append')
+            rows_inserted = db_manager.insert_dataframe('tag_data', df_transformed, if_exists='append')
             total_rows += rows_inserted
             logger.info(f"  {sheet_name}: {rows_inserted:,}행")
 
@@ -79,10 +79,10 @@ def main():
     conn = db_manager.get_connection()
     cursor = conn.cursor()
 
-    # 전체 건수
-    cursor.execute("SELECT COUNT(*) FROM tag_data_aug")
+    # 8-10월 건수 (tag_data에 바로 적재되므로 ENTE_DT 변환/이관 스크립트 불필요)
+    cursor.execute("SELECT COUNT(*) FROM tag_data WHERE day_key BETWEEN 20250801 AND 20251031")
     total = cursor.fetchone()[0]
-    logger.info(f"전체 tag_data_aug: {total:,}건")
+    logger.info(f"8-10월 tag_data: {total:,}건")
 
     db_manager.close()
 